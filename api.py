@@ -0,0 +1,235 @@
+import asyncio
+import base64
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from bulk_reports import normalize_profile, render_report
+from calculator import calculate_retirement_needs
+from currency import convert_amounts
+from profile_input import ProfileInput
+from result_cache import cached_result
+from simulation import simulate_retirement, DEFAULT_PATHS
+from telemetry import render_metrics
+
+# --- Service Settings ---
+MAX_BATCH_SIZE = 10000
+INLINE_BATCH_SIZE = 100  # Batches up to this size are cheap enough to score on the event loop
+WORKERS = int(os.environ.get("API_WORKERS", 0)) or None
+MAX_PATHS = 100000  # Monte Carlo paths per simulated profile
+
+# --- Request Schema ---
+# Accepted range of each numeric profile field; values outside it (or NaN) are rejected
+# with a 400 before any scoring, so absurd inputs cannot produce absurd figures.
+MAX_AMOUNT = 1e12
+MAX_COUNT = 100
+INPUT_BOUNDS = {
+    "age": (0, 120),
+    "retirement_age_target": (0, 120),
+    "expected_inflation_rate": (0.0, 0.5),
+    "income": (0, MAX_AMOUNT),
+    "expenses": (0, MAX_AMOUNT),
+    "monthly_expenses": (0, MAX_AMOUNT),
+    "assets_cars": (0, MAX_AMOUNT),
+    "assets_land": (0, MAX_AMOUNT),
+    "assets_others": (0, MAX_AMOUNT),
+    "loans_debts_amount": (0, MAX_AMOUNT),
+    "health_insurance_amount": (0, MAX_AMOUNT),
+    "life_insurance_amount_total": (0, MAX_AMOUNT),
+    "pension_contributions_amount": (0, MAX_AMOUNT),
+    "family_members_count": (0, MAX_COUNT),
+    "dependents_parents": (0, MAX_COUNT),
+    "dependents_children": (0, MAX_COUNT),
+}
+
+
+def _checked_profile(record):
+    """
+    Normalizes a request profile and checks it against INPUT_BOUNDS.
+
+    Raises:
+        ValueError: For a record that is not an object or a value out of bounds.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("each profile must be a JSON object.")
+    profile = normalize_profile(record)
+    for field, (low, high) in INPUT_BOUNDS.items():
+        if not low <= profile[field] <= high:
+            raise ValueError(f"{field} must be between {low:g} and {high:g}.")
+    return profile
+
+
+@cached_result
+def _score(profile):
+    return calculate_retirement_needs(profile)
+
+
+def _calculate(payload):
+    # Normalizing first means payloads that differ only in formatting share a cache entry
+    return _score(ProfileInput.from_dict(_checked_profile(payload)))
+
+
+def _calculate_many(profiles):
+    return [_calculate(profile) for profile in profiles]
+
+
+def _simulate(profile, n_paths, seed):
+    return simulate_retirement(normalize_profile(profile), n_paths=n_paths, seed=seed)
+
+
+async def _run_in_pool(request, func, *args):
+    """
+    Runs CPU-bound work in the process pool so the event loop keeps serving requests.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app.state.executor, func, *args)
+
+
+async def _read_payload(request):
+    try:
+        payload = await request.json()
+    except ValueError:
+        return None, JSONResponse({'error': "Request body must be valid JSON."}, status_code=400)
+    if not isinstance(payload, dict):
+        return None, JSONResponse({'error': "Request body must be a JSON object."}, status_code=400)
+    if 'profiles' in payload and not isinstance(payload['profiles'], list):
+        return None, JSONResponse({'error': "profiles must be a JSON array of profile objects."}, status_code=400)
+    if len(payload.get('profiles', ())) > MAX_BATCH_SIZE:
+        return None, JSONResponse({'error': f"Batches are limited to {MAX_BATCH_SIZE} profiles."},
+                                  status_code=413)
+    return payload, None
+
+
+# --- Endpoints ---
+async def health(request):
+    return JSONResponse({'status': "ok"})
+
+
+async def metrics(request):
+    """
+    Serves this process's metrics in the Prometheus text format (see telemetry).
+
+    Work done in the process pool is not included.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+async def calculate(request):
+    """
+    Scores one profile, or a batch sent as {"profiles": [...]}.
+    """
+    payload, error = await _read_payload(request)
+    if error:
+        return error
+    try:
+        if 'profiles' not in payload:
+            return JSONResponse(_calculate(payload))
+        profiles = payload['profiles']
+        if len(profiles) <= INLINE_BATCH_SIZE:
+            results = _calculate_many(profiles)
+        else:
+            # Split large batches across the pool, one chunk per worker.
+            chunk = max(INLINE_BATCH_SIZE, -(-len(profiles) // request.app.state.workers))
+            parts = await asyncio.gather(*(_run_in_pool(request, _calculate_many, profiles[i:i + chunk])
+                                           for i in range(0, len(profiles), chunk)))
+            results = [result for part in parts for result in part]
+    except (TypeError, ValueError) as e:
+        return JSONResponse({'error': f"Invalid profile: {e}"}, status_code=400)
+    return JSONResponse({'results': results})
+
+
+async def convert(request):
+    """
+    Converts {"amount", "from", "to"}, or arrays {"amounts", "from", "to"} in one call.
+    """
+    payload, error = await _read_payload(request)
+    if error:
+        return error
+    try:
+        if 'amounts' in payload:
+            converted = convert_amounts(payload['amounts'], payload['from'], payload['to'])
+            return JSONResponse({'converted': [None if value != value else value for value in converted.tolist()]})
+        converted = float(convert_amounts(payload['amount'], payload['from'], payload['to']))
+    except (KeyError, TypeError, ValueError) as e:
+        return JSONResponse({'error': f"Invalid conversion request: {e}"}, status_code=400)
+    if converted != converted:  # NaN for unknown currency codes
+        return JSONResponse({'error': "Unknown currency code."}, status_code=400)
+    return JSONResponse({'converted': converted})
+
+
+async def report(request):
+    """
+    Renders the PDF report of one profile, or base64-encoded reports for a batch.
+    """
+    payload, error = await _read_payload(request)
+    if error:
+        return error
+    try:
+        profiles = [_checked_profile(profile) for profile in payload.get('profiles', [payload])]
+    except (TypeError, ValueError) as e:
+        return JSONResponse({'error': f"Invalid profile: {e}"}, status_code=400)
+    try:
+        if 'profiles' not in payload:
+            pdf_bytes = await _run_in_pool(request, render_report, profiles[0])
+            return Response(pdf_bytes, media_type="application/pdf")
+        reports = await asyncio.gather(*(_run_in_pool(request, render_report, profile) for profile in profiles))
+    except (TypeError, ValueError) as e:
+        # Renderer messages can echo the whole document; log them, answer generically
+        print(f"Error rendering report: {e}")
+        return JSONResponse({'error': "The report could not be rendered from this profile."}, status_code=400)
+    return JSONResponse({'reports': [base64.b64encode(pdf).decode("ascii") for pdf in reports]})
+
+
+async def simulate(request):
+    """
+    Runs the Monte Carlo simulation for one profile, or a batch sent as {"profiles": [...]}.
+    """
+    payload, error = await _read_payload(request)
+    if error:
+        return error
+    try:
+        n_paths = int(payload.pop('n_paths', DEFAULT_PATHS))
+        if not 0 < n_paths <= MAX_PATHS:
+            raise ValueError(f"n_paths must be between 1 and {MAX_PATHS}.")
+        seed = payload.pop('seed', None)
+        if 'profiles' not in payload:
+            return JSONResponse(await _run_in_pool(request, _simulate, _checked_profile(payload), n_paths, seed))
+        profiles = [_checked_profile(profile) for profile in payload['profiles']]
+        # Each profile gets its own child seed, as in simulate_retirement_batch.
+        seeds = np.random.SeedSequence(seed).spawn(len(profiles))
+        results = await asyncio.gather(*(_run_in_pool(request, _simulate, profile, n_paths, profile_seed)
+                                         for profile, profile_seed in zip(profiles, seeds)))
+    except (TypeError, ValueError) as e:
+        return JSONResponse({'error': f"Invalid profile: {e}"}, status_code=400)
+    return JSONResponse({'results': results})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    app.state.workers = WORKERS or os.cpu_count() or 1
+    app.state.executor = ProcessPoolExecutor(max_workers=app.state.workers)
+    try:
+        yield
+    finally:
+        app.state.executor.shutdown(wait=True)
+
+
+app = Starlette(routes=[
+    Route("/health", health, methods=["GET"]),
+    Route("/metrics", metrics, methods=["GET"]),
+    Route("/calculate", calculate, methods=["POST"]),
+    Route("/convert", convert, methods=["POST"]),
+    Route("/report", report, methods=["POST"]),
+    Route("/simulate", simulate, methods=["POST"]),
+], lifespan=lifespan)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get("API_HOST", "127.0.0.1"), port=int(os.environ.get("API_PORT", 8000)))
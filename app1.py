@@ -1,220 +1,82 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-from reportlab.lib.units import inch
-import json
-import os
-from openpyxl import Workbook, load_workbook  # For handling Excel files
-from openpyxl.utils.dataframe import dataframe_to_rows
-
-# 1. Core Python Logic (Backend Brain)
-def calculate_retirement_needs(age,
-                           gender,
-                           country,
-                           income,
-                           expenses,
-                           assets_cars,
-                           assets_land,
-                           assets_others,
-                           owns_house,
-                           on_rent,
-                           loans_debts_amount,
-                           family_members_count,
-                           dependents_parents,
-                           dependents_spouse,
-                           dependents_children,
-                           dependent_health_problems_yn,
-                           dependent_health_problems_details,
-                           upcoming_big_goals,
-                           health_issues_yn,
-                           health_insurance_yn,
-                           health_insurance_amount,
-                           life_insurance_yn,
-                           life_insurance_amount_total,
-                           monthly_expenses,
-                           pension_contributions_yn,
-                           pension_contributions_amount,
-                           expected_inflation_rate,
-                           retirement_age_target,
-                           only_source_of_income="N"):
+from calculator import CURRENCY_DATA, YEARS_OF_RETIREMENT, calculate_retirement_needs
+from charts import (CORPUS_CHART_MODE, corpus_chart_figure, render_corpus_chart, render_scenario_chart,
+                    scenario_chart_figure)
+from profile_input import ProfileInput
+from report import create_comparison_report, create_pdf_report
+from result_cache import cached_result
+from storage import submission_row
+from telemetry import request, span
+from write_behind import get_writer
+
+# 1. Core Python Logic (Backend Brain) lives in calculator.py, PDF reports in report.py.
+# Heavy modules (matplotlib, ReportLab, openpyxl, NumPy/pandas for the simulation) are
+# imported on first use, so a cold start only pays for Streamlit and the calculator.
+
+# 2. Build Interactive Web App with Streamlit
+# --- Cached Helpers ---
+# Streamlit reruns the whole script on every interaction. Static assets are loaded once
+# per process with st.cache_resource, and everything derived from the submitted inputs
+# is memoized, so a rerun with unchanged inputs costs almost nothing. The calculation and
+# chart (charts.render_corpus_chart) go through the shared, memory-capped result_cache so
+# identical profiles are reused across sessions; PDF bytes are memoized by
+# report.create_pdf_report (pdf_cache).
+@st.cache_resource
+def load_logo():
     """
-    Calculates retirement needs, corpus, and provides a verdict with suggestions.
+    Reads the logo image once per server process.
     """
+    with open("cair.png", "rb") as f:
+        return f.read()
 
-    # --- Constants and Assumptions ---
-    REPLACEMENT_RATIO = 0.7
-    POST_RETIREMENT_RETURN_RATE = 0.04
-    YEARS_OF_RETIREMENT = 30
-    INFLATION_ADJUSTMENT_RATE = 1 + expected_inflation_rate
-
-    # --- Input Validation and Handling ---
-    if any(val < 0 for val in [age, income, expenses, assets_cars, assets_land, assets_others, loans_debts_amount]):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Please ensure all financial inputs are non-negative.",
-            'suggestions': ["Please check your input values."]
-        }
-    if age >= retirement_age_target:
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Target retirement age should be greater than current age.",
-            'suggestions': ["Please check your age and target retirement age."]
-        }
-    if owns_house not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Owns a House should be Y or N",
-            'suggestions': ["Please check the Owns a House value."]
-        }
-    if on_rent not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: On Rent should be Y or N",
-            'suggestions': ["Please check the On Rent value."]
-        }
-    if dependent_health_problems_yn not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Dependent Health Problems should be Y or N",
-            'suggestions': ["Please check the Dependent Health Problems value."]
-        }
-    if health_issues_yn not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Health Issues should be Y or N",
-            'suggestions': ["Please check the Health Issues value."]
-        }
-
-    if health_insurance_yn not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Health Insurance should be Y or N",
-            'suggestions': ["Please check the Health Insurance value."]
-        }
-    if life_insurance_yn not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Life Insurance should be Y or N",
-            'suggestions': ["Please check the Life Insurance value."]
-        }
-    if pension_contributions_yn not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Pension Contributions should be Y or N",
-            'suggestions': ["Please check the Pension Contributions value."]
-        }
-    if only_source_of_income not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Only Source of Income should be Y or N",
-            'suggestions': ["Please check the Only Source of Income value."]
-        }
-    if dependents_spouse not in ('Y', 'N'):
-        return {
-            'corpus_needed': 0,
-            'corpus_available': 0,
-            'ready': False,
-            'verdict': "Error: Dependents Spouse should be Y or N",
-            'suggestions': ["Please check the Dependents Spouse value"]
-        }
-
-    # --- Calculations ---
-    years_to_retirement = retirement_age_target - age
-    inflation_factor = (INFLATION_ADJUSTMENT_RATE) ** years_to_retirement
-    annual_expenses_at_retirement = (monthly_expenses * 12) * inflation_factor
-    required_income_at_retirement = income * REPLACEMENT_RATIO * inflation_factor
-
-    corpus_needed = required_income_at_retirement / POST_RETIREMENT_RETURN_RATE
-    corpus_available = assets_cars + assets_land + assets_others - loans_debts_amount
-
-    ready = corpus_available >= corpus_needed
-    verdict = "Ready to Retire ✅" if ready else "Not Ready to Retire ❌"
-
-    # --- Suggestions ---
-    suggestions = []
-    if not ready:
-        shortfall = corpus_needed - corpus_available
-        suggestions.append(f"Increase your retirement savings by ₹{shortfall:,.2f}.")
-        suggestions.append(f"Consider increasing your savings rate.")
-
-        if monthly_expenses * 12 > income * 0.8:
-            suggestions.append("Reduce your expenses. Review your budget carefully.")
-
-        if years_to_retirement < 10:
-            suggestions.append(
-                "You have a short time to prepare. Aggressively increase savings and consider delaying retirement.")
-        elif years_to_retirement > 25:
-            suggestions.append(
-                "You have time to grow your retirement nest egg. Invest consistently and consider higher-growth investments.")
-
-    if loans_debts_amount > 0:
-        suggestions.append("Prioritize paying down high-interest debts.")
-
-    if age < 40:
-        suggestions.append("Start saving for retirement as early as possible to take advantage of compounding.")
-    elif age > 50:
-        suggestions.append("Focus on preserving your capital and reducing risk as you approach retirement.")
-
-    if health_issues_yn == "Y":
-        suggestions.append("Ensure you have adequate health insurance and consider long-term care planning.")
-
-    if family_members_count > 2:
-        suggestions.append("Consider the financial impact of supporting a larger family in retirement.")
-
-    if dependents_children > 0:
-        suggestions.append("Factor in future education and marriage expenses for your children.")
-
-    if owns_house == "N" and on_rent == "Y":
-        suggestions.append("Consider the impact of rent on your retirement expenses.  Evaluate if owning a home is feasible before retirement.")
-
-    if pension_contributions_yn == "N":
-        suggestions.append("Start contributing to a pension plan to build a retirement corpus.")
-
-    if only_source_of_income == "Y":
-        suggestions.append("Consider diversifying your income sources to reduce risk.")
-
-    if dependents_spouse == "Y":
-        suggestions.append("Ensure adequate financial planning for your spouse's needs in retirement.")
-
-    if "Children's Education" in upcoming_big_goals:
-        suggestions.append("Start a dedicated investment plan for your children's education.")
-
-    return {
-        'corpus_needed': corpus_needed,
-        'corpus_available': corpus_available,
-        'ready': ready,
-        'verdict': verdict,
-        'suggestions': suggestions,
-    }
+
+@cached_result
+def cached_retirement_needs(profile):
+    """
+    Memoized calculate_retirement_needs, keyed on the whole ProfileInput.
+    """
+    return calculate_retirement_needs(profile)
+
+
+@cached_result
+def cached_scenarios(profile, values):
+    """
+    Memoized scenario comparison: the profile plus every combination of the values.
+    """
+    from scenarios import compare_scenarios, scenario_grid
+    return compare_scenarios(profile, scenario_grid(values))
+
+
+@st.cache_data(max_entries=1000)
+def cached_simulation(profile):
+    """
+    Memoized Monte Carlo simulation (fixed seed, so results are reproducible).
+    """
+    from simulation import simulate_retirement
+    return simulate_retirement(profile, seed=0)
+
+
+@st.cache_data(max_entries=1000)
+def sensitivity_heatmap(profile, currency_symbol):
+    """
+    Builds the readiness-margin heatmap over inflation rate x retirement age, counting
+    what the profile already saves each month.
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+    from goal_seek import current_monthly_saving, sensitivity_grid, MAX_RETIREMENT_AGE
+
+    grid = sensitivity_grid(profile, np.arange(0.0, 0.1001, 0.005),
+                            np.arange(profile['age'] + 1, MAX_RETIREMENT_AGE + 1),
+                            monthly_saving=current_monthly_saving(profile))
+    heatmap = go.Figure(go.Heatmap(
+        z=grid['margin'], x=grid['retirement_ages'], y=grid['inflation_rates'] * 100,
+        colorscale="RdYlGn", zmid=0, colorbar={"title": f"Margin ({currency_symbol})"}))
+    heatmap.update_layout(title="Readiness Margin by Inflation Rate and Retirement Age",
+                          xaxis_title="Retirement Age", yaxis_title="Inflation Rate (%)")
+    return heatmap
 
 
-# 2. Build Interactive Web App with Streamlit
 def main():
     """
     Main function to run the Streamlit app.
@@ -230,151 +92,93 @@ def main():
     # Add a title and logo
     col1, col2 = st.columns([1, 3])  # Adjust ratios as needed
     with col1:
-        # Display an image from a URL
-        st.image("cair.png",  # Replace with your image URL
-                 width=250)  # Set the width of the image
+        st.image(load_logo(), width=250)  # Set the width of the image
     with col2:
         st.title("Retirement Readiness Checker")
     st.markdown("<h2 style='text-align: center;'>Assess your retirement readiness and get personalized recommendations.</h2>", unsafe_allow_html=True) # Centered
 
     # --- 1. Input Forms ---
     st.header("Your Information")
-    age = st.number_input("Your Age", min_value=20, max_value=70, value=40)
+    # Country stays outside the form so the currency labels below follow it immediately
     country = st.selectbox("Country",
                            ["USA", "India", "UK", "Canada", "Australia", "Germany", "Japan", "Brazil",
                             "South Africa", "France"], index=0)
-    gender = st.selectbox("Gender", ["Male", "Female", "Other"], index=0)
-
-    # Use a dictionary to map countries to their respective currencies and symbols
-    currency_data = {
-        "USA": {"symbol": "$", "code": "USD"},
-        "India": {"symbol": "₹", "code": "INR"},
-        "UK": {"symbol": "£", "code": "GBP"},
-        "Canada": {"symbol": "$", "code": "CAD"},
-        "Australia": {"symbol": "$", "code": "AUD"},
-        "Germany": {"symbol": "€", "code": "EUR"},
-        "Japan": {"symbol": "¥", "code": "JPY"},
-        "Brazil": {"symbol": "R$", "code": "BRL"},
-        "South Africa": {"symbol": "R", "code": "ZAR"},
-        "France": {"symbol": "€", "code": "EUR"},
-    }
-
-    selected_currency = currency_data[country]["symbol"]
-    selected_currency_code = currency_data[country]["code"]  # Get the currency code
-
-    income = st.number_input(f"Net Annual Income ({selected_currency})", min_value=0, value=500000)
-    only_source_of_income = st.selectbox("Only Source of Income", ["Y", "N"], index=0)
-    expenses = st.number_input(f"Annual Expenses ({selected_currency})", min_value=0, value=300000)
-    monthly_expenses = st.number_input(f"Monthly Expenses ({selected_currency})", min_value=0, value=25000)
-
-    assets_cars = st.number_input(f"Assets (Cars) ({selected_currency})", min_value=0, value=100000)
-    assets_land = st.number_input(f"Assets (Land) ({selected_currency})", min_value=0, value=200000)
-    assets_others = st.number_input(f"Assets (Others) ({selected_currency})", min_value=0, value=300000)
-    owns_house = st.selectbox("Owns a House (Y/N)", ["Y", "N"], index=0)
-    on_rent = st.selectbox("On Rent (Y/N)", ["Y", "N"], index=0)
-    loans_debts_amount = st.number_input(f"Loans/Debts Amount ({selected_currency})", min_value=0, value=100000)
-
-    family_members_count = st.number_input("Family Members Count", min_value=1, value=4)
-    dependents_parents = st.number_input("Dependents (Parents)", min_value=0, value=0)
-    dependents_spouse = st.selectbox("Dependents (Spouse)", ["Y", "N"], index=0)
-    dependents_children = st.number_input("Dependents (Children)", min_value=0, value=2)
-    dependent_health_problems_yn = st.selectbox("Dependent Health Problems (Y/N)", ["Y", "N"], index=0)
-    dependent_health_problems_details = st.text_input("Dependent Health Problems (Details)", "")
-    upcoming_big_goals = st.text_input("Upcoming Big Goals", "Children's Education")
-
-    health_issues_yn = st.selectbox("Any Health Issues (Y/N)", ["Y", "N"], index=0)
-    health_insurance_yn = st.selectbox("Health Insurance (Y/N)", ["Y", "N"], index=0)
-    health_insurance_amount = st.number_input(f"Health Insurance Amount (Monthly/Yearly) ({selected_currency})", min_value=0,
-                                               value=10000)
-    life_insurance_yn = st.selectbox("Life Insurance (Y/N)", ["Y", "N"], index=0)
-    life_insurance_amount_total = st.number_input(f"Life Insurance Amount (Total) ({selected_currency})", min_value=0,
-                                                   value=500000)
-
-    pension_contributions_yn = st.selectbox("Pension Contributions (Y/N)", ["Y", "N"], index=0)
-    pension_contributions_amount = st.number_input(
-        f"Pension Contributions Amount (Monthly/Yearly) ({selected_currency})",
-        min_value=0, value=5000)
-    expected_inflation_rate = st.number_input("Expected Annual Inflation Rate (%)", min_value=0.0, max_value=10.0,
-                                               value=6.0) / 100
-    retirement_age_target = st.number_input("Target Retirement Age", min_value=50, max_value=75, value=60)
+
+    selected_currency = CURRENCY_DATA[country]["symbol"]
+    selected_currency_code = CURRENCY_DATA[country]["code"]  # Get the currency code
+
+    # Widgets inside the form do not rerun the script until it is submitted
+    with st.form("profile_form"):
+        age = st.number_input("Your Age", min_value=20, max_value=70, value=40)
+        gender = st.selectbox("Gender", ["Male", "Female", "Other"], index=0)
+
+        income = st.number_input(f"Net Annual Income ({selected_currency})", min_value=0, value=500000)
+        only_source_of_income = st.selectbox("Only Source of Income", ["Y", "N"], index=0)
+        expenses = st.number_input(f"Annual Expenses ({selected_currency})", min_value=0, value=300000)
+        monthly_expenses = st.number_input(f"Monthly Expenses ({selected_currency})", min_value=0, value=25000)
+
+        assets_cars = st.number_input(f"Assets (Cars) ({selected_currency})", min_value=0, value=100000)
+        assets_land = st.number_input(f"Assets (Land) ({selected_currency})", min_value=0, value=200000)
+        assets_others = st.number_input(f"Assets (Others) ({selected_currency})", min_value=0, value=300000)
+        owns_house = st.selectbox("Owns a House (Y/N)", ["Y", "N"], index=0)
+        on_rent = st.selectbox("On Rent (Y/N)", ["Y", "N"], index=0)
+        loans_debts_amount = st.number_input(f"Loans/Debts Amount ({selected_currency})", min_value=0, value=100000)
+
+        family_members_count = st.number_input("Family Members Count", min_value=1, value=4)
+        dependents_parents = st.number_input("Dependents (Parents)", min_value=0, value=0)
+        dependents_spouse = st.selectbox("Dependents (Spouse)", ["Y", "N"], index=0)
+        dependents_children = st.number_input("Dependents (Children)", min_value=0, value=2)
+        dependent_health_problems_yn = st.selectbox("Dependent Health Problems (Y/N)", ["Y", "N"], index=0)
+        dependent_health_problems_details = st.text_input("Dependent Health Problems (Details)", "")
+        upcoming_big_goals = st.text_input("Upcoming Big Goals", "Children's Education")
+
+        health_issues_yn = st.selectbox("Any Health Issues (Y/N)", ["Y", "N"], index=0)
+        health_insurance_yn = st.selectbox("Health Insurance (Y/N)", ["Y", "N"], index=0)
+        health_insurance_amount = st.number_input(f"Health Insurance Amount (Monthly/Yearly) ({selected_currency})", min_value=0,
+                                                   value=10000)
+        life_insurance_yn = st.selectbox("Life Insurance (Y/N)", ["Y", "N"], index=0)
+        life_insurance_amount_total = st.number_input(f"Life Insurance Amount (Total) ({selected_currency})", min_value=0,
+                                                       value=500000)
+
+        pension_contributions_yn = st.selectbox("Pension Contributions (Y/N)", ["Y", "N"], index=0)
+        pension_contributions_amount = st.number_input(
+            f"Pension Contributions Amount (Monthly/Yearly) ({selected_currency})",
+            min_value=0, value=5000)
+        expected_inflation_rate = st.number_input("Expected Annual Inflation Rate (%)", min_value=0.0, max_value=10.0,
+                                                   value=6.0) / 100
+        retirement_age_target = st.number_input("Target Retirement Age", min_value=50, max_value=75, value=60)
+        run_simulation = st.checkbox("Run Monte Carlo Simulation (stochastic inflation and returns)", value=False)
+        submitted = st.form_submit_button("Calculate Retirement Readiness")
+
     # --- 2. Calculate and Display Results ---
-    if st.button("Calculate Retirement Readiness"):
-        results = calculate_retirement_needs(
-            age,
-            gender,
-            country,
-            income,
-            expenses,  # Pass the expenses variable
-            assets_cars,
-            assets_land,
-            assets_others,
-            owns_house,
-            on_rent,
-            loans_debts_amount,
-            family_members_count,
-            dependents_parents, dependents_spouse,
-            dependents_children, dependent_health_problems_yn,
-            dependent_health_problems_details, upcoming_big_goals,
-            health_issues_yn, health_insurance_yn, health_insurance_amount,
-            life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-            pension_contributions_yn, pension_contributions_amount,
-            expected_inflation_rate, retirement_age_target,
-            only_source_of_income
-        )
-
-        st.header("Your Results")
-        st.write(results['verdict'])
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("Key Figures")
-            st.metric(f"Corpus Needed ({selected_currency})", f"{results['corpus_needed']:,.2f}")
-            st.metric(f"Corpus Available ({selected_currency})", f"{results['corpus_available']:,.2f}")
-
-        with col2:
-            fig, ax = plt.subplots()
-            ax.bar([f'Corpus Available ({selected_currency})',
-                    f'Corpus Needed ({selected_currency})'],
-                   [results['corpus_available'], results['corpus_needed']],
-                   color=['green' if results['ready'] else 'red', 'blue'])
-            ax.set_ylabel(f"Amount ({selected_currency})")
-            ax.set_title("Retirement Corpus Comparison")
-            st.pyplot(fig)
-
-        st.subheader("Suggestions")
-        for suggestion in results['suggestions']:
-            st.markdown(f"- {suggestion}")
-
-        # --- (Optional) Download Button ---
-        pdf_bytes = create_pdf_report(results, age,  gender, country, income,
-                                      assets_cars, assets_land,
-                                      assets_others, owns_house, on_rent, loans_debts_amount,
-                                      family_members_count, dependents_parents, dependents_spouse,
-                                      dependents_children, dependent_health_problems_yn,
-                                      dependent_health_problems_details, upcoming_big_goals,
-                                      health_issues_yn, health_insurance_yn, health_insurance_amount,
-                                      life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-                                      pension_contributions_yn, pension_contributions_amount,
-                                      expected_inflation_rate, retirement_age_target,
-                                      country, gender, selected_currency)
-        st.download_button(
-            label="Download Retirement Plan (PDF)",
-            data=pdf_bytes,
-            file_name="retirement_plan.pdf",
-            mime="application/pdf",
-        )
-
-        # --- 3. (Future Modification) Save User Data ---
-        save_user_data(
-            country, age, gender, income,
-            assets_cars, assets_land, assets_others, owns_house, on_rent,
-            loans_debts_amount, family_members_count, dependents_parents, dependents_spouse,
-            dependents_children, dependent_health_problems_yn, dependent_health_problems_details, upcoming_big_goals,
-            health_issues_yn, health_insurance_yn, health_insurance_amount,
-            life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-            pension_contributions_yn, pension_contributions_amount,
-            expected_inflation_rate, retirement_age_target, results, only_source_of_income
-        )
+    # Each run is timed as one request (see telemetry), with a span per stage
+    with request("calculate" if submitted else "rerun"):
+        if submitted:
+            profile = ProfileInput(
+                age, gender, country, income, expenses, assets_cars, assets_land, assets_others,
+                owns_house, on_rent, loans_debts_amount, family_members_count, dependents_parents,
+                dependents_spouse, dependents_children, dependent_health_problems_yn,
+                dependent_health_problems_details, upcoming_big_goals, health_issues_yn,
+                health_insurance_yn, health_insurance_amount, life_insurance_yn, life_insurance_amount_total,
+                monthly_expenses, pension_contributions_yn, pension_contributions_amount,
+                expected_inflation_rate, retirement_age_target, only_source_of_income,
+            )
+            # Remember the submission so the results survive later reruns (e.g. the converter)
+            st.session_state["submission"] = {
+                'profile': profile,
+                'currency_symbol': selected_currency,
+                'run_simulation': run_simulation,
+            }
+
+            # --- 3. (Future Modification) Save User Data ---
+            with span("calculation"):
+                results = cached_retirement_needs(profile)
+            with span("save"):
+                save_user_data(profile, results)
+
+        if "submission" in st.session_state:
+            submission = st.session_state["submission"]
+            show_results(submission['profile'], submission['currency_symbol'], submission['run_simulation'])
 
     # Currency Conversion Section
     st.header("Currency Converter") # Moved to main area
@@ -392,199 +196,214 @@ def main():
             st.error("Currency conversion failed. Please check the currency codes.")
 
 
-def convert_currency(amount, from_currency, to_currency):
+def show_results(profile, selected_currency, run_simulation):
     """
-    A placeholder function for currency conversion.  In a real application, you would
-    use a currency conversion API.
+    Displays the results of a submitted profile.
+
+    Args:
+        profile (ProfileInput): The submitted inputs.
+        selected_currency (str): The currency symbol for display.
+        run_simulation (bool): Whether to show the Monte Carlo simulation.
     """
-    conversion_rates = {
-        "USD": {"INR": 74.50, "EUR": 0.85, "GBP": 0.75, "CAD": 1.25, "AUD": 1.35, "JPY": 110.00,
-                "BRL": 5.50, "ZAR": 15.00, "CNY": 6.45, "USD": 1.00},
-        "INR": {"USD": 0.013, "EUR": 0.011, "GBP": 0.010, "CAD": 0.017, "AUD": 0.018, "JPY": 1.47,
-                "BRL": 0.074, "ZAR": 0.20, "CNY": 0.086, "INR": 1.00},
-        "EUR": {"USD": 1.18, "INR": 87.77, "GBP": 0.88, "CAD": 1.47, "AUD": 1.59, "JPY": 129.41,
-                "BRL": 6.47, "ZAR": 17.65, "CNY": 7.61, "EUR": 1.00},
-        "GBP": {"USD": 1.33, "INR": 98.80, "EUR": 1.14, "CAD": 1.66, "AUD": 1.79, "JPY": 146.67,
-                "BRL": 7.29, "ZAR": 19.88, "CNY": 8.57, "GBP": 1.00},
-        "CAD": {"USD": 0.80, "INR": 59.60, "EUR": 0.68, "GBP": 0.60, "AUD": 1.08, "JPY": 88.00,
-                "BRL": 4.40, "ZAR": 12.00, "CNY": 5.16, "CAD": 1.00},
-        "AUD": {"USD": 0.74, "INR": 55.19, "EUR": 0.63, "GBP": 0.56, "CAD": 0.93, "JPY": 81.48,
-                "BRL": 4.07, "ZAR": 11.11, "CNY": 4.78, "AUD": 1.00},
-        "JPY": {"USD": 0.0091, "INR": 0.68, "EUR": 0.0077, "GBP": 0.0068, "CAD": 0.0114,
-                "AUD": 0.0123, "BRL": 0.050, "ZAR": 0.136, "CNY": 0.0586, "JPY": 1.00},
-        "BRL": {"USD": 0.182, "INR": 13.55, "EUR": 0.155, "GBP": 0.137, "CAD": 0.227, "AUD": 0.246,
-                "JPY": 20.00, "ZAR": 2.73, "CNY": 1.173, "BRL": 1.00},
-        "ZAR": {"USD": 0.067, "INR": 4.97, "EUR": 0.057, "GBP": 0.050, "CAD": 0.083, "AUD": 0.090,
-                "JPY": 7.33, "BRL": 0.367, "CNY": 0.430, "ZAR": 1.00},
-        "CNY": {"USD": 0.155, "INR": 11.63, "EUR": 0.131, "GBP": 0.117, "CAD": 0.194, "AUD": 0.209,
-                "JPY": 17.07, "BRL": 0.852, "ZAR": 2.326, "CNY": 1.00}
-    }
-
-    if from_currency in conversion_rates and to_currency in conversion_rates[from_currency]:
-        rate = conversion_rates[from_currency][to_currency]
-        return amount * rate
-    else:
-        return None
+    results = cached_retirement_needs(profile)
+    age = profile.age
+    retirement_age_target = profile.retirement_age_target
 
+    st.header("Your Results")
+    st.write(results['verdict'])
 
-def create_pdf_report(results, age,  gender, country, income,
-                      assets_cars, assets_land,
-                      assets_others, owns_house, on_rent, loans_debts_amount,
-                      family_members_count, dependents_parents, dependents_spouse,
-                      dependents_children, dependent_health_problems_yn,
-                      dependent_health_problems_details, upcoming_big_goals,
-                      health_issues_yn, health_insurance_yn, health_insurance_amount,
-                      life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-                      pension_contributions_yn, pension_contributions_amount,
-                      expected_inflation_rate, retirement_age_target,
-                      country_name, gender_name, currency_symbol):
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Key Figures")
+        st.metric(f"Corpus Needed ({selected_currency})", f"{results['corpus_needed']:,.2f}")
+        st.metric(f"Corpus Available ({selected_currency})", f"{results['corpus_available']:,.2f}")
+
+    with col2:
+        chart_args = (results['corpus_available'], results['corpus_needed'], results['ready'], selected_currency)
+        with span("chart"):
+            if CORPUS_CHART_MODE == "plotly":
+                st.plotly_chart(corpus_chart_figure(*chart_args))
+            else:
+                st.image(render_corpus_chart(*chart_args))
+
+    if run_simulation and age < retirement_age_target:
+        from simulation import PERCENTILES
+        with span("simulation"):
+            simulation = cached_simulation({
+                'age': age,
+                'retirement_age_target': retirement_age_target,
+                'income': profile.income,
+                'expected_inflation_rate': profile.expected_inflation_rate,
+                'assets_cars': profile.assets_cars,
+                'assets_land': profile.assets_land,
+                'assets_others': profile.assets_others,
+                'loans_debts_amount': profile.loans_debts_amount,
+            })
+        st.subheader("Monte Carlo Simulation")
+        st.metric("Probability of Success", f"{simulation['probability_of_success']:.1%}")
+        st.write(f"Corpus needed ({selected_currency}) across simulated paths:")
+        st.table({
+            "Percentile": [f"{p}th" for p in PERCENTILES],
+            "Corpus Needed": [f"{simulation[f'corpus_needed_p{p}']:,.2f}" for p in PERCENTILES],
+        })
+
+    if age < retirement_age_target:
+        from projection import CashFlowProjection, PROJECTION_FIELDS
+        from goal_seek import current_monthly_saving, required_extra_savings, max_monthly_expense, min_retirement_age
+        projection_profile = {field: getattr(profile, field) for field in PROJECTION_FIELDS}
+        # Keep the projection across reruns so a what-if change only recomputes the affected years
+        with span("projection"):
+            projection = st.session_state.get("projection")
+            if projection is None:
+                projection = st.session_state["projection"] = CashFlowProjection(projection_profile)
+            else:
+                projection.update(**projection_profile)
+            timeline = projection.timeline()
+            summary = projection.summary()
+
+        st.subheader("Year-by-Year Projection")
+        st.line_chart({"Age": timeline['age'], f"Corpus ({selected_currency})": timeline['corpus_end']},
+                      x="Age")
+        if summary['depletion_age'] is None:
+            st.write(f"Projected corpus lasts through age {retirement_age_target + YEARS_OF_RETIREMENT}.")
+        else:
+            st.write(f"Projected corpus runs out at age {summary['depletion_age']}.")
+
+        # --- What Would Make Me Ready? ---
+        # Solved from what the profile already saves (income left after monthly expenses)
+        with span("goal_seek"):
+            monthly_saving = current_monthly_saving(projection_profile)
+            extra_savings = required_extra_savings(projection_profile, monthly_saving)
+            earliest_age = min_retirement_age(projection_profile, monthly_saving)
+            max_expense = max_monthly_expense(projection_profile)
+        st.subheader("What Would Make Me Ready?")
+        goal_col1, goal_col2, goal_col3 = st.columns(3)
+        goal_col1.metric(f"Extra Monthly Saving ({selected_currency})", f"{extra_savings['monthly']:,.2f}")
+        goal_col2.metric(f"Max Monthly Expense ({selected_currency})", f"{max_expense:,.2f}")
+        goal_col3.metric("Earliest Ready Retirement Age", earliest_age if earliest_age is not None else "None")
+        with span("heatmap"):
+            heatmap = sensitivity_heatmap(projection_profile, selected_currency)
+        st.plotly_chart(heatmap)
+
+    st.subheader("Suggestions")
+    for suggestion in results['suggestions']:
+        st.markdown(f"- {suggestion}")
+
+    # --- (Optional) Download Button ---
+    with span("pdf"):
+        pdf_bytes = create_pdf_report(results, profile, selected_currency)
+    st.download_button(
+        label="Download Retirement Plan (PDF)",
+        data=pdf_bytes,
+        file_name="retirement_plan.pdf",
+        mime="application/pdf",
+    )
+
+    show_scenarios(profile, selected_currency)
+
+
+def show_scenarios(profile, selected_currency):
     """
-    Generates a PDF report of the retirement readiness assessment.
+    Compares the submitted profile with variants of it, e.g. retiring at 55 vs 60 vs 65.
+
+    Every combination of the entered values is evaluated in one batch call (see
+    scenarios.compare_scenarios) and shown as a table, a chart and a combined PDF.
 
     Args:
-        results (dict): The results dictionary from the calculate_retirement_needs function.
-         age (int): Current age.
-        income (float): Annual income.
-        expenses (float): Annual expenses.
-        assets_cars (float): Value of cars.
-        assets_land (float): Value of land.
-        assets_others (float): Value of other assets.
-        owns_house (str): "Y" or "N".
-        on_rent (str): "Y" or "N".
-        loans_debts_amount (float): Total loans/debts.
-        family_members_count (int): Number of family members.
-        dependents_parents (int): Number of dependent parents.
-        dependents_spouse (str): Y or N
-        dependents_children (int): Number of dependent children.
-        dependent_health_problems_yn (str): "Y" or "N".
-        dependent_health_problems_details (str): Details of health problems.
-        upcoming_big_goals (str): Upcoming financial goals.
-        health_issues_yn (str): "Y" or "N".
-        health_insurance_yn (str): "Y" or "N".
-        health_insurance_amount (float): Health insurance amount.
-        life_insurance_yn (str): "Y" or "N".
-        life_insurance_amount_total (float): Life insurance amount.
-        monthly_expenses (float): Monthly expenses.
-        pension_contributions_yn (str): "Y" or "N".
-        pension_contributions_amount (float): Pension contributions.
-        expected_inflation_rate (float): Expected annual inflation rate.
-        retirement_age_target (int): Target retirement age.
-        country_name (str): Country Name
-        gender_name (str): Gender Name
-        currency_symbol (str): The currency symbol.
+        profile (ProfileInput): The submitted inputs (the base plan).
+        selected_currency (str): The currency symbol for display.
+    """
+    from scenarios import MAX_SCENARIOS, SCENARIO_FIELDS, parse_values
+
+    st.header("Compare Scenarios")
+    with st.form("scenario_form"):
+        st.write(f"Enter comma-separated values for the inputs to vary (up to {MAX_SCENARIOS} combinations); "
+                 "leave the others blank.")
+        texts = {field: st.text_input(f"{label} values", "55, 60, 65" if field == "retirement_age_target" else "")
+                 for field, (label, _, _) in SCENARIO_FIELDS.items()}
+        compared = st.form_submit_button("Compare Scenarios")
+
+    if compared:
+        try:
+            values = {field: parse_values(field, text) for field, text in texts.items() if text.strip()}
+        except ValueError as e:
+            st.error(str(e))
+            return
+        # Kept across reruns and applied to whichever profile is submitted next
+        st.session_state["scenario_values"] = values
+
+    values = st.session_state.get("scenario_values")
+    if not values:
+        return
+    try:
+        with span("scenarios"):
+            scenarios = cached_scenarios(profile, values)
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    st.dataframe([{
+        "Scenario": scenario['scenario'],
+        "Years to Retirement": scenario['years_to_retirement'],
+        f"Corpus Needed ({selected_currency})": f"{scenario['corpus_needed']:,.2f}",
+        f"Corpus Available ({selected_currency})": f"{scenario['corpus_available']:,.2f}",
+        f"Shortfall ({selected_currency})": "-" if scenario['shortfall'] is None else f"{scenario['shortfall']:,.2f}",
+        "Verdict": scenario['verdict'],
+    } for scenario in scenarios], hide_index=True)
+
+    with span("scenario_chart"):
+        if CORPUS_CHART_MODE == "plotly":
+            st.plotly_chart(scenario_chart_figure(scenarios, selected_currency))
+        else:
+            st.image(render_scenario_chart(scenarios, selected_currency))
+
+    with span("scenario_pdf"):
+        pdf_bytes = create_comparison_report(scenarios, profile, selected_currency)
+    st.download_button(
+        label="Download Scenario Comparison (PDF)",
+        data=pdf_bytes,
+        file_name="retirement_scenarios.pdf",
+        mime="application/pdf",
+    )
+
+
+def convert_currency(amount, from_currency, to_currency):
+    """
+    Converts an amount between two currencies using the rates in currency_rates.json.
+
+    Cross rates are derived through the base currency, so they are always consistent
+    with each other. The rates file is reloaded automatically when it changes; for
+    arrays of amounts use currency.convert_amounts.
+
     Returns:
-        bytes: The PDF report in bytes.
+        float: The converted amount, or None if either currency code is unknown.
     """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    Story = []
-
-    # --- Title and Introduction ---
-    Story.append(Paragraph("Retirement Readiness Report", styles['Title']))
-    Story.append(Spacer(1, 0.2 * inch))
-    Story.append(Paragraph("This report assesses your retirement readiness.", styles['Normal']))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # --- User Information ---
-    Story.append(Paragraph("Your Information", styles['Heading1']))
-    Story.append(Spacer(1, 0.1 * inch))
-    user_info_text = f"Age: {age}, Gender: {gender_name}, Country: {country_name}, Net Annual Income: {currency_symbol}{income:,.2f},  Assets (Cars): {currency_symbol}{assets_cars:,.2f}, Assets (Land): {currency_symbol}{assets_land:,.2f}, Assets (Others): {currency_symbol}{assets_others:,.2f}, Owns a House: {owns_house}, On Rent: {on_rent}, Loans/Debts Amount: {currency_symbol}{loans_debts_amount:,.2f}, Family Members Count: {family_members_count}, Dependents (Parents): {dependents_parents}, Dependents (Spouse): {dependents_spouse}, Dependents (Children): {dependents_children}, Dependent Health Problems: {dependent_health_problems_yn}, Dependent Health Problems Details: {dependent_health_problems_details}, Upcoming Big Goals: {upcoming_big_goals}, Any Health Issues: {health_issues_yn}, Health Insurance: {health_insurance_yn}, Health Insurance Amount (Monthly/Yearly): {currency_symbol}{health_insurance_amount:,.2f}, Life Insurance: {life_insurance_yn}, Life Insurance Amount (Total): {currency_symbol}{life_insurance_amount_total:,.2f}, Monthly Expenses: {currency_symbol}{monthly_expenses:,.2f}, Pension Contributions: {pension_contributions_yn}, Pension Contributions Amount (Monthly/Yearly): {currency_symbol}{pension_contributions_amount:,.2f}, Expected Inflation Rate: {expected_inflation_rate * 100:.2f}%, Target Retirement Age: {retirement_age_target}"
-    Story.append(Paragraph(user_info_text, styles['Normal']))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # --- Key Results ---
-    Story.append(Paragraph("Key Results", styles['Heading1']))
-    Story.append(Spacer(1, 0.1 * inch))
-    Story.append(Paragraph(f"Verdict: {results['verdict']}", styles['Heading2']))
-    Story.append(Paragraph(f"Corpus Needed: {currency_symbol}{results['corpus_needed']:,.2f}", styles['Normal']))
-    Story.append(Paragraph(f"Corpus Available: {currency_symbol}{results['corpus_available']:,.2f}", styles['Normal']))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # --- Suggestions ---
-    Story.append(Paragraph("Recommendations", styles['Heading1']))
-    Story.append(Spacer(1, 0.1 * inch))
-    for suggestion in results['suggestions']:
-        Story.append(Paragraph(f"- {suggestion}", styles['Bullet']))
-    Story.append(Spacer(1, 0.2 * inch))
-
-    # --- Additional Details (Optional) ---
-    Story.append(Paragraph("Assumptions and Methodology", styles['Heading2']))
-    Story.append(Spacer(1, 0.1 * inch))
-    Story.append(Paragraph(
-        "The calculations in this report are based on standard financial planning principles. It's essential to consult with a qualified financial advisor for personalized advice.",
-        styles['Normal']
-    ))
-
-    doc.build(Story)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
-
-
-
-def save_user_data(country, age, gender, income,
-                   assets_cars, assets_land, assets_others, owns_house, on_rent,
-                   loans_debts_amount, family_members_count, dependents_parents, dependents_spouse,
-                   dependents_children, dependent_health_problems_yn, dependent_health_problems_details, upcoming_big_goals,
-                   health_issues_yn, health_insurance_yn, health_insurance_amount,
-                   life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-                   pension_contributions_yn, pension_contributions_amount,
-                   expected_inflation_rate, retirement_age_target, results, only_source_of_income):
+    from currency import rate_table
+
+    rate = rate_table.rate(from_currency, to_currency)
+    if rate is None:
+        return None
+    return amount * rate
+
+
+def save_user_data(profile, results):
     """
-    Saves user input data and results to a JSON file.  This is a simplified
-    example; ina production environment, you would use a database.
+    Saves user input data and results to the append-only submission store.
+
+    The row is handed to the process-wide write-behind queue and written to the SQLite
+    store (WAL mode) in batches on a background thread, so the request never waits on
+    disk I/O. Use storage.export_submissions_to_excel to produce the user_data.xlsx
+    spreadsheet.
 
     Args:
-        All the input parameters from the main function and results dictionary
+        profile (ProfileInput): The submitted inputs.
+        results (dict): The results dictionary from calculate_retirement_needs.
     """
-    # Create a unique filename (e.g.,based on timestamp)
-    #  Use age, and a few other unique identifiers
-    filename = f"user_data.xlsx"
-    filepath = os.path.join("user_data", filename) #saves the file in user_data directory
-
-    # Ensure the 'user_data' directory exists
-    if not os.path.exists("user_data"):
-        os.makedirs("user_data")
-
-    # Load the workbook if it exists, create a new one if it doesn't
-    wb = load_workbook(filepath) if os.path.exists(filepath) else Workbook()
-    sheet_name = 'Sheet1'
-
-    # Create the sheet if it doesn't exist
-    if sheet_name not in wb.sheetnames:
-        wb.create_sheet(sheet_name)
-
-    sheet = wb[sheet_name] # get the sheet
-    
-
-    # Get the last row.
-    last_row = sheet.max_row
-    # If the sheet is empty, write the headers
-    if  sheet.max_row == 1 and sheet.cell(row=1, column=1).value is None:
-        sheet.append(["Country", "Age", "Gender", "Income", "Assets Cars", "Assets Land", "Assets Others", "Owns House",
-                     "On Rent", "Loans/Debts Amount", "Family Members Count", "Dependents Parents",
-                     "Dependents Spouse", "Dependents Children", "Dependent Health Problems YN",
-                     "Dependent Health Problems Details", "Upcoming Big Goals", "Any Health Issues",
-                     "Health Insurance", "Health Insurance Amount", "Life Insurance",
-                     "Life Insurance Amount Total", "Monthly Expenses", "Pension Contributions",
-                     "Pension Contributions Amount", "Expected Inflation Rate", "Target Retirement Age",
-                     "Results Verdict", "Corpus Needed", "Corpus Available", "Ready",
-                     "Only Source of Income"])  # only add headers if the sheet is newly created
-
-    # Append the data to the sheet
-    sheet.append([country, age, gender, income,
-                    assets_cars, assets_land, assets_others, owns_house, on_rent,
-                    loans_debts_amount, family_members_count, dependents_parents, dependents_spouse,
-                    dependents_children, dependent_health_problems_yn, dependent_health_problems_details, upcoming_big_goals,
-                    health_issues_yn, health_insurance_yn, health_insurance_amount,
-                    life_insurance_yn, life_insurance_amount_total, monthly_expenses,
-                    pension_contributions_yn, pension_contributions_amount,
-                    expected_inflation_rate, retirement_age_target, results["verdict"], results["corpus_needed"], results["corpus_available"], results["ready"], only_source_of_income]) # added only_source_of_income
+    row = submission_row(profile, results)
 
     try:
-        wb.save(filepath)
-        print(f"User data saved to {filepath}")
+        get_writer().submit(row)
+        print("User data queued for saving")
     except Exception as e:
         print(f"Error saving user data: {e}")
 
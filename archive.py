@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs
+
+from storage import DATA_DIR, DEFAULT_DB_PATH, SUBMISSION_FIELDS, iter_submission_batches
+
+# --- Archive Layout ---
+# Submission history compacted into Arrow IPC (or Parquet) files, Hive-partitioned by
+# country and month: archive/country=India/month=2024-05/part-<first id>-0.arrow.
+# Uncompressed IPC files can be memory-mapped, so reads are zero-copy.
+DEFAULT_ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+MANIFEST_NAME = "_manifest.json"
+PARTITION_FIELDS = ("country", "month")
+COMPACT_BATCH_SIZE = 100000
+FORMATS = {"ipc": "arrow", "parquet": "parquet"}
+
+NUMERIC_FIELDS = (
+    "age", "income", "assets_cars", "assets_land", "assets_others", "loans_debts_amount",
+    "family_members_count", "dependents_parents", "dependents_children", "health_insurance_amount",
+    "life_insurance_amount_total", "monthly_expenses", "pension_contributions_amount",
+    "expected_inflation_rate", "retirement_age_target", "corpus_needed", "corpus_available",
+)
+HISTORY_FIELDS = ("id", "created_at", "submission_count") + SUBMISSION_FIELDS
+
+
+def _field_type(name):
+    if name in ("id", "submission_count"):
+        return pa.int64()
+    if name == "created_at":
+        return pa.timestamp("us", tz="UTC")
+    if name in NUMERIC_FIELDS:
+        return pa.float64()
+    if name == "ready":
+        return pa.bool_()
+    return pa.string()
+
+
+ARCHIVE_SCHEMA = pa.schema([(name, _field_type(name)) for name in HISTORY_FIELDS] + [("month", pa.string())])
+PARTITIONING = ds.partitioning(pa.schema([ARCHIVE_SCHEMA.field(name) for name in PARTITION_FIELDS]), flavor="hive")
+
+
+# --- Compaction ---
+def _read_manifest(archive_dir):
+    try:
+        with open(os.path.join(archive_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'last_id': 0, 'rows': 0}
+
+
+def _write_manifest(archive_dir, manifest):
+    fd, tmp_path = tempfile.mkstemp(dir=archive_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(archive_dir, MANIFEST_NAME))  # Atomic
+
+
+def _to_record_batch(rows):
+    """
+    Converts SQLite rows (in HISTORY_FIELDS order) into an Arrow record batch.
+
+    Numbers that do not parse (e.g. text imported from an old workbook) become nulls.
+    """
+    columns = list(zip(*rows))
+    arrays = []
+    for name, values in zip(HISTORY_FIELDS, columns):
+        if name in NUMERIC_FIELDS:
+            values = [value if isinstance(value, (int, float)) else None for value in values]
+        elif name == "ready":
+            values = [None if value is None else bool(value) for value in values]
+        elif name not in ("id", "submission_count", "created_at"):
+            values = [None if value is None else str(value) for value in values]
+        arrays.append(pa.array(values, type=pa.string() if name == "created_at" else _field_type(name)))
+    created_at = arrays[HISTORY_FIELDS.index("created_at")]
+    arrays[HISTORY_FIELDS.index("created_at")] = pc.cast(
+        pc.strptime(pc.utf8_slice_codeunits(created_at, 0, 19), format="%Y-%m-%dT%H:%M:%S", unit="us"),
+        _field_type("created_at"))
+    arrays.append(pc.utf8_slice_codeunits(created_at, 0, 7))
+    return pa.RecordBatch.from_arrays(arrays, schema=ARCHIVE_SCHEMA)
+
+
+def compact_submissions(archive_dir=DEFAULT_ARCHIVE_DIR, db_path=DEFAULT_DB_PATH, file_format="ipc",
+                        rebuild=False, batch_size=COMPACT_BATCH_SIZE):
+    """
+    Appends submissions not yet archived to the partitioned columnar archive.
+
+    The manifest records the highest submission id archived, so each run only reads new
+    rows from the store, in batches of batch_size. Every batch becomes one new file per
+    country/month partition it touches.
+
+    Duplicate resubmissions update submission_count on rows that may already be
+    archived; pass rebuild=True to recompute the archive from scratch with fresh counts.
+
+    Args:
+        archive_dir (str): Root directory of the archive.
+        db_path (str): Path of the SQLite submission store.
+        file_format (str): "ipc" (Arrow IPC, memory-mappable) or "parquet" (smaller).
+        rebuild (bool): Delete the archive and recompute it from the whole store.
+        batch_size (int): Rows read from the store per batch.
+    Returns:
+        int: Number of submissions added to the archive.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported archive format: {file_format}")
+    if rebuild and os.path.exists(archive_dir):
+        shutil.rmtree(archive_dir)
+    os.makedirs(archive_dir, exist_ok=True)
+    manifest = _read_manifest(archive_dir)
+    if manifest.get('format', file_format) != file_format:
+        raise ValueError(f"Archive is stored as {manifest['format']}; rebuild to change formats.")
+
+    added = 0
+    for rows in iter_submission_batches(HISTORY_FIELDS, manifest['last_id'], batch_size, db_path):
+        batch = _to_record_batch(rows)
+        ds.write_dataset(
+            batch, archive_dir, format=file_format,
+            partitioning=PARTITIONING,
+            basename_template=f"part-{rows[0][0]:012d}-{{i}}.{FORMATS[file_format]}",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        added += len(rows)
+        # Written after each batch, so an interrupted run resumes where it stopped
+        manifest = {'last_id': rows[-1][0], 'rows': manifest['rows'] + len(rows), 'format': file_format}
+        _write_manifest(archive_dir, manifest)
+    return added
+
+
+# --- Reading ---
+def open_history(archive_dir=DEFAULT_ARCHIVE_DIR):
+    """
+    Opens the archive as a pyarrow Dataset over memory-mapped files.
+
+    country and month come from the partition directories, so filters on them skip
+    whole files; column projections read only the requested columns.
+    """
+    manifest = _read_manifest(archive_dir)
+    file_format = manifest.get('format', "ipc")
+    return ds.dataset(archive_dir, schema=ARCHIVE_SCHEMA, format=file_format, partitioning=PARTITIONING,
+                      filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True),
+                      exclude_invalid_files=False, ignore_prefixes=["_", "."])
+
+
+def read_history(columns=None, country=None, since_month=None, until_month=None, ready=None,
+                 archive_dir=DEFAULT_ARCHIVE_DIR):
+    """
+    Reads a projection of the archive into an Arrow table.
+
+    Args:
+        columns (list, optional): Columns to read; all when None.
+        country (str or list, optional): Country name(s).
+        since_month, until_month (str, optional): Inclusive "YYYY-MM" bounds.
+        ready (bool, optional): Readiness flag.
+        archive_dir (str): Root directory of the archive.
+    Returns:
+        pyarrow.Table: The matching rows. Call to_pandas() for a DataFrame.
+    """
+    expression = None
+    conditions = []
+    if country is not None:
+        countries = [country] if isinstance(country, str) else list(country)
+        conditions.append(ds.field("country").isin(countries))
+    if since_month is not None:
+        conditions.append(ds.field("month") >= since_month)
+    if until_month is not None:
+        conditions.append(ds.field("month") <= until_month)
+    if ready is not None:
+        conditions.append(ds.field("ready") == bool(ready))
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return open_history(archive_dir).to_table(columns=columns, filter=expression)
+
+
+def readiness_rates(group_by=("country", "month"), archive_dir=DEFAULT_ARCHIVE_DIR, **filters):
+    """
+    Share of ready submissions per group, computed from the ready column alone.
+
+    Args:
+        group_by (tuple): Archive columns to group on.
+        filters: As in read_history.
+    Returns:
+        pd.DataFrame: group columns, submissions, ready_count and readiness_rate.
+    """
+    table = read_history(columns=list(group_by) + ["ready"], archive_dir=archive_dir, **filters)
+    table = table.append_column("ready_int", pc.cast(table["ready"], pa.int64()))
+    grouped = table.group_by(list(group_by)).aggregate([("ready", "count"), ("ready_int", "sum")])
+    frame = grouped.to_pandas().rename(columns={'ready_count': 'submissions', 'ready_int_sum': 'ready_count'})
+    frame['readiness_rate'] = frame['ready_count'] / frame['submissions']
+    return frame.sort_values(list(group_by)).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact and query the columnar submission archive.")
+    parser.add_argument("command", choices=["compact", "rates"],
+                        help="append new submissions to the archive, or print readiness rates")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite database path")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_DIR, help="archive directory")
+    parser.add_argument("--format", default="ipc", choices=sorted(FORMATS), help="archive file format")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the archive from scratch")
+    parser.add_argument("--group-by", nargs="+", default=["country", "month"], help="columns to group rates by")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        print(f"Archived {compact_submissions(args.archive, args.db, args.format, args.rebuild)} submissions "
+              f"to {args.archive}")
+    else:
+        print(readiness_rates(tuple(args.group_by), args.archive).to_string(index=False))
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from calculator import REPLACEMENT_RATIO, POST_RETIREMENT_RETURN_RATE
+from suggestions import SUGGESTION_FIELDS, match_suggestions_columns, suggestion_context
+from validation import DEFAULTS, RULES, profile_column, validate_columns
+
+READY_VERDICT = "Ready to Retire ✅"
+NOT_READY_VERDICT = "Not Ready to Retire ❌"
+CORPUS_FIELDS = ("age", "income", "retirement_age_target", "expected_inflation_rate", "assets_cars",
+                 "assets_land", "assets_others", "loans_debts_amount")
+
+
+def _inflation_factor(expected_inflation_rate, years_to_retirement):
+    """
+    Computes (1 + rate) ** years element-wise with the same libm pow the scalar path uses.
+
+    NumPy's SIMD float64 power can differ from Python's float ** int in the last bit, so
+    the exponentiation runs through an object-dtype loop (still a single C-level pass)
+    to keep batch and scalar results identical.
+    """
+    base = np.asarray(1 + expected_inflation_rate, dtype=float).astype(object)
+    years = np.asarray(years_to_retirement).astype(object)
+    return np.asarray(base ** years, dtype=float)
+
+
+def calculate_retirement_needs_batch(profiles):
+    """
+    Vectorized counterpart of calculate_retirement_needs for many profiles at once.
+
+    Args:
+        profiles (pd.DataFrame, dict or np.ndarray): One row (or array element) per
+            profile, with columns named like the calculate_retirement_needs parameters; a
+            structured array from profile_input.profiles_to_array is used as is. Columns the
+            corpus math does not use may be omitted; only_source_of_income defaults to "N".
+    Returns:
+        pd.DataFrame: Columnar results, one row per profile, with years_to_retirement,
+            inflation_factor, corpus_needed, corpus_available, ready, valid, error_codes
+            (validation.decode_error_codes turns one into rule codes), verdict and
+            suggestion_ids (bitset of suggestion rule IDs; see suggestions.render_suggestions).
+            Numbers match the scalar function exactly; invalid rows carry the same error
+            verdict the scalar function would return and zero corpus values.
+    """
+    index = profiles.index if isinstance(profiles, pd.DataFrame) else None
+
+    # --- Input Validation and Handling ---
+    # One mask sweep per validation rule; the verdict of an invalid row is the message of
+    # its first failing rule, as in the scalar function. The math below runs on the
+    # coerced numeric columns (NaN where a value is missing or not a number), so one bad
+    # row cannot fail the whole batch; invalid rows are zeroed afterwards.
+    validation = validate_columns(profiles)
+    valid = validation['valid']
+    messages = np.array([rule.message for rule in RULES] + [""])
+    numeric = validation['numeric']
+    for field in CORPUS_FIELDS:
+        if field not in numeric:
+            raise KeyError(f"Missing profile field: {field}")
+    age = numeric["age"]
+    income = numeric["income"]
+    retirement_age_target = numeric["retirement_age_target"]
+    expected_inflation_rate = numeric["expected_inflation_rate"]
+    assets_cars = numeric["assets_cars"]
+    assets_land = numeric["assets_land"]
+    assets_others = numeric["assets_others"]
+    loans_debts_amount = numeric["loans_debts_amount"]
+
+    # --- Calculations ---
+    with np.errstate(invalid="ignore", over="ignore"):
+        years_to_retirement = retirement_age_target - age
+        inflation_factor = _inflation_factor(expected_inflation_rate, years_to_retirement)
+        required_income_at_retirement = income * REPLACEMENT_RATIO * inflation_factor
+
+    corpus_needed = np.where(valid, required_income_at_retirement / POST_RETIREMENT_RETURN_RATE, 0.0)
+    corpus_available = np.where(valid, assets_cars + assets_land + assets_others - loans_debts_amount, 0)
+    ready = valid & (corpus_available >= corpus_needed)
+    verdict = np.where(valid, np.where(ready, READY_VERDICT, NOT_READY_VERDICT), messages[validation['first_error']])
+
+    # --- Suggestions ---
+    # Each rule is one column mask; rows keep only a rule-ID bitset, rendered on display
+    # with suggestions.render_suggestions.
+    columns = {}
+    for field in SUGGESTION_FIELDS:
+        if field in numeric:
+            columns[field] = numeric[field]
+            continue
+        try:
+            columns[field] = profile_column(profiles, field, DEFAULTS.get(field))
+        except KeyError:
+            continue
+    context = suggestion_context(columns, corpus_needed, corpus_available, ready, years_to_retirement)
+    suggestion_ids = np.where(valid, match_suggestions_columns(context, len(valid)), 0)
+
+    return pd.DataFrame({
+        'years_to_retirement': years_to_retirement,
+        'inflation_factor': inflation_factor,
+        'corpus_needed': corpus_needed,
+        'corpus_available': corpus_available,
+        'ready': ready,
+        'valid': valid,
+        'error_codes': validation['error_codes'],
+        'verdict': verdict,
+        'suggestion_ids': suggestion_ids,
+    }, index=index)
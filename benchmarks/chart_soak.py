@@ -0,0 +1,83 @@
+"""
+Memory soak test for the corpus chart renderer (charts.py).
+
+Renders the chart many times with distinct values, bypassing the PNG cache so every call
+draws a new figure, and samples the process RSS along the way. The run passes when RSS
+after the warm-up stays within a tolerance and pyplot's figure registry stays empty.
+
+Usage:
+    python benchmarks/chart_soak.py                    # 10k renders
+    python benchmarks/chart_soak.py --renders 2000 --legacy   # the old plt.subplots() path
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from charts import render_corpus_chart  # noqa: E402
+
+
+def rss_mb():
+    """
+    Returns the current resident set size in MB (Linux /proc, falling back to peak RSS).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy_render(corpus_available, corpus_needed, ready, currency_symbol):
+    """
+    The pre-fix chart path: a pyplot figure that is never closed.
+    """
+    from io import BytesIO
+
+    fig, ax = plt.subplots()
+    ax.bar([f'Corpus Available ({currency_symbol})', f'Corpus Needed ({currency_symbol})'],
+           [corpus_available, corpus_needed], color=['green' if ready else 'red', 'blue'])
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test corpus chart rendering for memory growth.")
+    parser.add_argument("--renders", type=int, default=10000, help="number of charts to render")
+    parser.add_argument("--warmup", type=int, default=200, help="renders before the baseline RSS sample")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="allowed RSS growth in MB after warm-up")
+    parser.add_argument("--legacy", action="store_true", help="soak the old unclosed pyplot path instead")
+    args = parser.parse_args()
+
+    render = legacy_render if args.legacy else render_corpus_chart.__wrapped__
+    step = max(1, args.renders // 10)
+    baseline = None
+    for i in range(args.renders):
+        render(1000.0 + i, 2000.0 + i, i % 2 == 0, "$")
+        if i + 1 == args.warmup:
+            baseline = rss_mb()
+        if (i + 1) % step == 0:
+            print(f"{i + 1:>7} renders  RSS {rss_mb():8.1f} MB  pyplot figures {len(plt.get_fignums())}")
+
+    if baseline is None:
+        baseline = rss_mb()
+    growth = rss_mb() - baseline
+    open_figures = len(plt.get_fignums())
+    print(f"RSS growth after warm-up: {growth:.1f} MB (tolerance {args.tolerance:.1f} MB), "
+          f"open pyplot figures: {open_figures}")
+    if growth > args.tolerance or open_figures:
+        print("FAIL: memory is not flat")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Behavior checks for calculations that are easy to break without noticing.
+
+Each check builds its own seeded inputs, so a run needs no data files. The script
+prints one line per check and exits with status 1 if any of them fails.
+
+Usage:
+    python benchmarks/checks.py                 # run every check
+    python benchmarks/checks.py --only goal_seek batch_parity
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# --- Goal Seek ---
+def check_goal_seek():
+    """
+    A profile that is not ready on its assets alone, but saves enough of its income each
+    month, gets a finite earliest retirement age from its real saving rate.
+    """
+    from goal_seek import (current_monthly_saving, max_monthly_expense, min_retirement_age,
+                           readiness_margin, required_extra_savings)
+
+    profile = {
+        'age': 30, 'retirement_age_target': 60, 'income': 1200000.0, 'monthly_expenses': 40000.0,
+        'expected_inflation_rate': 0.03, 'assets_cars': 0.0, 'assets_land': 0.0,
+        'assets_others': 100000.0, 'loans_debts_amount': 0.0,
+    }
+    saving = current_monthly_saving(profile)
+    assert saving == 60000.0, f"monthly saving {saving}, expected 60000.0"
+    assert readiness_margin(profile) < 0, "profile should not be ready on its assets alone"
+    assert min_retirement_age(profile) is None, "without saving no age up to the maximum should work"
+
+    earliest = min_retirement_age(profile, saving)
+    assert earliest is not None, "a profile that saves 60000 a month should get a finite age"
+    assert profile['age'] < earliest <= 60, f"earliest age {earliest} outside ({profile['age']}, 60]"
+    assert readiness_margin(profile, earliest, monthly_saving=saving) >= 0
+    assert readiness_margin(profile, earliest - 1, monthly_saving=saving) < 0
+
+    extra = required_extra_savings(profile, saving)
+    assert extra == {'lump_sum': 0.0, 'monthly': 0.0}, f"ready at 60 yet extra saving {extra}"
+    needed = required_extra_savings(profile)['monthly']
+    expense = max_monthly_expense(profile)
+    assert abs(expense - (profile['income'] / 12 - needed)) < 1e-6
+    assert profile['monthly_expenses'] <= expense < profile['income'] / 12, f"max expense {expense}"
+
+    # Saving less than needed leaves a positive extra saving that exactly closes the gap
+    profile['monthly_expenses'] = 80000.0
+    saving = current_monthly_saving(profile)
+    extra = required_extra_savings(profile, saving)['monthly']
+    assert extra > 0, "a profile saving 20000 a month should need more"
+    assert abs(float(readiness_margin(profile, monthly_saving=saving + extra))) < 1e-3
+
+
+# --- Batch Parity ---
+# Values written over seeded rows to exercise the error verdicts: (field, value).
+BAD_VALUES = (
+    ("assets_cars", "abc"), ("income", None), ("age", float("nan")), ("monthly_expenses", "12k"),
+    ("loans_debts_amount", -1.0), ("income", -500.0), ("retirement_age_target", 18),
+    ("owns_house", "maybe"), ("only_source_of_income", ""), ("expected_inflation_rate", True),
+)
+
+
+def check_batch_parity(count=2000, seed=7):
+    """
+    calculate_retirement_needs_batch agrees with calculate_retirement_needs row by row:
+    verdicts, ready flags, error codes, corpus values (exactly) and rendered suggestions,
+    on seeded profiles with some bad values mixed in.
+    """
+    import pandas as pd
+
+    from batch import calculate_retirement_needs_batch
+    from calculator import CURRENCY_DATA, calculate_retirement_needs
+    from suggestions import render_suggestions
+    from suite import generate_profiles
+    from validation import decode_error_codes
+
+    frame = pd.DataFrame(generate_profiles(count, seed)).astype(object)
+    for row, (field, value) in enumerate(BAD_VALUES * 5):
+        frame.at[row * (count // 50), field] = value
+
+    batch = calculate_retirement_needs_batch(frame)
+    mismatches = []
+    for index, (row, record) in enumerate(zip(batch.to_dict("records"), frame.to_dict("records"))):
+        scalar = calculate_retirement_needs(**record)
+        currency_symbol = CURRENCY_DATA.get(record['country'], {}).get("symbol", "")
+        checks = {
+            'verdict': (row['verdict'], scalar['verdict']),
+            'ready': (bool(row['ready']), bool(scalar['ready'])),
+            'valid': (bool(row['valid']), not scalar.get('errors')),
+            'errors': (decode_error_codes(row['error_codes']), scalar.get('errors', [])),
+        }
+        if not scalar.get('errors'):
+            checks['corpus_needed'] = (float(row['corpus_needed']), float(scalar['corpus_needed']))
+            checks['corpus_available'] = (float(row['corpus_available']), float(scalar['corpus_available']))
+            checks['suggestions'] = (render_suggestions(int(row['suggestion_ids']), row, currency_symbol),
+                                     scalar['suggestions'])
+        mismatches += [f"row {index}: {name} batch={pair[0]!r} scalar={pair[1]!r}"
+                       for name, pair in checks.items() if pair[0] != pair[1]]
+    errors = sum(1 for valid in batch['valid'] if not valid)
+    assert errors >= len(BAD_VALUES), f"only {errors} error rows; the bad values did not take"
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[0]}"
+
+
+# --- Scalar Latency ---
+# Best-of-repeats microseconds per call allowed on the single-profile path the app, the
+# API and the bulk CLI use; about twice what it takes on a laptop-class CPU, so a
+# regression that interprets the schema per call fails while machine noise does not.
+SCALAR_BUDGETS_US = {
+    "validate_profile": 12.0,
+    "calculate_retirement_needs": 35.0,
+}
+LATENCY_PROFILE = {
+    'age': 40, 'gender': "Female", 'country': "India", 'income': 500000, 'expenses': 300000,
+    'assets_cars': 100000, 'assets_land': 200000, 'assets_others': 300000, 'owns_house': "N",
+    'on_rent': "Y", 'loans_debts_amount': 100000, 'family_members_count': 4, 'dependents_parents': 0,
+    'dependents_spouse': "Y", 'dependents_children': 2, 'dependent_health_problems_yn': "N",
+    'dependent_health_problems_details': "", 'upcoming_big_goals': "Children's Education",
+    'health_issues_yn': "N", 'health_insurance_yn': "Y", 'health_insurance_amount': 20000,
+    'life_insurance_yn': "Y", 'life_insurance_amount_total': 1000000, 'monthly_expenses': 25000,
+    'pension_contributions_yn': "N", 'pension_contributions_amount': 0, 'expected_inflation_rate': 0.06,
+    'retirement_age_target': 60, 'only_source_of_income': "Y",
+}
+
+
+def check_scalar_latency(number=1000, repeat=30):
+    """
+    One profile goes through the scalar validator and calculator within SCALAR_BUDGETS_US.
+
+    The minimum over many short repeats is compared, which filters out other load.
+    """
+    from calculator import calculate_retirement_needs
+    from validation import validate_profile
+
+    calls = {
+        "validate_profile": lambda: validate_profile(LATENCY_PROFILE),
+        "calculate_retirement_needs": lambda: calculate_retirement_needs(**LATENCY_PROFILE),
+    }
+    over = []
+    for name, budget in SCALAR_BUDGETS_US.items():
+        call = calls[name]
+        call()
+        micros = min(timeit.repeat(call, number=number, repeat=repeat)) / number * 1e6
+        print(f"     {name}: {micros:.1f} us per call (budget {budget:.1f} us)")
+        if micros > budget:
+            over.append(f"{name} {micros:.1f} us > {budget:.1f} us")
+    assert not over, ", ".join(over)
+
+
+CHECKS = {
+    "goal_seek": check_goal_seek,
+    "batch_parity": check_batch_parity,
+    "scalar_latency": check_scalar_latency,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run behavior checks of the calculations.")
+    parser.add_argument("--only", nargs="+", choices=sorted(CHECKS), help="checks to run")
+    args = parser.parse_args()
+
+    failed = []
+    for name in args.only or CHECKS:
+        try:
+            CHECKS[name]()
+        except AssertionError as e:
+            failed.append(name)
+            print(f"FAIL {name}: {e}")
+        except Exception as e:  # A crash fails the check too, and the others still run
+            failed.append(name)
+            print(f"FAIL {name}: {type(e).__name__}: {e}")
+        else:
+            print(f"ok   {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
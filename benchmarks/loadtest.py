@@ -0,0 +1,110 @@
+"""
+Local load generator for the JSON API (api.py).
+
+Opens a number of keep-alive HTTP/1.1 connections and sends requests back to back on
+each of them for a fixed duration, then reports requests/sec and latency percentiles.
+Uses only the standard library.
+
+Usage:
+    python api.py &
+    python benchmarks/loadtest.py --path /calculate --concurrency 32 --duration 10
+    python benchmarks/loadtest.py --path /calculate --batch 1000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+SAMPLE_PROFILE = {
+    "age": 40, "gender": "Male", "country": "India", "income": 500000, "expenses": 300000,
+    "assets_cars": 100000, "assets_land": 200000, "assets_others": 300000,
+    "owns_house": "Y", "on_rent": "N", "loans_debts_amount": 100000, "family_members_count": 4,
+    "dependents_parents": 0, "dependents_spouse": "Y", "dependents_children": 2,
+    "dependent_health_problems_yn": "N", "dependent_health_problems_details": "",
+    "upcoming_big_goals": "Children's Education", "health_issues_yn": "N", "health_insurance_yn": "Y",
+    "health_insurance_amount": 10000, "life_insurance_yn": "Y", "life_insurance_amount_total": 500000,
+    "monthly_expenses": 25000, "pension_contributions_yn": "Y", "pension_contributions_amount": 5000,
+    "expected_inflation_rate": 0.06, "retirement_age_target": 60, "only_source_of_income": "N",
+}
+
+
+def build_body(path, batch):
+    if path == "/convert":
+        if batch > 1:
+            return {"amounts": [1000.0] * batch, "from": "USD", "to": "INR"}
+        return {"amount": 1000.0, "from": "USD", "to": "INR"}
+    if batch > 1:
+        return {"profiles": [SAMPLE_PROFILE] * batch}
+    return SAMPLE_PROFILE
+
+
+async def worker(host, port, request_bytes, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request_bytes)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - start)
+            if b" 200 " not in status_line:
+                errors.append(status_line.decode("latin-1").strip())
+    finally:
+        writer.close()
+
+
+async def run(url, path, concurrency, duration, batch):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    body = json.dumps(build_body(path, batch)).encode("utf-8")
+    request_bytes = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n").encode("ascii") + body
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(host, port, request_bytes, deadline, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the retirement calculator API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--path", default="/calculate", choices=["/calculate", "/convert", "/report", "/simulate"])
+    parser.add_argument("--concurrency", type=int, default=16, help="parallel keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--batch", type=int, default=1, help="profiles (or amounts) per request")
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(run(args.url, args.path, args.concurrency, args.duration, args.batch))
+    if not latencies:
+        print("No requests completed.")
+        return
+
+    latencies.sort()
+    p99_index = min(len(latencies) - 1, int(len(latencies) * 0.99))
+    print(f"{args.path}: {len(latencies)} requests in {elapsed:.1f}s "
+          f"({len(latencies) / elapsed:.1f} req/s, {len(latencies) * args.batch / elapsed:.1f} items/s)")
+    print(f"latency p50 {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p99 {latencies[p99_index] * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    if errors:
+        print(f"{len(errors)} non-200 responses, e.g. {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
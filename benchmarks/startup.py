@@ -0,0 +1,95 @@
+"""
+Cold-start benchmark for the Retirement Readiness Checker.
+
+Each measurement runs in a fresh interpreter, so module caches from earlier runs do not
+hide import costs:
+
+* import_calculator: importing the core calculator (no Streamlit, plotting or PDF stack)
+* import_app1: importing the Streamlit app module
+* first_render: importing app1 and running the script once through Streamlit's AppTest
+
+Usage:
+    python benchmarks/startup.py                      # compare against the baseline
+    python benchmarks/startup.py --update-baseline    # record a new baseline
+
+Exits with status 1 when a median exceeds its baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+MEASUREMENTS = {
+    "import_calculator": (
+        "import time; t = time.perf_counter(); import calculator; print(time.perf_counter() - t)"
+    ),
+    "import_app1": (
+        "import time; t = time.perf_counter(); import app1; print(time.perf_counter() - t)"
+    ),
+    "first_render": (
+        "import time; t = time.perf_counter()\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        f"AppTest.from_file({os.path.join(REPO_DIR, 'app1.py')!r}, default_timeout=60).run()\n"
+        "print(time.perf_counter() - t)"
+    ),
+}
+
+
+def measure(code, repeats):
+    """
+    Runs code in fresh interpreters and returns the seconds each run printed.
+    """
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, check=True,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and first-render time.")
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown over the baseline, as a fraction (default: 0.5)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in MEASUREMENTS.items():
+        results[name] = statistics.median(measure(code, args.repeats))
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({name: round(value, 4) for name, value in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    for name, value in results.items():
+        line = f"{name:<18} {value * 1000:9.1f} ms"
+        if name in baseline:
+            limit = baseline[name] * (1 + args.tolerance)
+            line += f"   baseline {baseline[name] * 1000:9.1f} ms"
+            if value > limit:
+                regressions.append(name)
+                line += "   REGRESSION"
+        print(line)
+
+    if regressions:
+        print(f"Cold start regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
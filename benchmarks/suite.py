@@ -0,0 +1,369 @@
+"""
+Benchmark suite for the hot paths of the Retirement Readiness Checker.
+
+Benchmarks are grouped by the code path they exercise:
+
+* calculator: calculate_retirement_needs per profile, and calculate_retirement_needs_batch
+* currency: app1.convert_currency per amount, and currency.convert_amounts over arrays
+* pdf: report.create_pdf_report, uncached and from the PDF cache
+* chart: charts.render_corpus_chart, uncached and from the result cache
+* persistence: the save_user_data write-behind queue, single appends, queries, the cohort
+  aggregates and the Excel export, against a submission store of each history size
+
+Profiles come from a seeded synthetic generator at 1, 10k and 1M profiles; histories of
+1k, 100k and 1M rows are built from the same generator in a temporary directory. Each
+benchmark reports throughput (items/s), per-call latency percentiles and the peak Python
+memory (tracemalloc) of one extra call, and the results are saved as JSON.
+
+Usage:
+    python benchmarks/suite.py                              # all groups, all scales
+    python benchmarks/suite.py --quick                      # skip the 1M scales
+    python benchmarks/suite.py --only calculator currency   # some groups only
+    python benchmarks/suite.py --output results.json        # also keep this run
+    python benchmarks/suite.py --compare results.json       # compare a saved run, don't measure
+    python benchmarks/suite.py --update-baseline            # record a new baseline
+
+Exits with status 1 when a median latency exceeds its baseline by more than the
+tolerance. Baselines are machine-specific: record one on the machine that compares.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "suite_baseline.json")
+sys.path.insert(0, REPO_DIR)
+
+from batch import calculate_retirement_needs_batch  # noqa: E402
+from calculator import CURRENCY_DATA, calculate_retirement_needs  # noqa: E402
+from profile_input import profile_dtype, profiles_from_array  # noqa: E402
+
+PROFILE_SCALES = (1, 10000, 1000000)
+HISTORY_SCALES = (1000, 100000, 1000000)
+QUICK_LIMIT = 100000  # --quick skips scales above this
+GROUPS = ("calculator", "currency", "pdf", "chart", "persistence")
+
+# Per-profile paths are timed on at most this many profiles; larger scales go through the
+# batch paths only.
+SCALAR_LIMIT = 10000
+EXCEL_LIMIT = 100000  # Largest history exported to Excel
+HISTORY_CHUNK = 100000  # Profiles generated and appended at a time when building a history
+MIN_CALLS = 3
+MAX_CALLS = 10000
+TIME_BUDGET = 2.0  # Seconds of calls per benchmark, after MIN_CALLS
+
+COUNTRIES = tuple(CURRENCY_DATA)
+GOALS = ("", "Children's Education", "Buying a House", "Travel", "Children's Education, Travel")
+
+
+# --- Synthetic Data ---
+def generate_profiles(count, seed=0):
+    """
+    Returns count random profiles as a structured array (profile_input.profile_dtype).
+
+    Ages, incomes and expenses are spread over realistic ranges; about 1% of profiles
+    have a target retirement age at or below their age, so the error path runs too.
+    """
+    rng = np.random.default_rng(seed)
+    profiles = np.zeros(count, dtype=profile_dtype())
+    yes_no = np.array(["Y", "N"])
+
+    age = rng.integers(20, 65, count)
+    income = rng.lognormal(11, 1, count).round(2)
+    profiles["age"] = age
+    profiles["gender"] = rng.choice(["Male", "Female", "Other"], count)
+    profiles["country"] = rng.choice(COUNTRIES, count)
+    profiles["income"] = income
+    profiles["expenses"] = (income * rng.uniform(0.3, 0.9, count)).round(2)
+    for field in ("assets_cars", "assets_land", "assets_others"):
+        profiles[field] = rng.lognormal(11, 1.5, count).round(2) * rng.integers(0, 2, count)
+    for field in ("owns_house", "on_rent", "dependents_spouse", "dependent_health_problems_yn",
+                  "health_issues_yn", "health_insurance_yn", "life_insurance_yn",
+                  "pension_contributions_yn", "only_source_of_income"):
+        profiles[field] = rng.choice(yes_no, count)
+    profiles["loans_debts_amount"] = rng.lognormal(10, 1.5, count).round(2) * rng.integers(0, 2, count)
+    profiles["family_members_count"] = rng.integers(1, 7, count)
+    profiles["dependents_parents"] = rng.integers(0, 3, count)
+    profiles["dependents_children"] = rng.integers(0, 4, count)
+    profiles["dependent_health_problems_details"] = ""
+    profiles["upcoming_big_goals"] = rng.choice(GOALS, count).astype(object)
+    profiles["health_insurance_amount"] = rng.uniform(0, 50000, count).round(2)
+    profiles["life_insurance_amount_total"] = rng.uniform(0, 1000000, count).round(2)
+    profiles["monthly_expenses"] = (profiles["expenses"] / 12).round(2)
+    profiles["pension_contributions_amount"] = rng.uniform(0, 20000, count).round(2)
+    profiles["expected_inflation_rate"] = rng.uniform(0.01, 0.1, count).round(4)
+    target = age + rng.integers(1, 30, count)
+    invalid = rng.random(count) < 0.01
+    target[invalid] = age[invalid]  # Invalid: not above the current age
+    profiles["retirement_age_target"] = target
+    return profiles
+
+
+def build_history(count, db_path, seed=1):
+    """
+    Fills a submission store with count scored synthetic profiles, in chunks.
+
+    Returns:
+        float: Seconds spent in storage.append_profiles.
+    """
+    from storage import append_profiles
+
+    elapsed = 0.0
+    for start in range(0, count, HISTORY_CHUNK):
+        profiles = generate_profiles(min(HISTORY_CHUNK, count - start), seed + start)
+        results = calculate_retirement_needs_batch(profiles)
+        began = time.perf_counter()
+        append_profiles(profiles, results, db_path)
+        elapsed += time.perf_counter() - began
+    return elapsed
+
+
+# --- Measurement ---
+def measure(func, items=1, min_calls=MIN_CALLS, max_calls=MAX_CALLS, budget=TIME_BUDGET, memory=True,
+            warmup=True):
+    """
+    Calls func repeatedly and summarizes its latency, throughput and peak memory.
+
+    func receives the call number, so it can cycle through inputs. Calls stop after
+    max_calls, or once min_calls have run and the time budget is spent.
+
+    Args:
+        items (int): Items (profiles, amounts, rows) handled per call.
+        memory (bool): Trace one extra call with tracemalloc for the peak memory.
+        warmup (bool): Make one untimed call first (lazy imports, font caches).
+    Returns:
+        dict: calls, items, seconds, throughput (items/s), latency_ms (p50, p90, p99, max)
+            and peak_memory_mb (None when not traced).
+    """
+    if warmup:
+        func(-1)
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < max_calls:
+        began = time.perf_counter()
+        func(len(latencies))
+        latencies.append(time.perf_counter() - began)
+        if len(latencies) >= min_calls and time.perf_counter() - started > budget:
+            break
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func(len(latencies))
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return summarize(latencies, items, peak)
+
+
+def summarize(latencies, items=1, peak=None):
+    latencies = np.asarray(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+    return {
+        'calls': len(latencies),
+        'items': items,
+        'seconds': round(float(latencies.sum()), 6),
+        'throughput': round(float(items * len(latencies) / latencies.sum()), 3),
+        'latency_ms': {'p50': round(float(p50), 4), 'p90': round(float(p90), 4),
+                       'p99': round(float(p99), 4), 'max': round(float(latencies.max() * 1000), 4)},
+        'peak_memory_mb': None if peak is None else round(peak, 3),
+    }
+
+
+# --- Benchmarks ---
+# Each yields (name, result) pairs; names carry the scale in brackets.
+def bench_calculator(profile_scales):
+    for scale in profile_scales:
+        profiles = generate_profiles(scale)
+        if scale <= SCALAR_LIMIT:
+            records = profiles_from_array(profiles)
+            yield f"calculator.scalar[{scale}]", measure(
+                lambda i: calculate_retirement_needs(records[i % scale]), max_calls=max(scale, 1000))
+        yield f"calculator.batch[{scale}]", measure(
+            lambda i: calculate_retirement_needs_batch(profiles), items=scale, max_calls=100)
+
+
+def bench_currency(profile_scales):
+    from app1 import convert_currency
+    from currency import convert_amounts
+
+    codes = np.array([CURRENCY_DATA[country]["code"] for country in COUNTRIES])
+    yield "currency.scalar", measure(lambda i: convert_currency(1000.0, codes[i % len(codes)], "USD"))
+    for scale in profile_scales:
+        rng = np.random.default_rng(scale)
+        amounts = rng.uniform(0, 1e6, scale)
+        source, target = rng.choice(codes, scale), rng.choice(codes, scale)
+        yield f"currency.batch[{scale}]", measure(
+            lambda i: convert_amounts(amounts, source, target), items=scale, max_calls=100)
+
+
+def _scored_profiles(count):
+    records = profiles_from_array(generate_profiles(count))
+    return [(calculate_retirement_needs(record), record, CURRENCY_DATA[record.country]["symbol"])
+            for record in records]
+
+
+def bench_pdf(profile_scales):
+    from report import create_pdf_report
+
+    scored = _scored_profiles(50)
+    yield "pdf.report[uncached]", measure(lambda i: create_pdf_report.__wrapped__(*scored[i % len(scored)]))
+    create_pdf_report(*scored[0])
+    yield "pdf.report[cached]", measure(lambda i: create_pdf_report(*scored[0]))
+
+
+def bench_chart(profile_scales):
+    from charts import render_corpus_chart
+
+    arguments = [(results['corpus_available'], results['corpus_needed'], results['ready'], symbol)
+                 for results, _, symbol in _scored_profiles(50)]
+    yield "chart.render[uncached]", measure(lambda i: render_corpus_chart.__wrapped__(*arguments[i % len(arguments)]))
+    render_corpus_chart(*arguments[0])
+    yield "chart.render[cached]", measure(lambda i: render_corpus_chart(*arguments[0]))
+
+
+def bench_persistence(history_scales):
+    from storage import (aggregate_submissions, append_submission, export_submissions_to_excel,
+                         load_cohorts, query_submissions, submission_row)
+    from write_behind import SubmissionWriter
+
+    # Rows not in any history (different seed): the first 1000 for single appends, then
+    # 1000 per write-behind call, so every timed write stores new rows
+    fresh = [submission_row(record, calculate_retirement_needs(record))
+             for record in profiles_from_array(generate_profiles(8000, seed=99))]
+    directory = tempfile.mkdtemp(prefix="retirement-bench-")
+    try:
+        for scale in history_scales:
+            db_path = os.path.join(directory, f"history-{scale}.db")
+            elapsed = build_history(scale, db_path)
+            yield f"persistence.bulk_append[{scale}]", summarize([elapsed], items=scale)
+
+            yield f"persistence.append_one[{scale}]", measure(
+                lambda i: append_submission(fresh[i], db_path), max_calls=1000, memory=False, warmup=False)
+
+            def write_behind(i):
+                # save_user_data only enqueues; this times the enqueue of 1000 rows plus the
+                # background flush they trigger
+                writer = SubmissionWriter(db_path, flush_interval=0.01)
+                for row in fresh[1000 * (i + 2):1000 * (i + 3)]:
+                    writer.submit(row)
+                writer.close()
+            yield f"persistence.write_behind[{scale}]", measure(write_behind, items=1000, max_calls=5)
+
+            yield f"persistence.query[{scale}]", measure(
+                lambda i: query_submissions(country="India", min_age=30, max_age=39, limit=100, db_path=db_path))
+            yield f"persistence.aggregate[{scale}]", measure(
+                lambda i: aggregate_submissions(("country", "age_band"), db_path=db_path))
+            yield f"persistence.load_cohorts[{scale}]", measure(lambda i: load_cohorts(db_path))
+            if scale <= EXCEL_LIMIT:
+                xlsx_path = os.path.join(directory, f"history-{scale}.xlsx")
+                yield f"persistence.export_excel[{scale}]", measure(
+                    lambda i: export_submissions_to_excel(xlsx_path, db_path), items=scale, max_calls=3, memory=False, warmup=False)
+            os.remove(db_path)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+BENCHMARKS = {
+    "calculator": (bench_calculator, "profiles"),
+    "currency": (bench_currency, "profiles"),
+    "pdf": (bench_pdf, "profiles"),
+    "chart": (bench_chart, "profiles"),
+    "persistence": (bench_persistence, "history"),
+}
+
+
+# --- Reporting ---
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(run, path):
+    with open(path, "w") as f:
+        json.dump(run, f, indent=2)
+        f.write("\n")
+
+
+def report(results, baseline, tolerance):
+    """
+    Prints one line per benchmark, compared with the baseline where it has one.
+
+    Returns:
+        list: Names of the benchmarks whose median latency regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<38} {'items/s':>14} {'p50 ms':>10} {'p99 ms':>10} {'peak MB':>9}")
+    for name, result in results.items():
+        latency = result['latency_ms']
+        peak = "-" if result['peak_memory_mb'] is None else f"{result['peak_memory_mb']:.1f}"
+        line = f"{name:<38} {result['throughput']:>14,.1f} {latency['p50']:>10.3f} {latency['p99']:>10.3f} {peak:>9}"
+        if name in baseline:
+            previous = baseline[name]['latency_ms']['p50']
+            line += f"   baseline p50 {previous:.3f} ms ({latency['p50'] / previous - 1:+.0%})"
+            if latency['p50'] > previous * (1 + tolerance):
+                regressions.append(name)
+                line += "   REGRESSION"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calculator, currency, PDF, chart and persistence paths.")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=GROUPS, help="benchmark groups to run")
+    parser.add_argument("--quick", action="store_true", help=f"skip scales above {QUICK_LIMIT:,}")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--compare", help="compare a saved results file with the baseline instead of measuring")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed median slowdown over the baseline, as a fraction (default: 0.5)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args()
+
+    if args.compare:
+        run = load_results(args.compare)
+    else:
+        scales = {"profiles": PROFILE_SCALES, "history": HISTORY_SCALES}
+        if args.quick:
+            scales = {kind: tuple(scale for scale in values if scale <= QUICK_LIMIT) for kind, values in scales.items()}
+        run = {
+            'meta': {
+                'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'scales': scales,
+            },
+            'results': {},
+        }
+        for group in args.only:
+            bench, kind = BENCHMARKS[group]
+            for name, result in bench(scales[kind]):
+                run['results'][name] = result
+                print(f"  measured {name}", file=sys.stderr)
+        if args.output:
+            save_results(run, args.output)
+
+    if args.update_baseline:
+        save_results(run, BASELINE_PATH)
+        print(f"Baseline written to {BASELINE_PATH}")
+
+    baseline = load_results(BASELINE_PATH)['results'] if os.path.exists(BASELINE_PATH) else {}
+    regressions = report(run['results'], baseline, args.tolerance)
+    if regressions:
+        print(f"Benchmarks regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
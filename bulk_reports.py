@@ -0,0 +1,192 @@
+import argparse
+import csv
+import json
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl import load_workbook
+
+from calculator import CURRENCY_DATA, calculate_retirement_needs
+from profile_input import PROFILE_FIELDS, ProfileInput
+from report import create_pdf_report
+from storage import SUBMISSION_FIELDS, SUBMISSION_HEADERS, SHEET_NAME, iter_submissions
+
+HEADER_TO_FIELD = dict(zip(SUBMISSION_HEADERS, SUBMISSION_FIELDS))
+
+# Profile fields that hold numbers; everything else is text or a Y/N flag.
+NUMERIC_FIELDS = {
+    "age", "income", "expenses", "assets_cars", "assets_land", "assets_others", "loans_debts_amount",
+    "family_members_count", "dependents_parents", "dependents_children", "health_insurance_amount",
+    "life_insurance_amount_total", "monthly_expenses", "pension_contributions_amount",
+    "expected_inflation_rate", "retirement_age_target",
+}
+TEXT_FIELDS = {"gender", "country", "dependent_health_problems_details", "upcoming_big_goals"}
+
+
+# --- Reading Submissions ---
+def _read_xlsx(path):
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb[SHEET_NAME].iter_rows(values_only=True)
+        headers = [HEADER_TO_FIELD.get(h, h) for h in next(rows, ())]
+        for row in rows:
+            if any(value is not None for value in row):
+                yield dict(zip(headers, row))
+    finally:
+        wb.close()
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {HEADER_TO_FIELD.get(k, k): v for k, v in row.items()}
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield {HEADER_TO_FIELD.get(k, k): v for k, v in json.loads(line).items()}
+
+
+def _read_db(path):
+    for row in iter_submissions(path):
+        yield dict(zip(SUBMISSION_FIELDS, row))
+
+
+def iter_profiles(path):
+    """
+    Streams submission records from an .xlsx, .csv, .jsonl or SQLite (.db) file.
+
+    Columns may use either the Excel headers ("Assets Cars") or the field names
+    ("assets_cars"). Records are read one at a time, never all at once.
+    """
+    readers = {".xlsx": _read_xlsx, ".csv": _read_csv, ".jsonl": _read_jsonl, ".db": _read_db}
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in readers:
+        raise ValueError(f"Unsupported input file type: {extension}")
+    return readers[extension](path)
+
+
+def _to_number(value):
+    if isinstance(value, (int, float)):
+        return value
+    if value is None or value == "":
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def normalize_profile(record):
+    """
+    Fills in missing fields and converts numbers so a record can be passed to
+    calculate_retirement_needs. Annual expenses default to twelve monthly expenses.
+    """
+    profile = {}
+    for field in PROFILE_FIELDS:
+        value = record.get(field)
+        if field in NUMERIC_FIELDS:
+            profile[field] = _to_number(value)
+        elif field in TEXT_FIELDS:
+            profile[field] = "" if value is None else str(value)
+        else:
+            profile[field] = "N" if value in (None, "") else str(value)
+    if record.get("expenses") in (None, ""):
+        profile["expenses"] = profile["monthly_expenses"] * 12
+    return profile
+
+
+# --- Rendering ---
+def render_report(record):
+    """
+    Scores one submission record and renders its PDF report.
+
+    Runs in worker processes; the uncached renderer is used so workers do not fill
+    their own PDF caches.
+
+    Returns:
+        bytes: The PDF report.
+    """
+    profile = ProfileInput.from_dict(normalize_profile(record))
+    results = calculate_retirement_needs(profile)
+    currency_symbol = CURRENCY_DATA.get(profile.country, {}).get("symbol", "")
+    return create_pdf_report.__wrapped__(results, profile, currency_symbol)
+
+
+def _report_name(number, record):
+    label = f"{record.get('country') or 'unknown'}_{record.get('age') or ''}"
+    return f"{number:06d}_{re.sub(r'[^A-Za-z0-9_-]+', '-', label)}.pdf"
+
+
+def generate_reports(input_path, output_path, max_workers=None, max_in_flight=None):
+    """
+    Renders a PDF report for every submission in input_path into a ZIP archive.
+
+    Records are streamed from the input and handed to a process pool through a window
+    of at most max_in_flight pending reports; each finished PDF is written straight
+    into the archive in input order. Memory therefore stays bounded by the window, not
+    by the number of clients.
+
+    Args:
+        input_path (str): Submission history (.xlsx, .csv, .jsonl or .db).
+        output_path (str): Destination ZIP file.
+        max_workers (int): Pool size; None uses every core.
+        max_in_flight (int): Pending reports allowed at once; defaults to 4 per worker.
+    Returns:
+        dict: reports, errors, seconds, reports_per_second and zip_bytes.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    start = time.perf_counter()
+    reports = 0
+    errors = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        pending = deque()
+
+        def write_oldest():
+            nonlocal reports, errors
+            name, future = pending.popleft()
+            try:
+                archive.writestr(name, future.result())
+                reports += 1
+            except Exception as e:
+                errors += 1
+                print(f"Error rendering {name}: {e}")
+
+        for number, record in enumerate(iter_profiles(input_path), start=1):
+            pending.append((_report_name(number, record), executor.submit(render_report, record)))
+            if len(pending) >= max_in_flight:
+                write_oldest()
+        while pending:
+            write_oldest()
+
+    seconds = time.perf_counter() - start
+    return {
+        'reports': reports,
+        'errors': errors,
+        'seconds': seconds,
+        'reports_per_second': reports / seconds if seconds else 0.0,
+        'zip_bytes': os.path.getsize(output_path),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate PDF reports for every submission into a ZIP file.")
+    parser.add_argument("input", help="submission history (.xlsx, .csv, .jsonl or .db)")
+    parser.add_argument("output", help="destination ZIP file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="pending reports allowed at once")
+    args = parser.parse_args()
+
+    summary = generate_reports(args.input, args.output, args.workers, args.max_in_flight)
+    print(f"Wrote {summary['reports']} reports ({summary['errors']} errors) to {args.output} "
+          f"in {summary['seconds']:.1f}s ({summary['reports_per_second']:.1f} reports/s, "
+          f"{summary['zip_bytes'] / 1024 / 1024:.1f} MB)")
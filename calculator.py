@@ -0,0 +1,112 @@
+from suggestions import derived_values, match_suggestions, render_suggestions
+from telemetry import span
+from validation import error_result, validate_profile
+
+# --- Constants and Assumptions ---
+REPLACEMENT_RATIO = 0.7
+POST_RETIREMENT_RETURN_RATE = 0.04
+YEARS_OF_RETIREMENT = 30
+
+# Map countries to their respective currencies and symbols
+CURRENCY_DATA = {
+    "USA": {"symbol": "$", "code": "USD"},
+    "India": {"symbol": "₹", "code": "INR"},
+    "UK": {"symbol": "£", "code": "GBP"},
+    "Canada": {"symbol": "$", "code": "CAD"},
+    "Australia": {"symbol": "$", "code": "AUD"},
+    "Germany": {"symbol": "€", "code": "EUR"},
+    "Japan": {"symbol": "¥", "code": "JPY"},
+    "Brazil": {"symbol": "R$", "code": "BRL"},
+    "South Africa": {"symbol": "R", "code": "ZAR"},
+    "France": {"symbol": "€", "code": "EUR"},
+}
+
+# 1. Core Python Logic (Backend Brain)
+def calculate_retirement_needs(*args, **kwargs):
+    """
+    Calculates retirement needs, corpus, and provides a verdict with suggestions.
+
+    Accepts a single ProfileInput, or the individual fields (positionally in
+    PROFILE_FIELDS order, or by name) as listed in _retirement_needs.
+    """
+    # Duck-typed rather than an isinstance check, so importing the calculator does not
+    # pull in profile_input (and dataclasses) at startup.
+    if len(args) == 1 and not kwargs and hasattr(args[0], "as_tuple"):
+        args = args[0].as_tuple()
+    return _retirement_needs(*args, **kwargs)
+
+
+def _retirement_needs(age,
+                           gender,
+                           country,
+                           income,
+                           expenses,
+                           assets_cars,
+                           assets_land,
+                           assets_others,
+                           owns_house,
+                           on_rent,
+                           loans_debts_amount,
+                           family_members_count,
+                           dependents_parents,
+                           dependents_spouse,
+                           dependents_children,
+                           dependent_health_problems_yn,
+                           dependent_health_problems_details,
+                           upcoming_big_goals,
+                           health_issues_yn,
+                           health_insurance_yn,
+                           health_insurance_amount,
+                           life_insurance_yn,
+                           life_insurance_amount_total,
+                           monthly_expenses,
+                           pension_contributions_yn,
+                           pension_contributions_amount,
+                           expected_inflation_rate,
+                           retirement_age_target,
+                           only_source_of_income="N"):
+    """
+    Calculates retirement needs, corpus, and provides a verdict with suggestions.
+    """
+
+    # --- Input Validation and Handling ---
+    # Every rule in validation.RULES is checked; the first failure becomes the verdict.
+    profile_values = locals()
+    with span("validation"):
+        errors = validate_profile(profile_values)
+    if errors:
+        return error_result(errors)
+
+    # --- Assumptions ---
+    INFLATION_ADJUSTMENT_RATE = 1 + expected_inflation_rate
+
+    # --- Calculations ---
+    years_to_retirement = retirement_age_target - age
+    inflation_factor = (INFLATION_ADJUSTMENT_RATE) ** years_to_retirement
+    annual_expenses_at_retirement = (monthly_expenses * 12) * inflation_factor
+    required_income_at_retirement = income * REPLACEMENT_RATIO * inflation_factor
+
+    corpus_needed = required_income_at_retirement / POST_RETIREMENT_RETURN_RATE
+    corpus_available = assets_cars + assets_land + assets_others - loans_debts_amount
+
+    ready = corpus_available >= corpus_needed
+    verdict = "Ready to Retire ✅" if ready else "Not Ready to Retire ❌"
+
+    # --- Suggestions ---
+    # Rules live in suggestions.SUGGESTION_RULES; the matches are kept as a rule-ID bitset
+    # and rendered in the profile's currency.
+    with span("suggestions"):
+        suggestion_ids = match_suggestions(profile_values, derived_values(
+            profile_values, corpus_needed, corpus_available, ready, years_to_retirement))
+    currency_symbol = CURRENCY_DATA.get(country, {}).get("symbol", "")
+
+    return {
+        'corpus_needed': corpus_needed,
+        'corpus_available': corpus_available,
+        'ready': ready,
+        'verdict': verdict,
+        'suggestions': render_suggestions(suggestion_ids, {'corpus_needed': corpus_needed,
+                                                           'corpus_available': corpus_available},
+                                          currency_symbol),
+        'suggestion_ids': suggestion_ids,
+    }
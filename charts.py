@@ -0,0 +1,132 @@
+import os
+from io import BytesIO
+
+from result_cache import cached_result
+from telemetry import timed
+
+# --- Chart Settings ---
+# "png" renders the corpus chart on the server; "plotly" sends only the chart spec and
+# lets the browser draw it. Can be overridden through the environment.
+CORPUS_CHART_MODE = os.environ.get("CORPUS_CHART_MODE", "png")
+AVAILABLE_COLORS = {True: 'green', False: 'red'}
+NEEDED_COLOR = 'blue'
+
+# matplotlib and plotly are imported inside the functions below, so neither is loaded
+# until the first chart is drawn.
+
+
+def _corpus_labels(currency_symbol):
+    return [f'Corpus Available ({currency_symbol})', f'Corpus Needed ({currency_symbol})']
+
+
+@cached_result
+@timed("chart_render")
+def render_corpus_chart(corpus_available, corpus_needed, ready, currency_symbol):
+    """
+    Renders the corpus comparison bar chart to PNG bytes.
+
+    The chart is drawn on a standalone matplotlib Figure with its own Agg canvas. It is
+    never registered with pyplot's global figure manager, so nothing outlives the call.
+    PNG bytes are cached by (available, needed, ready, currency) in result_cache.
+
+    Args:
+        corpus_available (float): Corpus available.
+        corpus_needed (float): Corpus needed.
+        ready (bool): Whether the user is ready for retirement (colors the first bar).
+        currency_symbol (str): The currency symbol for the labels.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.bar(_corpus_labels(currency_symbol),
+           [corpus_available, corpus_needed],
+           color=[AVAILABLE_COLORS[bool(ready)], NEEDED_COLOR])
+    ax.set_ylabel(f"Amount ({currency_symbol})")
+    ax.set_title("Retirement Corpus Comparison")
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def corpus_chart_figure(corpus_available, corpus_needed, ready, currency_symbol):
+    """
+    Builds the corpus comparison bar chart as a Plotly figure, rendered client-side.
+
+    Args:
+        corpus_available (float): Corpus available.
+        corpus_needed (float): Corpus needed.
+        ready (bool): Whether the user is ready for retirement (colors the first bar).
+        currency_symbol (str): The currency symbol for the labels.
+
+    Returns:
+        plotly.graph_objects.Figure: The chart.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(x=_corpus_labels(currency_symbol),
+                           y=[corpus_available, corpus_needed],
+                           marker_color=[AVAILABLE_COLORS[bool(ready)], NEEDED_COLOR]))
+    fig.update_layout(title="Retirement Corpus Comparison", yaxis_title=f"Amount ({currency_symbol})")
+    return fig
+
+
+# --- Scenario Comparison ---
+def _scenario_series(scenarios):
+    names = [scenario['scenario'] for scenario in scenarios]
+    available = [scenario['corpus_available'] for scenario in scenarios]
+    needed = [scenario['corpus_needed'] for scenario in scenarios]
+    colors = [AVAILABLE_COLORS[bool(scenario['ready'])] for scenario in scenarios]
+    return names, available, needed, colors
+
+
+@cached_result
+@timed("scenario_chart_render")
+def render_scenario_chart(scenarios, currency_symbol):
+    """
+    Renders corpus available vs needed for every scenario as grouped bars, to PNG bytes.
+
+    Args:
+        scenarios (list): Rows from scenarios.compare_scenarios.
+        currency_symbol (str): The currency symbol for the labels.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    names, available, needed, colors = _scenario_series(scenarios)
+    positions = range(len(names))
+    fig = Figure(figsize=(max(6.4, 1.2 * len(names)), 4.8), layout="constrained")
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    labels = _corpus_labels(currency_symbol)
+    ax.bar([x - 0.2 for x in positions], available, width=0.4, color=colors, label=labels[0])
+    ax.bar([x + 0.2 for x in positions], needed, width=0.4, color=NEEDED_COLOR, label=labels[1])
+    ax.set_xticks(list(positions), names, rotation=30, ha="right")
+    ax.set_ylabel(f"Amount ({currency_symbol})")
+    ax.set_title("Scenario Comparison")
+    ax.legend()
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def scenario_chart_figure(scenarios, currency_symbol):
+    """
+    Builds the scenario comparison chart as a Plotly figure, rendered client-side.
+    """
+    import plotly.graph_objects as go
+
+    names, available, needed, colors = _scenario_series(scenarios)
+    labels = _corpus_labels(currency_symbol)
+    fig = go.Figure([go.Bar(name=labels[0], x=names, y=available, marker_color=colors),
+                     go.Bar(name=labels[1], x=names, y=needed, marker_color=NEEDED_COLOR)])
+    fig.update_layout(barmode="group", title="Scenario Comparison", yaxis_title=f"Amount ({currency_symbol})")
+    return fig
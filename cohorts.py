@@ -0,0 +1,190 @@
+import json
+import math
+
+# --- Sketch Settings ---
+# Quantiles are estimated within this relative error. Sketches of different cohorts merge
+# exactly (bucket counts just add up), so any combination of cohorts can be summarized
+# without going back to the raw submissions.
+RELATIVE_ACCURACY = 0.01
+SUMMARY_QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (log-spaced buckets).
+
+    Each value lands in the bucket ceil(log_gamma(|value|)), kept separately for positive
+    and negative values; the memory used depends on the range of magnitudes seen, not on
+    how many values were added.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        """
+        Adds value (count times) to the sketch. NaN values are ignored.
+        """
+        if value != value:
+            return
+        if value == 0:
+            self.zero_count += count
+        else:
+            buckets = self.positive if value > 0 else self.negative
+            key = math.ceil(math.log(abs(value)) / self._log_gamma)
+            buckets[key] = buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        """
+        Adds the contents of another sketch (with the same accuracy) to this one.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies.")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """
+        Returns the estimated q-quantile (0 <= q <= 1), or None for an empty sketch.
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        # Negative values from most to least negative, then zeros, then positives
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.positive)) if self.positive else 0.0
+
+    def _bucket_value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': self.positive,
+            'negative': self.negative,
+            'zero_count': self.zero_count,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'])
+        sketch.positive = {int(key): count for key, count in data['positive'].items()}
+        sketch.negative = {int(key): count for key, count in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+
+class Cohort:
+    """
+    Running aggregates for one group of submissions (e.g. a country and age band).
+
+    Counts and sums are exact; the shortfall (corpus_needed - corpus_available)
+    distribution is kept as a QuantileSketch. Cohorts merge, so totals over any set of
+    cohorts cost as much as the number of cohorts, not the number of submissions.
+    """
+
+    def __init__(self):
+        self.submissions = 0
+        self.invalid = 0
+        self.ready_count = 0
+        self.corpus_needed_sum = 0.0
+        self.corpus_available_sum = 0.0
+        self.shortfall_sum = 0.0
+        self.shortfall = QuantileSketch()
+
+    def add(self, corpus_needed, corpus_available, ready, valid=True):
+        """
+        Adds one submission. Invalid submissions are only counted.
+        """
+        self.submissions += 1
+        if not valid:
+            self.invalid += 1
+            return
+        self.ready_count += bool(ready)
+        self.corpus_needed_sum += corpus_needed
+        self.corpus_available_sum += corpus_available
+        self.shortfall_sum += corpus_needed - corpus_available
+        self.shortfall.add(corpus_needed - corpus_available)
+
+    def merge(self, other):
+        """
+        Adds another cohort's aggregates to this one.
+        """
+        self.submissions += other.submissions
+        self.invalid += other.invalid
+        self.ready_count += other.ready_count
+        self.corpus_needed_sum += other.corpus_needed_sum
+        self.corpus_available_sum += other.corpus_available_sum
+        self.shortfall_sum += other.shortfall_sum
+        self.shortfall.merge(other.shortfall)
+        return self
+
+    def summary(self):
+        """
+        Returns the cohort's headline figures.
+
+        Returns:
+            dict: submissions, valid, ready_count, readiness_rate, mean_corpus_needed,
+                mean_corpus_available, mean_shortfall and shortfall_p25/p50/p75/p90.
+        """
+        valid = self.submissions - self.invalid
+        summary = {
+            'submissions': self.submissions,
+            'valid': valid,
+            'ready_count': self.ready_count,
+            'readiness_rate': self.ready_count / valid if valid else None,
+            'mean_corpus_needed': self.corpus_needed_sum / valid if valid else None,
+            'mean_corpus_available': self.corpus_available_sum / valid if valid else None,
+            'mean_shortfall': self.shortfall_sum / valid if valid else None,
+        }
+        for q in SUMMARY_QUANTILES:
+            summary[f'shortfall_p{int(q * 100)}'] = self.shortfall.quantile(q)
+        return summary
+
+    def to_json(self):
+        state = {key: value for key, value in vars(self).items() if key != 'shortfall'}
+        state['shortfall'] = self.shortfall.to_dict()
+        return json.dumps(state)
+
+    @classmethod
+    def from_json(cls, text):
+        state = json.loads(text)
+        cohort = cls()
+        cohort.shortfall = QuantileSketch.from_dict(state.pop('shortfall'))
+        for key, value in state.items():
+            setattr(cohort, key, value)
+        return cohort
+
+
+def merge_cohorts(cohorts):
+    """
+    Merges an iterable of Cohorts into a new one.
+    """
+    total = Cohort()
+    for cohort in cohorts:
+        total.merge(cohort)
+    return total
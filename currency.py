@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+DEFAULT_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "currency_rates.json")
+
+
+# One immutable version of the rates. RateTable swaps whole snapshots, so a reader that
+# takes a snapshot once sees codes, index and matrix from the same file.
+RateSnapshot = namedtuple("RateSnapshot", "base codes index matrix")
+EMPTY_SNAPSHOT = RateSnapshot(None, (), {}, np.empty((0, 0)))
+
+
+class RateTable:
+    """
+    Exchange rates loaded from a rates file, kept as a dense conversion matrix.
+
+    The file lists how many units of each currency one unit of the base currency buys.
+    Every cross rate is derived through the base (matrix[i, j] = rate[j] / rate[i]), so
+    converting A -> B -> A always returns the original amount.
+    """
+
+    def __init__(self, path=DEFAULT_RATES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._snapshot = EMPTY_SNAPSHOT
+
+    @property
+    def base(self):
+        return self._snapshot.base
+
+    @property
+    def codes(self):
+        return self._snapshot.codes
+
+    @property
+    def index(self):
+        return self._snapshot.index
+
+    @property
+    def matrix(self):
+        return self._snapshot.matrix
+
+    def refresh(self):
+        """
+        Reloads the rates file if its modification time has changed since the last load.
+
+        A file that cannot be read or parsed (e.g. one caught mid-write) is reported and the
+        last good rates stay in use; it is only an error before any rates were loaded.
+
+        Returns:
+            RateSnapshot: The rates to use.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            return self._keep_last_good(e)
+        if mtime == self._mtime:
+            return self._snapshot
+        with self._lock:
+            if mtime == self._mtime:
+                return self._snapshot
+            try:
+                snapshot = self._load()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                snapshot = self._keep_last_good(e)
+            else:
+                self._snapshot = snapshot  # A single assignment publishes the new rates
+            # A bad file is not parsed again until it changes
+            self._mtime = mtime
+            return snapshot
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        codes = tuple(data["rates"])
+        per_base = np.array([data["rates"][code] for code in codes], dtype=float)
+        if not np.all(per_base > 0):
+            raise ValueError(f"Exchange rates in {self.path} must be positive.")
+        matrix = per_base[np.newaxis, :] / per_base[:, np.newaxis]
+        matrix.flags.writeable = False
+        return RateSnapshot(data["base"], codes, {code: i for i, code in enumerate(codes)}, matrix)
+
+    def _keep_last_good(self, error):
+        if self._snapshot is EMPTY_SNAPSHOT:
+            raise error
+        print(f"Error loading exchange rates from {self.path}, keeping the previous rates: {error}")
+        return self._snapshot
+
+    def lookup(self, codes, snapshot=None):
+        """
+        Maps currency codes to matrix indices; unknown codes map to -1.
+        """
+        index = (self._snapshot if snapshot is None else snapshot).index
+        codes = np.asarray(codes)
+        unique, inverse = np.unique(codes, return_inverse=True)
+        positions = np.array([index.get(code, -1) for code in unique.tolist()], dtype=np.intp)
+        return positions[inverse].reshape(codes.shape)
+
+    def convert(self, amounts, from_currencies, to_currencies):
+        """
+        Converts whole arrays of amounts in one pass.
+
+        Args:
+            amounts (array-like): Amounts to convert.
+            from_currencies (array-like or str): Source currency code(s), broadcast against amounts.
+            to_currencies (array-like or str): Target currency code(s), broadcast against amounts.
+        Returns:
+            np.ndarray: Converted amounts; NaN where a currency code is unknown.
+        """
+        snapshot = self.refresh()
+        amounts = np.asarray(amounts, dtype=float)
+        source = self.lookup(from_currencies, snapshot)
+        target = self.lookup(to_currencies, snapshot)
+        amounts, source, target = np.broadcast_arrays(amounts, source, target)
+
+        known = (source >= 0) & (target >= 0)
+        converted = np.full(amounts.shape, np.nan)
+        converted[known] = amounts[known] * snapshot.matrix[source[known], target[known]]
+        return converted
+
+    def rate(self, from_currency, to_currency):
+        """
+        Returns the conversion rate between two codes, or None if either is unknown.
+        """
+        snapshot = self.refresh()
+        i = snapshot.index.get(from_currency)
+        j = snapshot.index.get(to_currency)
+        if i is None or j is None:
+            return None
+        return float(snapshot.matrix[i, j])
+
+
+rate_table = RateTable()
+
+
+def convert_amounts(amounts, from_currencies, to_currencies):
+    """
+    Converts arrays of amounts and currency pairs using the shared rate table.
+    """
+    return rate_table.convert(amounts, from_currencies, to_currencies)
@@ -0,0 +1,125 @@
+import numpy as np
+
+from calculator import REPLACEMENT_RATIO, POST_RETIREMENT_RETURN_RATE
+from projection import PRE_RETIREMENT_RETURN_RATE
+
+MAX_RETIREMENT_AGE = 75  # Highest target the input form accepts
+
+
+# --- Corpus Math ---
+# Same formulas as calculate_retirement_needs, plus one lever: a monthly saving invested
+# until retirement at PRE_RETIREMENT_RETURN_RATE. With no saving the margin is exactly
+# corpus_available - corpus_needed from the scalar function; the solvers start from
+# what the profile already saves (current_monthly_saving).
+def current_monthly_saving(profile):
+    """
+    Monthly income left after monthly expenses (never negative), taken as being saved.
+    """
+    return max(0.0, profile['income'] / 12 - profile['monthly_expenses'])
+
+
+def _corpus_available(profile):
+    return (profile['assets_cars'] + profile['assets_land'] + profile['assets_others']
+            - profile['loans_debts_amount'])
+
+
+def corpus_needed(income, expected_inflation_rate, years_to_retirement):
+    """
+    Corpus needed at retirement, as in calculate_retirement_needs. Works element-wise on arrays.
+    """
+    inflation_factor = (1 + np.asarray(expected_inflation_rate)) ** years_to_retirement
+    return income * REPLACEMENT_RATIO * inflation_factor / POST_RETIREMENT_RETURN_RATE
+
+
+def savings_growth_factor(years_to_retirement):
+    """
+    Value at retirement of saving 1 per month (12 per year, invested at year end) until then.
+    """
+    years = np.asarray(years_to_retirement, dtype=float)
+    return 12 * ((1 + PRE_RETIREMENT_RETURN_RATE) ** years - 1) / PRE_RETIREMENT_RETURN_RATE
+
+
+def readiness_margin(profile, retirement_age_target=None, expected_inflation_rate=None, monthly_saving=0.0):
+    """
+    Corpus available (plus grown extra savings) minus corpus needed.
+
+    retirement_age_target and expected_inflation_rate default to the profile's values and
+    may be arrays; they broadcast against each other, so a whole grid is one call.
+    """
+    if retirement_age_target is None:
+        retirement_age_target = profile['retirement_age_target']
+    if expected_inflation_rate is None:
+        expected_inflation_rate = profile['expected_inflation_rate']
+    years = np.asarray(retirement_age_target) - profile['age']
+    return (_corpus_available(profile) + monthly_saving * savings_growth_factor(years)
+            - corpus_needed(profile['income'], expected_inflation_rate, years))
+
+
+# --- Solvers ---
+def required_extra_savings(profile, monthly_saving=0.0):
+    """
+    Closed-form savings needed, on top of monthly_saving, to become ready at the target
+    retirement age.
+
+    Returns:
+        dict: lump_sum (extra corpus needed today) and monthly (extra monthly saving
+            until retirement); both are 0 when already ready.
+    """
+    years = profile['retirement_age_target'] - profile['age']
+    if years <= 0:
+        raise ValueError("Target retirement age should be greater than current age.")
+    shortfall = max(0.0, -float(readiness_margin(profile, monthly_saving=monthly_saving)))
+    return {
+        'lump_sum': shortfall,
+        'monthly': shortfall / float(savings_growth_factor(years)),
+    }
+
+
+def max_monthly_expense(profile):
+    """
+    Highest monthly expense that still leaves enough monthly saving to be ready, assuming
+    whatever is not spent out of monthly income is saved (see current_monthly_saving).
+    Returns 0 when even spending nothing is not enough, and income / 12 when assets alone
+    already cover the corpus needed.
+    """
+    return max(0.0, profile['income'] / 12 - required_extra_savings(profile)['monthly'])
+
+
+def min_retirement_age(profile, monthly_saving=0.0, max_age=MAX_RETIREMENT_AGE):
+    """
+    Earliest whole retirement age (after the current age, up to max_age) at which the
+    profile is ready.
+
+    Every candidate age is evaluated in one array pass, so the answer is exact even where
+    readiness is not monotonic in the retirement age.
+
+    Returns:
+        int or None: The age, or None if no age up to max_age works.
+    """
+    ages = np.arange(profile['age'] + 1, max_age + 1)
+    ready = readiness_margin(profile, retirement_age_target=ages, monthly_saving=monthly_saving) >= 0
+    hits = np.flatnonzero(ready)
+    return int(ages[hits[0]]) if hits.size else None
+
+
+# --- Sensitivity ---
+def sensitivity_grid(profile, inflation_rates, retirement_ages, monthly_saving=0.0):
+    """
+    Readiness margin over a grid of inflation rates x retirement ages, in one array pass.
+
+    Returns:
+        dict: inflation_rates, retirement_ages, margin (rates along rows, ages along
+            columns) and the matching ready mask.
+    """
+    inflation_rates = np.asarray(inflation_rates, dtype=float)
+    retirement_ages = np.asarray(retirement_ages)
+    margin = readiness_margin(profile,
+                              retirement_age_target=retirement_ages[np.newaxis, :],
+                              expected_inflation_rate=inflation_rates[:, np.newaxis],
+                              monthly_saving=monthly_saving)
+    return {
+        'inflation_rates': inflation_rates,
+        'retirement_ages': retirement_ages,
+        'margin': margin,
+        'ready': margin >= 0,
+    }
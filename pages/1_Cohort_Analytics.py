@@ -0,0 +1,87 @@
+import pandas as pd
+import streamlit as st
+from calculator import CURRENCY_DATA
+from cohorts import RELATIVE_ACCURACY, merge_cohorts
+from storage import AGE_BAND_WIDTH, load_cohorts
+
+# Cohort analytics over every saved submission. The page reads the per-cohort aggregates
+# that storage.append_submissions keeps up to date (counts, sums and a shortfall quantile
+# sketch per country and age band), so it loads in the same time whatever the size of
+# the history. Amounts are only combined within a country, since currencies differ.
+
+
+def band_label(band):
+    """
+    Returns the display label of an age band start (e.g. 30 -> "30-39").
+    """
+    return "Unknown" if band is None else f"{band}-{band + AGE_BAND_WIDTH - 1}"
+
+
+def cohort_frame(cohorts, key_name, key_label):
+    """
+    Builds a display table with one row per cohort.
+
+    Args:
+        cohorts (dict): Merged cohorts.Cohort by key.
+        key_name (str): Column name of the key.
+        key_label (callable): Formats a key for display.
+    """
+    rows = []
+    for key in sorted(cohorts, key=lambda key: (key is None, key)):
+        summary = cohorts[key].summary()
+        rows.append({key_name: key_label(key), **summary})
+    return pd.DataFrame(rows)
+
+
+def main():
+    st.title("Cohort Analytics")
+    cohorts = load_cohorts()
+    if not cohorts:
+        st.info("No submissions have been saved yet.")
+        return
+
+    # --- All Countries ---
+    by_country = {}
+    for (country, _), cohort in cohorts.items():
+        by_country.setdefault(country, []).append(cohort)
+    by_country = {country: merge_cohorts(group) for country, group in by_country.items()}
+    overall = merge_cohorts(by_country.values()).summary()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Submissions", f"{overall['submissions']:,}")
+    col2.metric("Valid Submissions", f"{overall['valid']:,}")
+    col3.metric("Ready", "-" if overall['readiness_rate'] is None else f"{overall['readiness_rate']:.1%}")
+
+    st.subheader("Readiness by Country")
+    countries = cohort_frame(by_country, "Country", lambda country: country or "Unknown")
+    st.bar_chart(countries.set_index("Country")["readiness_rate"])
+    st.dataframe(countries[["Country", "submissions", "valid", "ready_count", "readiness_rate"]],
+                 hide_index=True)
+
+    # --- One Country by Age Band ---
+    st.subheader("Age Bands")
+    names = sorted(country for country in by_country if country)
+    if not names:
+        return
+    country = st.selectbox("Country", names)
+    symbol = CURRENCY_DATA.get(country, {}).get("symbol", "")
+    summary = by_country[country].summary()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Submissions", f"{summary['submissions']:,}")
+    col2.metric("Ready", "-" if summary['readiness_rate'] is None else f"{summary['readiness_rate']:.1%}")
+    col3.metric("Median Shortfall",
+                "-" if summary['shortfall_p50'] is None else f"{symbol}{summary['shortfall_p50']:,.0f}")
+
+    bands = cohort_frame({band: cohort for (name, band), cohort in cohorts.items() if name == country},
+                         "Age Band", band_label)
+    st.bar_chart(bands.set_index("Age Band")[["readiness_rate"]])
+    amounts = ["mean_corpus_needed", "mean_corpus_available", "mean_shortfall",
+               "shortfall_p25", "shortfall_p50", "shortfall_p75", "shortfall_p90"]
+    st.dataframe(bands[["Age Band", "submissions", "valid", "readiness_rate"] + amounts], hide_index=True,
+                 column_config={column: st.column_config.NumberColumn(format=f"{symbol}%.0f") for column in amounts})
+    st.caption("Shortfall is corpus needed minus corpus available; negative values are surpluses. "
+               f"Quantiles are estimated to within {RELATIVE_ACCURACY:.0%}.")
+
+
+main()
@@ -0,0 +1,171 @@
+import functools
+import os
+import tempfile
+
+from result_cache import ResultCache, content_key
+
+# --- Cache Settings ---
+# All can be overridden through the environment; an empty PDF_CACHE_DIR disables the disk
+# tier, PDF_CACHE_DISK_BYTES=0 lets it grow without limit and PDF_CACHE_TTL=0 (the
+# default) keeps reports until they are evicted.
+DEFAULT_MAX_BYTES = int(os.environ.get("PDF_CACHE_BYTES", 64 * 1024 * 1024))
+DEFAULT_CACHE_DIR = os.environ.get("PDF_CACHE_DIR") or None
+DEFAULT_DISK_BYTES = int(os.environ.get("PDF_CACHE_DISK_BYTES", 512 * 1024 * 1024)) or None
+DEFAULT_TTL = float(os.environ.get("PDF_CACHE_TTL", 0)) or None
+
+
+class PDFCache(ResultCache):
+    """
+    Content-addressed LRU cache of rendered PDF bytes.
+
+    The in-memory tier is a ResultCache bounded by max_bytes (entries optionally expire
+    after ttl seconds). When cache_dir is set, reports are also written there and reloaded
+    on a memory miss, so they survive restarts and are shared by processes using the same
+    directory. The directory is kept under max_disk_bytes: a write that takes it over the
+    limit removes the least recently used files (a disk hit refreshes a file's mtime).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL,
+                 max_disk_bytes=DEFAULT_DISK_BYTES):
+        super().__init__(max_bytes=max_bytes, ttl=ttl)
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._stats['disk_hits'] = 0
+        self._stats['disk_evictions'] = 0
+        self._disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def get(self, key):
+        """
+        Returns the cached PDF bytes for key, or None.
+        """
+        pdf_bytes = super().get(key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+
+        pdf_bytes = self._read_disk(key)
+        if pdf_bytes is None:
+            return None
+        super().put(key, pdf_bytes, len(pdf_bytes))
+        with self._lock:
+            # The memory tier counted this lookup as a miss
+            self._stats['misses'] -= 1
+            self._stats['disk_hits'] += 1
+        return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        """
+        Stores PDF bytes under key in memory and, if enabled, on disk.
+        """
+        super().put(key, pdf_bytes, len(pdf_bytes))
+        self._write_disk(key, pdf_bytes)
+
+    def stats(self):
+        """
+        Returns hit/miss/eviction counters and the current memory footprint.
+        """
+        stats = super().stats()
+        stats['disk_bytes'] = self._disk_bytes
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                pdf_bytes = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(self._path(key))  # Mark as recently used for _trim_disk
+        except OSError:
+            pass
+        return pdf_bytes
+
+    def _write_disk(self, key, pdf_bytes):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)  # Atomic, so readers never see partial files
+        except OSError as e:
+            print(f"Error writing PDF cache entry: {e}")
+            return
+        with self._lock:
+            self._disk_bytes += len(pdf_bytes) - replaced
+            over = self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes
+        if over:
+            try:
+                self._trim_disk()
+            except OSError as e:
+                print(f"Error trimming PDF cache directory: {e}")
+
+    def _disk_entries(self):
+        """
+        Returns (mtime, path, size) for every cached report on disk.
+        """
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:  # Removed by another process meanwhile
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _trim_disk(self):
+        """
+        Removes the least recently used reports until the directory fits max_disk_bytes.
+
+        The directory is rescanned, so files written by other processes sharing it count too.
+        """
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._disk_bytes = total
+            self._stats['disk_evictions'] += removed
+
+
+pdf_cache = PDFCache()
+
+
+def cached_pdf(func):
+    """
+    Decorator that serves a PDF-building function from pdf_cache.
+
+    The cache key covers every argument, including the results dictionary, so any change
+    to the inputs or the verdict produces a fresh report.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = content_key(func.__name__, *args, **kwargs)
+        pdf_bytes = pdf_cache.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = func(*args, **kwargs)
+            pdf_cache.put(key, pdf_bytes)
+        return pdf_bytes
+    return wrapper
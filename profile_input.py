@@ -0,0 +1,126 @@
+import dataclasses
+import functools
+
+# --- Profile Fields ---
+# Same names and order as the calculate_retirement_needs parameters.
+PROFILE_FIELDS = (
+    "age", "gender", "country", "income", "expenses",
+    "assets_cars", "assets_land", "assets_others", "owns_house", "on_rent",
+    "loans_debts_amount", "family_members_count", "dependents_parents", "dependents_spouse",
+    "dependents_children", "dependent_health_problems_yn", "dependent_health_problems_details",
+    "upcoming_big_goals", "health_issues_yn", "health_insurance_yn", "health_insurance_amount",
+    "life_insurance_yn", "life_insurance_amount_total", "monthly_expenses",
+    "pension_contributions_yn", "pension_contributions_amount", "expected_inflation_rate",
+    "retirement_age_target", "only_source_of_income",
+)
+
+# Columnar layout of a profile, one NumPy structured-dtype field per PROFILE_FIELDS entry.
+# Y/N fields get room for a few characters so invalid values like "Yes" stay invalid
+# instead of being truncated to "Y"; free text is kept as Python strings, uncapped.
+PROFILE_DTYPE_SPEC = (
+    ("age", "i8"), ("gender", "U16"), ("country", "U32"), ("income", "f8"), ("expenses", "f8"),
+    ("assets_cars", "f8"), ("assets_land", "f8"), ("assets_others", "f8"),
+    ("owns_house", "U8"), ("on_rent", "U8"), ("loans_debts_amount", "f8"),
+    ("family_members_count", "i8"), ("dependents_parents", "i8"), ("dependents_spouse", "U8"),
+    ("dependents_children", "i8"), ("dependent_health_problems_yn", "U8"),
+    ("dependent_health_problems_details", "O"), ("upcoming_big_goals", "O"),
+    ("health_issues_yn", "U8"), ("health_insurance_yn", "U8"), ("health_insurance_amount", "f8"),
+    ("life_insurance_yn", "U8"), ("life_insurance_amount_total", "f8"), ("monthly_expenses", "f8"),
+    ("pension_contributions_yn", "U8"), ("pension_contributions_amount", "f8"),
+    ("expected_inflation_rate", "f8"), ("retirement_age_target", "i8"), ("only_source_of_income", "U8"),
+)
+
+# NumPy is imported inside the functions below, so the calculator can use ProfileInput
+# without paying for NumPy at startup.
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ProfileInput:
+    """
+    One user's inputs to the retirement calculator.
+
+    Immutable and hashable, so it can be used directly as a cache key. Fields are in
+    calculate_retirement_needs parameter order, so calculate_retirement_needs(*profile.as_tuple())
+    is a valid call; profiles_to_array packs many of them into the columnar form.
+    """
+    age: int
+    gender: str
+    country: str
+    income: float
+    expenses: float
+    assets_cars: float
+    assets_land: float
+    assets_others: float
+    owns_house: str
+    on_rent: str
+    loans_debts_amount: float
+    family_members_count: int
+    dependents_parents: int
+    dependents_spouse: str
+    dependents_children: int
+    dependent_health_problems_yn: str
+    dependent_health_problems_details: str
+    upcoming_big_goals: str
+    health_issues_yn: str
+    health_insurance_yn: str
+    health_insurance_amount: float
+    life_insurance_yn: str
+    life_insurance_amount_total: float
+    monthly_expenses: float
+    pension_contributions_yn: str
+    pension_contributions_amount: float
+    expected_inflation_rate: float
+    retirement_age_target: int
+    only_source_of_income: str = "N"
+
+    @classmethod
+    def from_dict(cls, mapping):
+        """
+        Builds a profile from a mapping keyed by field name; unknown keys are ignored.
+        """
+        return cls(**{field: mapping[field] for field in PROFILE_FIELDS if field in mapping})
+
+    def as_tuple(self):
+        """
+        Returns the field values in PROFILE_FIELDS order.
+        """
+        return tuple(getattr(self, field) for field in PROFILE_FIELDS)
+
+    def as_dict(self):
+        """
+        Returns the fields as a dictionary keyed by field name.
+        """
+        return {field: getattr(self, field) for field in PROFILE_FIELDS}
+
+    def replace(self, **changes):
+        """
+        Returns a copy of the profile with the given fields changed.
+        """
+        return dataclasses.replace(self, **changes)
+
+
+@functools.lru_cache(maxsize=None)
+def profile_dtype():
+    """
+    Returns the NumPy structured dtype matching ProfileInput.
+    """
+    import numpy as np
+    return np.dtype(list(PROFILE_DTYPE_SPEC))
+
+
+def profiles_to_array(profiles):
+    """
+    Packs ProfileInput records into a NumPy structured array (one element per profile).
+
+    The array can be passed straight to calculate_retirement_needs_batch and
+    storage.append_profiles, and serialized in one step with np.save.
+    """
+    import numpy as np
+    return np.array([profile.as_tuple() for profile in profiles], dtype=profile_dtype())
+
+
+def profiles_from_array(array):
+    """
+    Unpacks a structured array from profiles_to_array back into ProfileInput records.
+    """
+    return [ProfileInput(*row) for row in array.tolist()]
@@ -0,0 +1,212 @@
+import numpy as np
+
+from calculator import REPLACEMENT_RATIO, POST_RETIREMENT_RETURN_RATE, YEARS_OF_RETIREMENT
+
+# --- Projection Assumptions ---
+PRE_RETIREMENT_RETURN_RATE = 0.06
+PAYMENTS_PER_YEAR = 12  # Pension contributions and health premiums are entered per month
+RENT_SHARE_OF_EXPENSES = 0.3  # Share of expenses that is rent, for people renting their home
+CHILD_COST_SHARE = 0.1  # Extra yearly cost per dependent child, as a share of annual expenses
+CHILD_SUPPORT_YEARS = 20
+PARENT_COST_SHARE = 0.05  # Extra yearly cost per dependent parent, as a share of annual expenses
+PARENT_SUPPORT_YEARS = 15
+
+PROJECTION_FIELDS = (
+    "age", "retirement_age_target", "expected_inflation_rate", "income", "monthly_expenses",
+    "assets_cars", "assets_land", "assets_others", "loans_debts_amount",
+    "pension_contributions_yn", "pension_contributions_amount",
+    "health_insurance_yn", "health_insurance_amount",
+    "dependents_children", "dependents_parents", "owns_house", "on_rent",
+)
+
+# Which part of the timeline each input affects.
+_TIMELINE_FIELDS = {"age", "expected_inflation_rate"}
+_OPENING_BALANCE_FIELDS = {"assets_cars", "assets_land", "assets_others", "loans_debts_amount"}
+_RETIREMENT_FIELDS = {"income", "health_insurance_yn", "health_insurance_amount", "owns_house", "on_rent"}
+
+
+class CashFlowProjection:
+    """
+    Year-by-year cash-flow projection from the current age to the end of retirement.
+
+    Each year of the timeline has a price level (from the expected inflation rate) and
+    a net flow into the corpus:
+
+    * while working: pension contributions, minus the extra cost of dependents;
+    * in retirement: minus the income to replace (income * REPLACEMENT_RATIO), health
+      insurance premiums and, for renters, rent, all at that year's prices.
+
+    The corpus starts at assets minus debts and grows at PRE_RETIREMENT_RETURN_RATE
+    until retirement and POST_RETIREMENT_RETURN_RATE afterwards.
+
+    Balances are kept in the linear form corpus_t = growth_t * opening_corpus + flows_t,
+    so update() only recomputes the years an input actually affects. Changing the
+    retirement age recomputes from the earlier of the old and new retirement years,
+    changing retirement spending recomputes only the retirement years, and changing
+    assets or debts recomputes no flows at all.
+    """
+
+    def __init__(self, profile):
+        self.profile = {field: profile[field] for field in PROJECTION_FIELDS}
+        self._validate()
+        self.last_recompute_start = 0
+        self._build()
+
+    # --- Public API ---
+    def update(self, **changes):
+        """
+        Applies changed inputs and recomputes only the affected part of the timeline.
+
+        Returns:
+            CashFlowProjection: self, to allow chaining.
+        """
+        changes = {k: v for k, v in changes.items() if k in self.profile and self.profile[k] != v}
+        if not changes:
+            return self
+
+        old_retirement_index = self._retirement_index
+        self.profile.update(changes)
+        self._validate()
+
+        if changes.keys() & _TIMELINE_FIELDS:
+            self._build()
+            return self
+
+        start = None
+        if "retirement_age_target" in changes:
+            start = min(old_retirement_index, self._retirement_index)
+        elif changes.keys() & _RETIREMENT_FIELDS:
+            start = self._retirement_index
+        if changes.keys() - _OPENING_BALANCE_FIELDS - _RETIREMENT_FIELDS - {"retirement_age_target"}:
+            start = 0
+
+        if start is None:
+            self.last_recompute_start = len(self._flows)  # Only the opening balance moved
+        else:
+            self._recompute(start)
+        return self
+
+    def timeline(self):
+        """
+        Returns the projection as a dict of equally long NumPy arrays, one entry per year.
+        """
+        opening = self._opening_corpus()
+        return {
+            'age': self.profile['age'] + np.arange(len(self._flows)),
+            'retired': np.arange(len(self._flows)) >= self._retirement_index,
+            'price_index': self._price.copy(),
+            'contributions': self._contributions.copy(),
+            'dependent_costs': self._dependent_costs.copy(),
+            'retirement_spending': self._spending.copy(),
+            'net_flow': self._flows.copy(),
+            'corpus_start': self._growth[:-1] * opening + self._accumulated[:-1],
+            'corpus_end': self._growth[1:] * opening + self._accumulated[1:],
+        }
+
+    def summary(self):
+        """
+        Returns corpus_at_retirement, corpus_at_end, depletion_age (None if the money
+        lasts) and ready.
+        """
+        opening = self._opening_corpus()
+        corpus_end = self._growth[1:] * opening + self._accumulated[1:]
+        depleted = np.flatnonzero(corpus_end < 0)
+        depletion_age = int(self.profile['age'] + depleted[0]) if depleted.size else None
+        retirement_index = self._retirement_index
+        return {
+            'corpus_at_retirement': float(self._growth[retirement_index] * opening
+                                          + self._accumulated[retirement_index]),
+            'corpus_at_end': float(corpus_end[-1]),
+            'depletion_age': depletion_age,
+            'ready': depletion_age is None,
+        }
+
+    # --- Internals ---
+    @property
+    def _retirement_index(self):
+        return int(self.profile['retirement_age_target'] - self.profile['age'])
+
+    @property
+    def _years(self):
+        return self._retirement_index + YEARS_OF_RETIREMENT
+
+    def _validate(self):
+        if self.profile['age'] >= self.profile['retirement_age_target']:
+            raise ValueError("Target retirement age should be greater than current age.")
+
+    def _opening_corpus(self):
+        p = self.profile
+        return p['assets_cars'] + p['assets_land'] + p['assets_others'] - p['loans_debts_amount']
+
+    def _build(self):
+        years = self._years
+        self._price = (1 + self.profile['expected_inflation_rate']) ** np.arange(years, dtype=float)
+        self._contributions = np.zeros(years)
+        self._dependent_costs = np.zeros(years)
+        self._spending = np.zeros(years)
+        self._flows = np.zeros(years)
+        self._growth = np.ones(years + 1)
+        self._accumulated = np.zeros(years + 1)
+        self._recompute(0)
+
+    def _resize(self, years):
+        """
+        Grows or shrinks the per-year arrays to a new horizon, keeping existing years.
+        """
+        old_years = len(self._flows)
+        if years < old_years:
+            for name in ('_price', '_contributions', '_dependent_costs', '_spending', '_flows'):
+                setattr(self, name, getattr(self, name)[:years])
+            self._growth = self._growth[:years + 1]
+            self._accumulated = self._accumulated[:years + 1]
+        elif years > old_years:
+            extra = years - old_years
+            tail = (1 + self.profile['expected_inflation_rate']) ** np.arange(old_years, years, dtype=float)
+            self._price = np.concatenate([self._price, tail])
+            for name in ('_contributions', '_dependent_costs', '_spending', '_flows'):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra)]))
+            self._growth = np.concatenate([self._growth, np.ones(extra)])
+            self._accumulated = np.concatenate([self._accumulated, np.zeros(extra)])
+
+    def _recompute(self, start):
+        """
+        Recomputes flows and balances for every year from start onwards.
+        """
+        p = self.profile
+        self._resize(self._years)
+        self.last_recompute_start = start
+
+        t = np.arange(start, self._years)
+        price = self._price[start:]
+        working = t < self._retirement_index
+        annual_expenses = p['monthly_expenses'] * 12
+
+        # --- Flows ---
+        contributions = np.zeros(len(t))
+        if p['pension_contributions_yn'] == "Y":
+            contributions = np.where(working, p['pension_contributions_amount'] * PAYMENTS_PER_YEAR * price, 0.0)
+
+        dependent_share = (p['dependents_children'] * CHILD_COST_SHARE * (t < CHILD_SUPPORT_YEARS)
+                           + p['dependents_parents'] * PARENT_COST_SHARE * (t < PARENT_SUPPORT_YEARS))
+        dependent_costs = dependent_share * annual_expenses * price
+
+        yearly_spending = p['income'] * REPLACEMENT_RATIO
+        if p['health_insurance_yn'] == "Y":
+            yearly_spending += p['health_insurance_amount'] * PAYMENTS_PER_YEAR
+        if p['owns_house'] == "N" and p['on_rent'] == "Y":
+            yearly_spending += annual_expenses * RENT_SHARE_OF_EXPENSES
+        spending = np.where(working, 0.0, yearly_spending * price)
+
+        self._contributions[start:] = contributions
+        self._dependent_costs[start:] = dependent_costs
+        self._spending[start:] = spending
+        self._flows[start:] = contributions - dependent_costs - spending
+
+        # --- Balances ---
+        # growth_{t+1} = growth_t * g_t and accumulated_{t+1} = accumulated_t * g_t + flow_t,
+        # solved for the whole segment at once with a cumulative product and sum.
+        g = np.where(working, 1 + PRE_RETIREMENT_RETURN_RATE, 1 + POST_RETIREMENT_RETURN_RATE)
+        growth = self._growth[start] * np.cumprod(g)
+        self._growth[start + 1:] = growth
+        self._accumulated[start + 1:] = growth * (self._accumulated[start] / self._growth[start]
+                                                  + np.cumsum(self._flows[start:] / growth))
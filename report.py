@@ -0,0 +1,164 @@
+import functools
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from pdf_cache import cached_pdf
+from telemetry import timed
+
+# ReportLab is imported inside the functions below, so it is only loaded once the first
+# report is actually built.
+
+
+@functools.lru_cache(maxsize=None)
+def get_report_styles():
+    """
+    Builds the ReportLab sample stylesheet once and reuses it for every report.
+    """
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
+
+@cached_pdf
+@timed("pdf_build")
+def create_pdf_report(results, profile, currency_symbol):
+    """
+    Generates a PDF report of the retirement readiness assessment.
+
+    Reports are cached by a hash of all the arguments (see pdf_cache), so re-running
+    or re-downloading the same inputs returns the stored bytes without rebuilding.
+
+    Args:
+        results (dict): The results dictionary from the calculate_retirement_needs function.
+        profile (ProfileInput): The user's inputs.
+        currency_symbol (str): The currency symbol.
+    Returns:
+        bytes: The PDF report in bytes.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = get_report_styles()
+    Story = []
+
+    # --- Title and Introduction ---
+    Story.append(Paragraph("Retirement Readiness Report", styles['Title']))
+    Story.append(Spacer(1, 0.2 * inch))
+    Story.append(Paragraph("This report assesses your retirement readiness.", styles['Normal']))
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- User Information ---
+    Story.append(Paragraph("Your Information", styles['Heading1']))
+    Story.append(Spacer(1, 0.1 * inch))
+    user_info_text = f"Age: {profile.age}, Gender: {profile.gender}, Country: {profile.country}, Net Annual Income: {currency_symbol}{profile.income:,.2f},  Assets (Cars): {currency_symbol}{profile.assets_cars:,.2f}, Assets (Land): {currency_symbol}{profile.assets_land:,.2f}, Assets (Others): {currency_symbol}{profile.assets_others:,.2f}, Owns a House: {profile.owns_house}, On Rent: {profile.on_rent}, Loans/Debts Amount: {currency_symbol}{profile.loans_debts_amount:,.2f}, Family Members Count: {profile.family_members_count}, Dependents (Parents): {profile.dependents_parents}, Dependents (Spouse): {profile.dependents_spouse}, Dependents (Children): {profile.dependents_children}, Dependent Health Problems: {profile.dependent_health_problems_yn}, Dependent Health Problems Details: {profile.dependent_health_problems_details}, Upcoming Big Goals: {profile.upcoming_big_goals}, Any Health Issues: {profile.health_issues_yn}, Health Insurance: {profile.health_insurance_yn}, Health Insurance Amount (Monthly/Yearly): {currency_symbol}{profile.health_insurance_amount:,.2f}, Life Insurance: {profile.life_insurance_yn}, Life Insurance Amount (Total): {currency_symbol}{profile.life_insurance_amount_total:,.2f}, Monthly Expenses: {currency_symbol}{profile.monthly_expenses:,.2f}, Pension Contributions: {profile.pension_contributions_yn}, Pension Contributions Amount (Monthly/Yearly): {currency_symbol}{profile.pension_contributions_amount:,.2f}, Expected Inflation Rate: {profile.expected_inflation_rate * 100:.2f}%, Target Retirement Age: {profile.retirement_age_target}"
+    # Paragraph text is markup; profile text and suggestions are escaped so they print as entered
+    Story.append(Paragraph(escape(user_info_text), styles['Normal']))
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- Key Results ---
+    Story.append(Paragraph("Key Results", styles['Heading1']))
+    Story.append(Spacer(1, 0.1 * inch))
+    Story.append(Paragraph(escape(f"Verdict: {results['verdict']}"), styles['Heading2']))
+    Story.append(Paragraph(escape(f"Corpus Needed: {currency_symbol}{results['corpus_needed']:,.2f}"), styles['Normal']))
+    Story.append(Paragraph(escape(f"Corpus Available: {currency_symbol}{results['corpus_available']:,.2f}"),
+                           styles['Normal']))
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- Suggestions ---
+    Story.append(Paragraph("Recommendations", styles['Heading1']))
+    Story.append(Spacer(1, 0.1 * inch))
+    for suggestion in results['suggestions']:
+        Story.append(Paragraph(escape(f"- {suggestion}"), styles['Bullet']))
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- Additional Details (Optional) ---
+    Story.append(Paragraph("Assumptions and Methodology", styles['Heading2']))
+    Story.append(Spacer(1, 0.1 * inch))
+    Story.append(Paragraph(
+        "The calculations in this report are based on standard financial planning principles. It's essential to consult with a qualified financial advisor for personalized advice.",
+        styles['Normal']
+    ))
+
+    doc.build(Story)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+@cached_pdf
+@timed("scenario_pdf_build")
+def create_comparison_report(scenarios, profile, currency_symbol):
+    """
+    Generates one PDF comparing several scenarios of the same profile.
+
+    Args:
+        scenarios (list): Rows from scenarios.compare_scenarios (the base plan first).
+        profile (ProfileInput): The base inputs.
+        currency_symbol (str): The currency symbol.
+    Returns:
+        bytes: The PDF report in bytes.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    from charts import render_scenario_chart
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(letter))
+    styles = get_report_styles()
+    Story = []
+
+    # --- Title and Introduction ---
+    Story.append(Paragraph("Retirement Scenario Comparison", styles['Title']))
+    Story.append(Spacer(1, 0.2 * inch))
+    Story.append(Paragraph(escape(
+        f"Base plan: age {profile.age}, {profile.country}, net annual income {currency_symbol}{profile.income:,.2f}, "
+        f"monthly expenses {currency_symbol}{profile.monthly_expenses:,.2f}, expected inflation "
+        f"{profile.expected_inflation_rate * 100:.2f}%, target retirement age {profile.retirement_age_target}. "
+        f"Each scenario changes only the inputs named in it."), styles['Normal']))
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- Comparison Table ---
+    rows = [["Scenario", "Years to Retirement", f"Corpus Needed ({currency_symbol})",
+             f"Corpus Available ({currency_symbol})", f"Shortfall ({currency_symbol})", "Ready"]]
+    for scenario in scenarios:
+        if scenario['shortfall'] is None:  # Invalid inputs: show the error instead of figures
+            rows.append([Paragraph(escape(scenario['scenario']), styles['Normal']), "-", "-", "-", "-",
+                         Paragraph(escape(scenario['verdict']), styles['Normal'])])
+            continue
+        rows.append([Paragraph(escape(scenario['scenario']), styles['Normal']), scenario['years_to_retirement'],
+                     f"{scenario['corpus_needed']:,.2f}", f"{scenario['corpus_available']:,.2f}",
+                     f"{scenario['shortfall']:,.2f}", "Yes" if scenario['ready'] else "No"])
+    table = Table(rows, colWidths=[2.6 * inch, 1.1 * inch, 1.5 * inch, 1.5 * inch, 1.4 * inch, 1.4 * inch],
+                  repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    Story.append(table)
+    Story.append(Spacer(1, 0.2 * inch))
+
+    # --- Chart ---
+    chart = BytesIO(render_scenario_chart(scenarios, currency_symbol))
+    figure_width = max(6.4, 1.2 * len(scenarios))  # Inches, as drawn by render_scenario_chart
+    width = min(9.0, figure_width)
+    Story.append(Image(chart, width=width * inch, height=width * 4.8 / figure_width * inch))
+
+    # --- Additional Details (Optional) ---
+    Story.append(Paragraph("Assumptions and Methodology", styles['Heading2']))
+    Story.append(Spacer(1, 0.1 * inch))
+    Story.append(Paragraph(
+        "Every scenario uses the same calculation as the main report. It's essential to consult with a qualified financial advisor for personalized advice.",
+        styles['Normal']
+    ))
+
+    doc.build(Story)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
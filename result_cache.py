@@ -0,0 +1,183 @@
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# --- Cache Settings ---
+# Both can be overridden through the environment; RESULT_CACHE_TTL=0 disables expiry.
+DEFAULT_MAX_BYTES = int(os.environ.get("RESULT_CACHE_BYTES", 32 * 1024 * 1024))
+DEFAULT_TTL = float(os.environ.get("RESULT_CACHE_TTL", 3600)) or None
+PURGE_INTERVAL = 60.0  # Seconds between full sweeps for expired entries
+
+
+def _normalize(value):
+    """
+    Converts a value into a JSON-serializable form that is stable across runs.
+
+    Scalars and sequences are tagged with their kind, so values that only look alike
+    (the float 5.0 and the string "5.0", or a tuple and a tagged scalar) never share a
+    key. Numbers, bools included, are tagged by their float value, as in
+    storage.content_hash, so 5, 5.0 and np.int64(5) (which compute the same) do.
+    """
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if dataclasses.is_dataclass(value):  # e.g. ProfileInput
+        return ["d", type(value).__name__,
+                {field.name: _normalize(getattr(value, field.name)) for field in dataclasses.fields(value)}]
+    if isinstance(value, (list, tuple)):
+        return ["l", [_normalize(v) for v in value]]
+    if hasattr(value, "item"):  # NumPy scalars
+        value = value.item()
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return ["s", value]
+    if isinstance(value, (bool, int, float)):
+        try:
+            return ["f", repr(float(value))]  # repr round-trips exactly, unlike str formatting
+        except OverflowError:  # An int too large for a float
+            return ["i", str(value)]
+    return [type(value).__name__, repr(value)]
+
+
+def content_key(*args, **kwargs):
+    """
+    Returns a SHA-256 hex digest of the normalized arguments.
+    """
+    payload = json.dumps([_normalize(args), _normalize(kwargs)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a hard memory cap and per-entry time-to-live.
+
+    Every entry is stored with its size in bytes. When the total goes over max_bytes the
+    least recently used entries are evicted; entries older than their TTL are dropped on
+    lookup and by a periodic sweep. One instance is shared by every session in the process.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._next_purge = time.monotonic() + PURGE_INTERVAL
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key):
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, value, size, ttl=None):
+        """
+        Stores value under key.
+
+        Args:
+            key (str): The cache key.
+            value: The value to store.
+            size (int): The value's size in bytes, counted against max_bytes.
+            ttl (float, optional): Seconds to keep the entry; defaults to the cache's ttl.
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge_expired(now)
+            self._store(key, value, size, now + ttl if ttl else None)
+
+    def stats(self):
+        """
+        Returns hit/miss/eviction/expiration counters and the current memory footprint.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """
+        Empties the cache (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _store(self, key, value, size, expires_at):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _purge_expired(self, now):
+        expired = [key for key, (_, _, expires_at) in self._entries.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self._stats['expirations'] += len(expired)
+        self._next_purge = now + PURGE_INTERVAL
+
+
+result_cache = ResultCache()
+
+
+def cached_result(func=None, ttl=None, cache=None):
+    """
+    Decorator that serves a function's return value from a shared ResultCache.
+
+    The key is a hash of the function name and its normalized arguments (see
+    content_key), so the same profile hits the cache from any session. Values are
+    stored pickled: the pickle length is what counts against the memory cap, and each
+    caller gets its own copy, so mutating a result never affects other sessions.
+
+    Args:
+        ttl (float, optional): Seconds to keep entries; defaults to the cache's ttl.
+        cache (ResultCache, optional): The cache to use; defaults to result_cache.
+    """
+    if func is None:
+        return functools.partial(cached_result, ttl=ttl, cache=cache)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        store = cache if cache is not None else result_cache
+        key = content_key(func.__module__, func.__qualname__, *args, **kwargs)
+        blob = store.get(key)
+        if blob is not None:
+            return pickle.loads(blob)
+        value = func(*args, **kwargs)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        store.put(key, blob, len(blob), ttl=ttl)
+        return value
+    return wrapper
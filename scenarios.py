@@ -0,0 +1,105 @@
+import itertools
+
+import numpy as np
+
+from batch import calculate_retirement_needs_batch
+from calculator import CURRENCY_DATA
+from profile_input import profiles_to_array
+from suggestions import render_suggestions
+
+# --- Scenario Fields ---
+# Inputs a scenario may change: field -> (label, converts an entered value to the stored
+# one, short name of a stored value for tables and charts). Rates are entered in
+# percent, like on the input form.
+SCENARIO_FIELDS = {
+    "retirement_age_target": ("Target Retirement Age", int, lambda value: f"Retire at {value:g}"),
+    "expected_inflation_rate": ("Expected Inflation Rate (%)", lambda value: float(value) / 100,
+                                lambda value: f"{value * 100:g}% inflation"),
+    "monthly_expenses": ("Monthly Expenses", float, lambda value: f"Expenses {value:,.0f}/month"),
+    "income": ("Net Annual Income", float, lambda value: f"Income {value:,.0f}"),
+    "assets_others": ("Assets (Others)", float, lambda value: f"Other assets {value:,.0f}"),
+    "loans_debts_amount": ("Loans/Debts Amount", float, lambda value: f"Debts {value:,.0f}"),
+}
+BASE_SCENARIO = "Current plan"
+MAX_SCENARIOS = 25
+
+
+def parse_values(field, text):
+    """
+    Parses a comma-separated list of values for a scenario field, e.g. "55, 60, 65".
+
+    Returns:
+        list: The values in stored form (rates as fractions), in the order entered.
+    Raises:
+        ValueError: For an unknown field or a value that is not a number.
+    """
+    if field not in SCENARIO_FIELDS:
+        raise ValueError(f"Scenarios cannot change {field}.")
+    label, convert, _ = SCENARIO_FIELDS[field]
+    try:
+        return [convert(part.strip()) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(f"{label} values should be numbers separated by commas.") from None
+
+
+def scenario_grid(values):
+    """
+    Expands {field: [values]} into one override dict per combination of values.
+    """
+    fields = list(values)
+    return [dict(zip(fields, combination)) for combination in itertools.product(*values.values())]
+
+
+def scenario_name(overrides):
+    """
+    Returns a short display name for a scenario, e.g. "Retire at 55, 8% inflation".
+    """
+    if not overrides:
+        return BASE_SCENARIO
+    return ", ".join(SCENARIO_FIELDS[field][2](value) if field in SCENARIO_FIELDS else f"{field} {value}"
+                     for field, value in overrides.items())
+
+
+def compare_scenarios(profile, overrides, include_base=True):
+    """
+    Evaluates a base profile and its variants in one batch call.
+
+    The base profile is packed into a structured array once and repeated, then only
+    the overridden columns are written, so N scenarios cost one array pass rather than N
+    calculator runs.
+
+    Args:
+        profile (ProfileInput): The base inputs.
+        overrides (list): One dict of {field: value} per scenario.
+        include_base (bool): Put the unchanged profile first, as BASE_SCENARIO.
+    Returns:
+        list: One dict per scenario with scenario (name), overrides, corpus_needed,
+            corpus_available, shortfall, ready, verdict, years_to_retirement and
+            suggestions.
+    """
+    overrides = ([{}] if include_base else []) + [dict(override) for override in overrides]
+    if len(overrides) > MAX_SCENARIOS:
+        raise ValueError(f"Compare at most {MAX_SCENARIOS} scenarios at a time.")
+    profiles = np.repeat(profiles_to_array([profile]), len(overrides))
+    for index, override in enumerate(overrides):
+        for field, value in override.items():
+            if field not in profiles.dtype.names:
+                raise ValueError(f"Unknown profile field: {field}")
+            profiles[field][index] = value
+
+    results = calculate_retirement_needs_batch(profiles)
+    currency_symbol = CURRENCY_DATA.get(profile.country, {}).get("symbol", "")
+    scenarios = []
+    for override, row in zip(overrides, results.to_dict("records")):
+        scenarios.append({
+            'scenario': scenario_name(override),
+            'overrides': override,
+            'corpus_needed': row['corpus_needed'],
+            'corpus_available': row['corpus_available'],
+            'shortfall': max(row['corpus_needed'] - row['corpus_available'], 0) if row['valid'] else None,
+            'ready': row['ready'],
+            'verdict': row['verdict'],
+            'years_to_retirement': row['years_to_retirement'],
+            'suggestions': render_suggestions(row['suggestion_ids'], row, currency_symbol) if row['valid'] else [],
+        })
+    return scenarios
@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from calculator import REPLACEMENT_RATIO, POST_RETIREMENT_RETURN_RATE, YEARS_OF_RETIREMENT
+
+# --- Simulation Assumptions ---
+INFLATION_VOLATILITY = 0.015  # Std. deviation of annual inflation around the expected rate
+RETURN_VOLATILITY = 0.06  # Std. deviation of annual post-retirement returns
+DEFAULT_PATHS = 10000
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def simulate_retirement(profile, n_paths=DEFAULT_PATHS, seed=None,
+                        inflation_volatility=INFLATION_VOLATILITY,
+                        return_volatility=RETURN_VOLATILITY):
+    """
+    Runs a Monte Carlo simulation of one profile's retirement.
+
+    Every path draws a yearly inflation rate from today until the end of retirement and
+    a yearly investment return for each of the YEARS_OF_RETIREMENT years. The income to
+    replace (income * REPLACEMENT_RATIO) is inflated along the path and withdrawn at the
+    start of each retirement year; the corpus a path needs is the present value of those
+    withdrawals discounted at that path's returns. A path succeeds when the available
+    corpus (assets minus debts, as in calculate_retirement_needs) covers it, i.e. the
+    money never runs out. All paths are generated in one array batch.
+
+    Args:
+        profile (dict): Profile fields named like the calculate_retirement_needs
+            parameters; age, retirement_age_target, income, expected_inflation_rate,
+            assets_cars, assets_land, assets_others and loans_debts_amount are used.
+        n_paths (int): Number of simulated paths.
+        seed (int or np.random.SeedSequence): Seed for reproducible results.
+        inflation_volatility (float): Std. deviation of annual inflation.
+        return_volatility (float): Std. deviation of annual returns.
+    Returns:
+        dict: probability_of_success, corpus_available and corpus_needed_p<N> bands.
+    """
+    years_to_retirement = int(profile['retirement_age_target'] - profile['age'])
+    if years_to_retirement <= 0:
+        raise ValueError("Target retirement age should be greater than current age.")
+    if n_paths <= 0:
+        raise ValueError("n_paths should be positive.")
+
+    rng = np.random.default_rng(seed)
+    total_years = years_to_retirement + YEARS_OF_RETIREMENT
+
+    # --- Draw Paths ---
+    inflation = rng.normal(profile['expected_inflation_rate'], inflation_volatility,
+                           size=(n_paths, total_years))
+    returns = rng.normal(POST_RETIREMENT_RETURN_RATE, return_volatility,
+                         size=(n_paths, YEARS_OF_RETIREMENT))
+
+    # --- Withdrawals and Their Present Value ---
+    price_level = np.cumprod(1 + inflation, axis=1)
+    withdrawals = profile['income'] * REPLACEMENT_RATIO * price_level[:, years_to_retirement - 1:-1]
+    growth = np.cumprod(1 + returns, axis=1)
+    discount = np.empty_like(growth)
+    discount[:, 0] = 1.0
+    discount[:, 1:] = growth[:, :-1]
+    corpus_needed = (withdrawals / discount).sum(axis=1)
+
+    corpus_available = (profile['assets_cars'] + profile['assets_land'] + profile['assets_others']
+                        - profile['loans_debts_amount'])
+
+    result = {
+        'probability_of_success': float(np.mean(corpus_available >= corpus_needed)),
+        'corpus_available': corpus_available,
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(corpus_needed, PERCENTILES)):
+        result[f'corpus_needed_p{percentile}'] = float(value)
+    return result
+
+
+def _simulate_job(args):
+    profile, n_paths, seed, inflation_volatility, return_volatility = args
+    return simulate_retirement(profile, n_paths, seed, inflation_volatility, return_volatility)
+
+
+def simulate_retirement_batch(profiles, n_paths=DEFAULT_PATHS, seed=None, max_workers=None,
+                              inflation_volatility=INFLATION_VOLATILITY,
+                              return_volatility=RETURN_VOLATILITY):
+    """
+    Runs simulate_retirement for many profiles, spread across a process pool.
+
+    Each profile gets its own child of the seed, so results are reproducible and do not
+    depend on the number of workers.
+
+    Args:
+        profiles (pd.DataFrame or list of dict): One profile per row.
+        n_paths (int): Number of simulated paths per profile.
+        seed (int): Seed for reproducible results.
+        max_workers (int): Pool size; None uses every core, 1 runs in-process.
+        inflation_volatility (float): Std. deviation of annual inflation.
+        return_volatility (float): Std. deviation of annual returns.
+    Returns:
+        pd.DataFrame: One row of simulate_retirement results per profile.
+    """
+    index = None
+    if isinstance(profiles, pd.DataFrame):
+        index = profiles.index
+        profiles = profiles.to_dict('records')
+
+    seeds = np.random.SeedSequence(seed).spawn(len(profiles))
+    jobs = [(profile, n_paths, profile_seed, inflation_volatility, return_volatility)
+            for profile, profile_seed in zip(profiles, seeds)]
+
+    if max_workers == 1 or len(jobs) <= 1:
+        results = [_simulate_job(job) for job in jobs]
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_job, jobs, chunksize=chunksize))
+
+    return pd.DataFrame(results, index=index)
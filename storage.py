@@ -0,0 +1,591 @@
+import argparse
+import hashlib
+import numbers
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from cohorts import Cohort
+from telemetry import span
+
+# --- Submission Layout ---
+# Column names in the submissions table, in the order of the Excel sheet.
+SUBMISSION_FIELDS = (
+    "country", "age", "gender", "income", "assets_cars", "assets_land", "assets_others",
+    "owns_house", "on_rent", "loans_debts_amount", "family_members_count", "dependents_parents",
+    "dependents_spouse", "dependents_children", "dependent_health_problems_yn",
+    "dependent_health_problems_details", "upcoming_big_goals", "health_issues_yn",
+    "health_insurance_yn", "health_insurance_amount", "life_insurance_yn",
+    "life_insurance_amount_total", "monthly_expenses", "pension_contributions_yn",
+    "pension_contributions_amount", "expected_inflation_rate", "retirement_age_target",
+    "verdict", "corpus_needed", "corpus_available", "ready", "only_source_of_income",
+)
+
+# Header row of the user_data.xlsx layout, one per SUBMISSION_FIELDS entry.
+SUBMISSION_HEADERS = (
+    "Country", "Age", "Gender", "Income", "Assets Cars", "Assets Land", "Assets Others", "Owns House",
+    "On Rent", "Loans/Debts Amount", "Family Members Count", "Dependents Parents",
+    "Dependents Spouse", "Dependents Children", "Dependent Health Problems YN",
+    "Dependent Health Problems Details", "Upcoming Big Goals", "Any Health Issues",
+    "Health Insurance", "Health Insurance Amount", "Life Insurance",
+    "Life Insurance Amount Total", "Monthly Expenses", "Pension Contributions",
+    "Pension Contributions Amount", "Expected Inflation Rate", "Target Retirement Age",
+    "Results Verdict", "Corpus Needed", "Corpus Available", "Ready",
+    "Only Source of Income",
+)
+
+# Submission fields taken from the results rather than the profile.
+RESULT_FIELDS = ("verdict", "corpus_needed", "corpus_available", "ready")
+
+# History columns added to every row, and the indexes the query API relies on.
+AGE_BAND_WIDTH = 10
+AGE_INDEX = SUBMISSION_FIELDS.index("age")
+HISTORY_COLUMNS = (("content_hash", "TEXT"), ("age_band", "INTEGER"), ("last_submitted_at", "TEXT"),
+                   ("submission_count", "INTEGER NOT NULL DEFAULT 1"))
+HISTORY_INDEXES = {  # name -> (columns, unique)
+    "idx_submissions_content_hash": ("content_hash", True),
+    "idx_submissions_country_age_ready": ("country, age_band, ready, created_at", False),
+    "idx_submissions_ready_created": ("ready, created_at", False),
+    "idx_submissions_created": ("created_at", False),
+}
+
+# Running aggregates per (country, age band), updated with every append so the cohort
+# analytics page never scans the history. Unknown countries and ages are stored as ""
+# and -1 so they still form a cohort under the primary key.
+COHORT_TABLE = "cohort_stats"
+COUNTRY_INDEX = SUBMISSION_FIELDS.index("country")
+VERDICT_INDEX = SUBMISSION_FIELDS.index("verdict")
+CORPUS_NEEDED_INDEX = SUBMISSION_FIELDS.index("corpus_needed")
+CORPUS_AVAILABLE_INDEX = SUBMISSION_FIELDS.index("corpus_available")
+READY_INDEX = SUBMISSION_FIELDS.index("ready")
+HASH_LOOKUP_SIZE = 500  # Content hashes per "IN (...)" lookup, below SQLite's parameter limit
+# Bumped whenever content_hash changes; stores hashed by an older version (kept in
+# PRAGMA user_version) are rehashed and their duplicates folded on open.
+HASH_VERSION = 1
+MISSING_MARKER = "<missing>"  # Hashed for None and NaN
+
+DATA_DIR = "user_data"
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, "submissions.db")
+DEFAULT_XLSX_PATH = os.path.join(DATA_DIR, "user_data.xlsx")
+SHEET_NAME = 'Sheet1'
+
+
+def _connect(db_path=DEFAULT_DB_PATH):
+    """
+    Opens the submission database, creating it in WAL mode on first use.
+
+    WAL lets any number of readers run alongside a writer, and the busy timeout makes
+    concurrent writers from other sessions or processes wait their turn instead of failing.
+    """
+    directory = os.path.dirname(db_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    columns = ", ".join(SUBMISSION_FIELDS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS submissions ("
+                 f"id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL, {columns}, "
+                 f"content_hash TEXT, age_band INTEGER, last_submitted_at TEXT, "
+                 f"submission_count INTEGER NOT NULL DEFAULT 1)")
+    _migrate(conn)
+    return conn
+
+
+def _migration_needed(conn):
+    """
+    Returns (indexed, has_cohorts, rehash): which parts of the store are already current.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'table')")}
+    indexed = set(HISTORY_INDEXES) <= existing
+    rehash = indexed and conn.execute("PRAGMA user_version").fetchone()[0] < HASH_VERSION
+    return indexed, COHORT_TABLE in existing, rehash
+
+
+def _migrate(conn):
+    """
+    Brings a store created before the history columns or cohort aggregates existed up to date.
+
+    Adds the columns, fills them in for old rows, folds exact duplicates into their first
+    row and creates the indexes, then builds the cohort aggregates from the history.
+    Rows hashed by an older HASH_VERSION are rehashed the same way. Does nothing once the
+    indexes and the cohort table exist and the hashes are current.
+
+    The migration runs in one write transaction and checks the store again once it holds
+    the lock, so when several processes open an old store at once, only the first migrates.
+    """
+    indexed, has_cohorts, rehash = _migration_needed(conn)
+    if indexed and has_cohorts and not rehash:
+        return
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        indexed, has_cohorts, rehash = _migration_needed(conn)
+        if indexed and has_cohorts and not rehash:
+            return  # Another process migrated while this one waited for the lock
+        if rehash:
+            # Rows that only differed in how a value was typed now share a hash
+            conn.execute("DROP INDEX IF EXISTS idx_submissions_content_hash")
+            conn.execute("UPDATE submissions SET content_hash = NULL")
+        if not indexed or rehash:
+            _migrate_history(conn)
+        if not has_cohorts or rehash:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {COHORT_TABLE} ("
+                         f"country TEXT NOT NULL, age_band INTEGER NOT NULL, state TEXT NOT NULL, "
+                         f"PRIMARY KEY (country, age_band))")
+            _rebuild_cohorts(conn)
+        conn.execute(f"PRAGMA user_version = {HASH_VERSION}")
+
+
+def _migrate_history(conn):
+    have = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+    for column, column_type in HISTORY_COLUMNS:
+        if column not in have:
+            conn.execute(f"ALTER TABLE submissions ADD COLUMN {column} {column_type}")
+    stale = conn.execute(f"SELECT id, {', '.join(SUBMISSION_FIELDS)} FROM submissions "
+                         f"WHERE content_hash IS NULL").fetchall()
+    conn.executemany("UPDATE submissions SET content_hash = ?, age_band = ? WHERE id = ?",
+                     [(content_hash(row[1:]), age_band(row[1 + AGE_INDEX]), row[0]) for row in stale])
+    conn.execute("UPDATE submissions SET last_submitted_at = created_at WHERE last_submitted_at IS NULL")
+    # Keep the first row of each duplicate group, carrying the group's count and last time.
+    # The unique index cannot exist yet, so a plain one keeps the lookups below indexed.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_content_hash_fold ON submissions (content_hash, id)")
+    conn.execute("""
+        UPDATE submissions SET
+            submission_count = (SELECT SUM(d.submission_count) FROM submissions d
+                                WHERE d.content_hash = submissions.content_hash),
+            last_submitted_at = (SELECT MAX(d.last_submitted_at) FROM submissions d
+                                 WHERE d.content_hash = submissions.content_hash)
+        WHERE id IN (SELECT MIN(id) FROM submissions GROUP BY content_hash HAVING COUNT(*) > 1)""")
+    conn.execute("DELETE FROM submissions WHERE id NOT IN (SELECT MIN(id) FROM submissions GROUP BY content_hash)")
+    conn.execute("DROP INDEX idx_submissions_content_hash_fold")
+    for name, (columns, unique) in HISTORY_INDEXES.items():
+        conn.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON submissions ({columns})")
+
+
+def _hash_value(value):
+    """
+    Returns the form of one submission value that content_hash digests.
+
+    Numbers (bools and NumPy scalars included) become the repr of their float value, so
+    500000, 500000.0 and np.int64(500000) hash alike, as do a stored 1 and True; None
+    and NaN become MISSING_MARKER.
+    """
+    if hasattr(value, "item"):
+        value = value.item()
+    if value is None or (isinstance(value, float) and value != value):
+        return MISSING_MARKER
+    if isinstance(value, numbers.Real):
+        return repr(float(value))
+    return repr(value)
+
+
+def content_hash(row):
+    """
+    Returns the SHA-256 hex digest identifying a submission row's contents.
+
+    Values are normalized with _hash_value, so a row hashes the same whichever save path
+    (form, structured array, database read-back) produced it. Rows are flat, so the
+    values are joined directly instead of going through result_cache.content_key.
+    """
+    return hashlib.sha256("\x1f".join(map(_hash_value, row)).encode("utf-8")).hexdigest()
+
+
+def age_band(age):
+    """
+    Returns the start of the ten-year band an age falls in (e.g. 37 -> 30), or None.
+    """
+    try:
+        return int(age // AGE_BAND_WIDTH * AGE_BAND_WIDTH)
+    except TypeError:
+        return None
+
+
+def append_submissions(rows, db_path=DEFAULT_DB_PATH):
+    """
+    Appends submission rows to the store in a single transaction.
+
+    Each append is an indexed insert at the end of the table, so its cost does not
+    grow with the size of the history. A row identical to one already stored is not
+    added again; the existing row's submission_count and last_submitted_at are updated.
+
+    Args:
+        rows (iterable): Sequences of values in SUBMISSION_FIELDS order.
+        db_path (str): Path of the SQLite database.
+    Returns:
+        int: Number of rows accepted, duplicates included.
+    """
+    created_at = datetime.now(timezone.utc).isoformat()
+    placeholders = ", ".join("?" * (len(SUBMISSION_FIELDS) + 4))
+    records = [(created_at, created_at, content_hash(row), age_band(row[AGE_INDEX]), *row) for row in rows]
+    conn = _connect(db_path)
+    try:
+        with conn:
+            # Taken before the duplicate lookup, so no other writer can store the same rows in between
+            conn.execute("BEGIN IMMEDIATE")
+            new_rows = _new_rows(conn, records)
+            conn.executemany(
+                f"INSERT INTO submissions (created_at, last_submitted_at, content_hash, age_band, "
+                f"{', '.join(SUBMISSION_FIELDS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (content_hash) DO UPDATE SET "
+                f"submission_count = submission_count + 1, last_submitted_at = excluded.last_submitted_at",
+                records)
+            _update_cohorts(conn, new_rows)
+    finally:
+        conn.close()
+    return len(records)
+
+
+def _new_rows(conn, records):
+    """
+    Returns the submission rows of records whose contents are not stored yet, once each.
+    """
+    hashes = list(dict.fromkeys(record[2] for record in records))
+    known = set()
+    for start in range(0, len(hashes), HASH_LOOKUP_SIZE):
+        chunk = hashes[start:start + HASH_LOOKUP_SIZE]
+        known.update(row[0] for row in conn.execute(
+            f"SELECT content_hash FROM submissions WHERE content_hash IN ({', '.join('?' * len(chunk))})", chunk))
+    new_rows = []
+    for record in records:
+        if record[2] not in known:
+            known.add(record[2])
+            new_rows.append(record[4:])
+    return new_rows
+
+
+def append_submission(row, db_path=DEFAULT_DB_PATH):
+    """
+    Appends a single submission row (values in SUBMISSION_FIELDS order) to the store.
+    """
+    return append_submissions([row], db_path)
+
+
+def submission_row(profile, results):
+    """
+    Builds a submission row (values in SUBMISSION_FIELDS order) from a ProfileInput and
+    its calculate_retirement_needs results.
+    """
+    return [results[field] if field in RESULT_FIELDS else getattr(profile, field)
+            for field in SUBMISSION_FIELDS]
+
+
+def append_profiles(profiles, results, db_path=DEFAULT_DB_PATH):
+    """
+    Appends a batch of scored profiles to the store in a single transaction.
+
+    Args:
+        profiles (np.ndarray): Structured array from profile_input.profiles_to_array.
+        results (pd.DataFrame): The matching calculate_retirement_needs_batch output.
+        db_path (str): Path of the SQLite database.
+    Returns:
+        int: Number of rows written.
+    """
+    columns = [(results if field in RESULT_FIELDS else profiles)[field].tolist()
+               for field in SUBMISSION_FIELDS]
+    return append_submissions(zip(*columns), db_path)
+
+
+def iter_submissions(db_path=DEFAULT_DB_PATH, batch_size=1000):
+    """
+    Yields stored submission rows in insertion order, in SUBMISSION_FIELDS order.
+
+    Rows are fetched in batches, so memory stays flat however long the history is.
+    """
+    ready_index = SUBMISSION_FIELDS.index("ready")
+    conn = _connect(db_path)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(SUBMISSION_FIELDS)} FROM submissions ORDER BY id")
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                row = list(row)
+                if row[ready_index] is not None:
+                    row[ready_index] = bool(row[ready_index])
+                yield row
+    finally:
+        conn.close()
+
+
+def iter_submission_batches(columns, after_id=0, batch_size=1000, db_path=DEFAULT_DB_PATH):
+    """
+    Yields lists of raw stored rows with id greater than after_id, in id order.
+
+    Args:
+        columns (iterable): Table columns to select, e.g. ("id", "created_at") + SUBMISSION_FIELDS.
+        after_id (int): Only rows after this id are returned.
+        batch_size (int): Rows per yielded list.
+        db_path (str): Path of the SQLite database.
+    """
+    conn = _connect(db_path)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM submissions WHERE id > ? ORDER BY id",
+                              (after_id,))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        conn.close()
+
+
+# --- Cohorts ---
+def _cohort_key(row):
+    band = age_band(row[AGE_INDEX])
+    return (row[COUNTRY_INDEX] or "", -1 if band is None else band)
+
+
+def _add_to_cohort(cohort, row):
+    needed, available = row[CORPUS_NEEDED_INDEX], row[CORPUS_AVAILABLE_INDEX]
+    valid = (isinstance(needed, (int, float)) and isinstance(available, (int, float))
+             and not str(row[VERDICT_INDEX]).startswith("Error"))
+    cohort.add(needed, available, row[READY_INDEX], valid)
+
+
+def _update_cohorts(conn, rows):
+    """
+    Folds new submission rows into the stored cohort aggregates.
+
+    Only the cohorts the rows belong to are read and written back, so the cost depends
+    on the size of the batch, not of the history.
+    """
+    groups = {}
+    for row in rows:
+        _add_to_cohort(groups.setdefault(_cohort_key(row), Cohort()), row)
+    for (country, band), cohort in groups.items():
+        stored = conn.execute(f"SELECT state FROM {COHORT_TABLE} WHERE country = ? AND age_band = ?",
+                              (country, band)).fetchone()
+        if stored:
+            cohort = Cohort.from_json(stored[0]).merge(cohort)
+        conn.execute(f"INSERT INTO {COHORT_TABLE} (country, age_band, state) VALUES (?, ?, ?) "
+                     f"ON CONFLICT (country, age_band) DO UPDATE SET state = excluded.state",
+                     (country, band, cohort.to_json()))
+
+
+def _rebuild_cohorts(conn, batch_size=10000):
+    conn.execute(f"DELETE FROM {COHORT_TABLE}")
+    cursor = conn.execute(f"SELECT {', '.join(SUBMISSION_FIELDS)} FROM submissions ORDER BY id")
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        _update_cohorts(conn, batch)
+
+
+def rebuild_cohorts(db_path=DEFAULT_DB_PATH):
+    """
+    Recomputes the cohort aggregates from the whole history.
+
+    Only needed after the submissions table was changed by hand; appends keep the
+    aggregates current.
+    """
+    conn = _connect(db_path)
+    try:
+        with conn:
+            _rebuild_cohorts(conn)
+    finally:
+        conn.close()
+
+
+def load_cohorts(db_path=DEFAULT_DB_PATH):
+    """
+    Returns the cohort aggregates, one per country and age band.
+
+    Reads one small row per cohort, so the cost does not grow with the history.
+
+    Returns:
+        dict: cohorts.Cohort by (country, age_band); unknown values are None.
+    """
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT country, age_band, state FROM {COHORT_TABLE}").fetchall()
+    finally:
+        conn.close()
+    return {(country or None, None if band == -1 else band): Cohort.from_json(state)
+            for country, band, state in rows}
+
+
+# --- Queries ---
+# Filters shared by query_submissions and aggregate_submissions. Every filter maps onto
+# an indexed column, so a query reads only the matching slice of the history.
+GROUP_COLUMNS = {
+    "country": "country",
+    "age_band": "age_band",
+    "ready": "ready",
+    "gender": "gender",
+    "month": "substr(created_at, 1, 7)",
+}
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return value
+
+
+def _where(country=None, min_age=None, max_age=None, ready=None, since=None, until=None):
+    """
+    Builds the WHERE clause and parameters for the query filters.
+    """
+    clauses, params = [], []
+    if country is not None:
+        countries = [country] if isinstance(country, str) else list(country)
+        clauses.append(f"country IN ({', '.join('?' * len(countries))})")
+        params.extend(countries)
+    if min_age is not None:
+        clauses.append("age_band >= ? AND age >= ?")  # The band bound lets the index narrow the scan
+        params.extend([age_band(min_age), min_age])
+    if max_age is not None:
+        clauses.append("age_band <= ? AND age <= ?")
+        params.extend([age_band(max_age), max_age])
+    if ready is not None:
+        clauses.append("ready = ?")
+        params.append(int(bool(ready)))
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(_timestamp(since))
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(_timestamp(until))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def query_submissions(country=None, min_age=None, max_age=None, ready=None, since=None, until=None,
+                      limit=1000, offset=0, db_path=DEFAULT_DB_PATH):
+    """
+    Returns the stored submissions matching the filters, newest first.
+
+    Args:
+        country (str or list, optional): Country name(s).
+        min_age, max_age (int, optional): Inclusive age bounds.
+        ready (bool, optional): Readiness flag.
+        since, until (datetime or ISO str, optional): First-submission time range
+            (since inclusive, until exclusive); naive datetimes are taken as UTC.
+        limit, offset (int): Page of results to return.
+        db_path (str): Path of the SQLite database.
+    Returns:
+        list: One dict per submission with the SUBMISSION_FIELDS plus created_at,
+            last_submitted_at and submission_count.
+    """
+    where, params = _where(country, min_age, max_age, ready, since, until)
+    columns = ("created_at", "last_submitted_at", "submission_count") + SUBMISSION_FIELDS
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT {', '.join(columns)} FROM submissions{where} "
+                            f"ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                            params + [limit, offset]).fetchall()
+    finally:
+        conn.close()
+    records = [dict(zip(columns, row)) for row in rows]
+    for record in records:
+        if record['ready'] is not None:
+            record['ready'] = bool(record['ready'])
+    return records
+
+
+def aggregate_submissions(group_by=(), country=None, min_age=None, max_age=None, ready=None, since=None,
+                          until=None, db_path=DEFAULT_DB_PATH):
+    """
+    Counts and averages the stored submissions matching the filters, optionally grouped.
+
+    For example, Indian users aged 30-40 who were not ready in May 2024:
+    aggregate_submissions(country="India", min_age=30, max_age=40, ready=False,
+    since="2024-05-01", until="2024-06-01")[0]["submissions"].
+
+    Args:
+        group_by (iterable): Keys from GROUP_COLUMNS (country, age_band, ready, gender, month).
+        Filters as in query_submissions.
+    Returns:
+        list: One dict per group with the group keys, submissions (distinct rows),
+            total_submissions (including collapsed duplicates), ready_count and the
+            average corpus_needed and corpus_available.
+    """
+    unknown = [key for key in group_by if key not in GROUP_COLUMNS]
+    if unknown:
+        raise ValueError(f"Cannot group by: {', '.join(unknown)}")
+    where, params = _where(country, min_age, max_age, ready, since, until)
+    keys = [f"{GROUP_COLUMNS[key]} AS {key}" for key in group_by]
+    select = ", ".join(keys + ["COUNT(*)", "COALESCE(SUM(submission_count), 0)", "COALESCE(SUM(ready), 0)",
+                               "AVG(corpus_needed)", "AVG(corpus_available)"])
+    group = f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}" if group_by else ""
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT {select} FROM submissions{where}{group}", params).fetchall()
+    finally:
+        conn.close()
+    names = list(group_by) + ["submissions", "total_submissions", "ready_count",
+                              "avg_corpus_needed", "avg_corpus_available"]
+    return [dict(zip(names, row)) for row in rows]
+
+
+def export_submissions_to_excel(xlsx_path=DEFAULT_XLSX_PATH, db_path=DEFAULT_DB_PATH):
+    """
+    Exports the stored submissions to the 32-column Excel layout of user_data.xlsx.
+
+    The workbook is written in openpyxl's write-only mode, streaming rows straight from
+    the database.
+
+    Args:
+        xlsx_path (str): Destination workbook path.
+        db_path (str): Path of the SQLite database.
+    Returns:
+        int: Number of submission rows exported.
+    """
+    from openpyxl import Workbook
+
+    with span("excel_export"):
+        wb = Workbook(write_only=True)
+        sheet = wb.create_sheet(SHEET_NAME)
+        sheet.append(SUBMISSION_HEADERS)
+        count = 0
+        for row in iter_submissions(db_path):
+            sheet.append(row)
+            count += 1
+
+        directory = os.path.dirname(xlsx_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        wb.save(xlsx_path)
+    return count
+
+
+def import_submissions_from_excel(xlsx_path=DEFAULT_XLSX_PATH, db_path=DEFAULT_DB_PATH):
+    """
+    Copies the rows of an existing user_data.xlsx workbook into the store.
+
+    Useful once, to carry history written before the store existed.
+
+    Returns:
+        int: Number of rows imported.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        rows = wb[SHEET_NAME].iter_rows(min_row=2, max_col=len(SUBMISSION_FIELDS), values_only=True)
+        return append_submissions((row for row in rows if any(value is not None for value in row)), db_path)
+    finally:
+        wb.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the submission store.")
+    parser.add_argument("command", choices=["export", "import", "rebuild-cohorts"],
+                        help="export the store to Excel, import an existing Excel file into it, "
+                             "or recompute the cohort aggregates")
+    parser.add_argument("--xlsx", default=DEFAULT_XLSX_PATH, help="Excel workbook path")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(f"Exported {export_submissions_to_excel(args.xlsx, args.db)} rows to {args.xlsx}")
+    elif args.command == "import":
+        print(f"Imported {import_submissions_from_excel(args.xlsx, args.db)} rows from {args.xlsx}")
+    else:
+        rebuild_cohorts(args.db)
+        print(f"Rebuilt {len(load_cohorts(args.db))} cohorts in {args.db}")
@@ -0,0 +1,212 @@
+import operator
+from collections import namedtuple
+
+# --- Suggestion Rules ---
+# Each rule fires when all of its conditions hold. A condition is (field, op, value) over
+# the profile fields plus the derived values from derived_values. The rule's ID is its
+# position in SUGGESTION_RULES, which is also its bit in a suggestion bitset; priority
+# decides the display order (lowest first). predicate is the rule compiled for one
+# profile (see _compile_rule); the column path reads conditions directly.
+Rule = namedtuple("Rule", "rule_id name priority conditions predicate")
+
+_RULE_TABLE = (
+    ("shortfall", 10, (("ready", "==", False),)),
+    ("savings_rate", 20, (("ready", "==", False),)),
+    ("reduce_expenses", 30, (("ready", "==", False), ("expenses_over_budget", "==", True))),
+    ("short_horizon", 40, (("ready", "==", False), ("years_to_retirement", "<", 10))),
+    ("long_horizon", 40, (("ready", "==", False), ("years_to_retirement", ">", 25))),
+    ("pay_down_debt", 50, (("loans_debts_amount", ">", 0),)),
+    ("start_early", 60, (("age", "<", 40),)),
+    ("preserve_capital", 60, (("age", ">", 50),)),
+    ("health_cover", 70, (("health_issues_yn", "==", "Y"),)),
+    ("large_family", 80, (("family_members_count", ">", 2),)),
+    ("children_costs", 90, (("dependents_children", ">", 0),)),
+    ("rent", 100, (("owns_house", "==", "N"), ("on_rent", "==", "Y"))),
+    ("pension", 110, (("pension_contributions_yn", "==", "N"),)),
+    ("diversify_income", 120, (("only_source_of_income", "==", "Y"),)),
+    ("spouse", 130, (("dependents_spouse", "==", "Y"),)),
+    ("education_plan", 140, (("upcoming_big_goals", "contains", "Children's Education"),)),
+)
+
+# Values suggestion rules can test besides the profile fields.
+DERIVED_FIELDS = ("ready", "years_to_retirement", "shortfall", "expenses_over_budget")
+# Profile fields the rules and suggestion_context read.
+SUGGESTION_FIELDS = ("age", "income", "monthly_expenses", "loans_debts_amount", "health_issues_yn",
+                     "family_members_count", "dependents_children", "owns_house", "on_rent",
+                     "pension_contributions_yn", "only_source_of_income", "dependents_spouse",
+                     "upcoming_big_goals")
+
+# Templates per locale. Placeholders: {currency} (the profile's currency symbol) and
+# {shortfall} (corpus needed minus corpus available).
+TEMPLATES = {
+    "en": {
+        "shortfall": "Increase your retirement savings by {currency}{shortfall:,.2f}.",
+        "savings_rate": "Consider increasing your savings rate.",
+        "reduce_expenses": "Reduce your expenses. Review your budget carefully.",
+        "short_horizon": "You have a short time to prepare. Aggressively increase savings and consider delaying retirement.",
+        "long_horizon": "You have time to grow your retirement nest egg. Invest consistently and consider higher-growth investments.",
+        "pay_down_debt": "Prioritize paying down high-interest debts.",
+        "start_early": "Start saving for retirement as early as possible to take advantage of compounding.",
+        "preserve_capital": "Focus on preserving your capital and reducing risk as you approach retirement.",
+        "health_cover": "Ensure you have adequate health insurance and consider long-term care planning.",
+        "large_family": "Consider the financial impact of supporting a larger family in retirement.",
+        "children_costs": "Factor in future education and marriage expenses for your children.",
+        "rent": "Consider the impact of rent on your retirement expenses.  Evaluate if owning a home is feasible before retirement.",
+        "pension": "Start contributing to a pension plan to build a retirement corpus.",
+        "diversify_income": "Consider diversifying your income sources to reduce risk.",
+        "spouse": "Ensure adequate financial planning for your spouse's needs in retirement.",
+        "education_plan": "Start a dedicated investment plan for your children's education.",
+    },
+}
+DEFAULT_LOCALE = "en"
+# Templates without placeholders are used as they are instead of being formatted.
+_NEEDS_FORMAT = {locale: {name for name, template in templates.items() if "{" in template}
+                 for locale, templates in TEMPLATES.items()}
+EXPENSE_BUDGET_SHARE = 0.8  # Annual spending above this share of income is flagged
+
+_SCALAR_OPS = {
+    "==": operator.eq,
+    "<": operator.lt,
+    ">": operator.gt,
+    "contains": lambda value, part: part in value,
+}
+
+
+def derived_values(values, corpus_needed, corpus_available, ready, years_to_retirement):
+    """
+    Returns the derived values the rules test (DERIVED_FIELDS), without the profile fields.
+
+    Uses only arithmetic and comparisons, so values may hold scalars or NumPy columns.
+    expenses_over_budget is left out when monthly_expenses or income is missing.
+    """
+    derived = {
+        'ready': ready,
+        'years_to_retirement': years_to_retirement,
+        'shortfall': corpus_needed - corpus_available,
+    }
+    if 'monthly_expenses' in values and 'income' in values:
+        derived['expenses_over_budget'] = values['monthly_expenses'] * 12 > values['income'] * EXPENSE_BUDGET_SHARE
+    return derived
+
+
+def suggestion_context(values, corpus_needed, corpus_available, ready, years_to_retirement):
+    """
+    Returns a profile's fields (or columns) together with its derived values, for
+    match_suggestions_columns.
+    """
+    context = dict(values)
+    context.update(derived_values(values, corpus_needed, corpus_available, ready, years_to_retirement))
+    return context
+
+
+# --- Rule Compilation ---
+def _compile_condition(field, op, value):
+    """
+    Returns a predicate (values, derived) -> bool for one (field, op, value) condition,
+    with the operator and the dict the field lives in resolved once.
+    """
+    compare = _SCALAR_OPS[op]
+    if field in DERIVED_FIELDS:
+        return lambda values, derived: compare(derived[field], value)
+    return lambda values, derived: compare(values[field], value)
+
+
+def _compile_rule(conditions):
+    """
+    Returns a predicate (values, derived) -> bool that holds when every condition does.
+    """
+    predicates = tuple(_compile_condition(*condition) for condition in conditions)
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(values, derived):
+        for condition in predicates:
+            if not condition(values, derived):
+                return False
+        return True
+    return predicate
+
+
+SUGGESTION_RULES = tuple(Rule(rule_id, name, priority, conditions, _compile_rule(conditions))
+                         for rule_id, (name, priority, conditions) in enumerate(_RULE_TABLE))
+RULES_BY_PRIORITY = tuple(sorted(SUGGESTION_RULES, key=lambda rule: rule.priority))
+
+
+# --- Evaluation ---
+def match_suggestions(values, derived, rules=SUGGESTION_RULES):
+    """
+    Evaluates the compiled rules for one profile.
+
+    Args:
+        values (mapping): The profile's fields.
+        derived (dict): Its derived values, from derived_values.
+    Returns:
+        int: Bitset of the matching rule IDs.
+    """
+    bits = 0
+    for rule in rules:
+        if rule.predicate(values, derived):
+            bits |= 1 << rule.rule_id
+    return bits
+
+
+def match_suggestions_columns(context, size, rules=SUGGESTION_RULES):
+    """
+    Evaluates each rule once as a column mask over many profiles.
+
+    Rules that test a column missing from context never match.
+
+    Args:
+        context (dict): Columns from suggestion_context.
+        size (int): Number of profiles.
+    Returns:
+        np.ndarray: int64 bitset of matching rule IDs per profile.
+    """
+    import numpy as np
+
+    bits = np.zeros(size, dtype=np.int64)
+    for rule in rules:
+        mask = np.ones(size, dtype=bool)
+        for field, op, value in rule.conditions:
+            if field not in context:
+                mask[:] = False
+                break
+            column = np.asarray(context[field])
+            if op == "contains":
+                mask &= np.char.find(column.astype(str), value) >= 0
+            else:
+                mask &= _SCALAR_OPS[op](column, value)
+        bits |= mask.astype(np.int64) << rule.rule_id
+    return bits
+
+
+# --- Rendering ---
+def suggestion_names(bits, rules=SUGGESTION_RULES):
+    """
+    Returns the names of the rules set in a bitset, in display order.
+    """
+    bits = int(bits)
+    ordered = RULES_BY_PRIORITY if rules is SUGGESTION_RULES else sorted(rules, key=lambda rule: rule.priority)
+    return [rule.name for rule in ordered if bits >> rule.rule_id & 1]
+
+
+def render_suggestions(bits, results, currency_symbol="", locale=DEFAULT_LOCALE):
+    """
+    Renders the suggestion strings for a bitset, only when they are displayed.
+
+    Args:
+        bits (int): Bitset from match_suggestions or a batch suggestion_ids column.
+        results (mapping): Holds corpus_needed and corpus_available (a results dict or a
+            batch results row).
+        currency_symbol (str): Symbol used in amounts.
+        locale (str): Template locale; unknown locales fall back to DEFAULT_LOCALE.
+    Returns:
+        list: The suggestions, in priority order.
+    """
+    if locale not in TEMPLATES:
+        locale = DEFAULT_LOCALE
+    templates, needs_format = TEMPLATES[locale], _NEEDS_FORMAT[locale]
+    shortfall = results['corpus_needed'] - results['corpus_available']
+    return [templates[name].format(currency=currency_symbol, shortfall=shortfall) if name in needs_format
+            else templates[name]
+            for name in suggestion_names(bits)]
@@ -0,0 +1,320 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# --- Telemetry Settings ---
+# Off unless METRICS_ENABLED is set; while off, span() and request() return a shared no-op
+# context manager, so instrumented code pays one function call per stage.
+ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+METRICS_PATH = os.environ.get("METRICS_PATH", os.path.join("user_data", "metrics.prom"))
+EXPORT_INTERVAL = 5.0  # Minimum seconds between metric file writes
+SLOW_REQUEST_SECONDS = float(os.environ.get("SLOW_REQUEST_SECONDS", 1.0))
+# Opt-in sampling profiler: requests slower than SLOW_REQUEST_SECONDS leave a dump of
+# collapsed stacks (one "frame;frame;frame count" line per stack, flamegraph.pl input).
+PROFILE_SLOW_REQUESTS = os.environ.get("PROFILE_SLOW_REQUESTS", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join("user_data", "profiles"))
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", 0.005))
+
+METRIC_PREFIX = "retirement"
+# Component stats that only ever grow, exported as counters (with a _total suffix); every
+# other numeric stat (sizes, queue depth, hit rate, last/max/mean latencies) is a gauge.
+COUNTER_STATS = frozenset({
+    "hits", "misses", "evictions", "expirations", "disk_hits", "disk_evictions",
+    "submitted", "written", "failed", "retries", "spilled", "replayed", "batches", "total_flush_seconds",
+})
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}  # (metric, label name, label value) -> [bucket counts..., sum, count]
+_counters = Counter()  # (metric, label name, label value) -> count
+_last_export = 0.0
+
+
+def configure(enabled=None, metrics_path=None, slow_request_seconds=None, profile_slow_requests=None):
+    """
+    Changes the settings read from the environment at import time.
+    """
+    global ENABLED, METRICS_PATH, SLOW_REQUEST_SECONDS, PROFILE_SLOW_REQUESTS
+    if enabled is not None:
+        ENABLED = enabled
+    if metrics_path is not None:
+        METRICS_PATH = metrics_path
+    if slow_request_seconds is not None:
+        SLOW_REQUEST_SECONDS = slow_request_seconds
+    if profile_slow_requests is not None:
+        PROFILE_SLOW_REQUESTS = profile_slow_requests
+
+
+# --- Recording ---
+def observe(metric, label, value, seconds):
+    """
+    Adds one observation to a histogram with a single label.
+    """
+    key = (metric, label, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram[index] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
+
+
+def increment(metric, label, value, amount=1):
+    """
+    Adds amount to a counter with a single label.
+    """
+    with _lock:
+        _counters[(metric, label, value)] += amount
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        observe("stage_seconds", "stage", self.name, elapsed)
+        stages = getattr(_local, "stages", None)
+        if stages is not None:
+            stages.append((self.name, elapsed))
+        return False
+
+
+def span(name):
+    """
+    Times a stage of the request path, e.g. `with span("pdf"): ...`.
+
+    Durations go to the stage_seconds histogram and, inside request(), to that request's
+    stage list (written into slow-request profiles).
+    """
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name):
+    """
+    Decorator form of span() for a whole function.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Request:
+    def __init__(self, name):
+        self.name = name
+        self.sampler = None
+
+    def __enter__(self):
+        _local.stages = []
+        if PROFILE_SLOW_REQUESTS:
+            self.sampler = _Sampler(threading.get_ident())
+            self.sampler.start()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stages, _local.stages = _local.stages, None
+        if self.sampler is not None:
+            self.sampler.stop()
+        observe("request_seconds", "request", self.name, elapsed)
+        increment("requests_total", "request", self.name)
+        if elapsed > SLOW_REQUEST_SECONDS:
+            increment("slow_requests_total", "request", self.name)
+            if self.sampler is not None:
+                try:
+                    dump_profile(self.name, elapsed, stages, self.sampler.stacks)
+                except OSError as e:
+                    print(f"Error writing profile: {e}")
+        maybe_export()
+        return False
+
+
+def request(name):
+    """
+    Times one request (e.g. a Calculate click) and the spans inside it.
+
+    Requests slower than SLOW_REQUEST_SECONDS are counted, and with PROFILE_SLOW_REQUESTS
+    set, profiled: a sampling thread records the request's stack every SAMPLE_INTERVAL
+    seconds and the samples are dumped to PROFILE_DIR.
+    """
+    return _Request(name) if ENABLED else _NULL_SPAN
+
+
+# --- Sampling Profiler ---
+class _Sampler(threading.Thread):
+    """
+    Samples one thread's Python stack at a fixed interval into collapsed-stack counts.
+    """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(name="telemetry-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def dump_profile(name, elapsed, stages, stacks, directory=None):
+    """
+    Writes a slow request's stage timings and sampled stacks to a text file.
+
+    Returns:
+        str: Path of the dump.
+    """
+    directory = directory or PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed * 1000)}ms.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# request {name} took {elapsed:.3f}s\n")
+        for stage, seconds in stages:
+            f.write(f"# stage {stage} {seconds:.4f}s\n")
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    increment("profiles_dumped_total", "request", name)
+    return path
+
+
+# --- Export ---
+def _component_stats():
+    """
+    Returns the stats of the caches and the write-behind queue already loaded.
+    """
+    components = {}
+    if "result_cache" in sys.modules:
+        components['result_cache'] = sys.modules["result_cache"].result_cache.stats()
+    if "pdf_cache" in sys.modules:
+        components['pdf_cache'] = sys.modules["pdf_cache"].pdf_cache.stats()
+    if "write_behind" in sys.modules:
+        stats = sys.modules["write_behind"].writer_stats()
+        if stats is not None:
+            components['write_behind'] = stats
+    return components
+
+
+def _label(name, value):
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{name}="{escaped}"'
+
+
+def render_metrics():
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    Includes the stage and request histograms, the request counters and the numeric
+    stats of the result cache, the PDF cache and the write-behind queue (COUNTER_STATS as
+    counters, the rest as gauges).
+    """
+    with _lock:
+        histograms = {key: list(values) for key, values in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for metric in sorted({key[0] for key in histograms}):
+        name = f"{METRIC_PREFIX}_{metric}"
+        lines += [f"# HELP {name} Duration in seconds.", f"# TYPE {name} histogram"]
+        for (_, label, value), histogram in sorted(item for item in histograms.items() if item[0][0] == metric):
+            label = _label(label, value)
+            for bound, count in zip(BUCKETS, histogram):
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram[-1]}')
+            lines.append(f"{name}_sum{{{label}}} {histogram[-2]}")
+            lines.append(f"{name}_count{{{label}}} {histogram[-1]}")
+    for metric in sorted({key[0] for key in counters}):
+        name = f"{METRIC_PREFIX}_{metric}"
+        lines += [f"# HELP {name} Count since the process started.", f"# TYPE {name} counter"]
+        for (_, label, value), count in sorted(item for item in counters.items() if item[0][0] == metric):
+            lines.append(f"{name}{{{_label(label, value)}}} {count}")
+    for component, stats in _component_stats().items():
+        for stat, value in sorted(stats.items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{METRIC_PREFIX}_{component}_{stat}"
+            if stat in COUNTER_STATS:
+                lines += [f"# TYPE {name}_total counter", f"{name}_total {value}"]
+            else:
+                lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path=None):
+    """
+    Writes render_metrics() to a file (METRICS_PATH by default), replacing it atomically.
+
+    Point a node_exporter textfile collector at the directory to scrape it.
+    """
+    path = path or METRICS_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+    return path
+
+
+def maybe_export():
+    """
+    Writes the metrics file if EXPORT_INTERVAL has passed since the last write.
+    """
+    global _last_export
+    now = time.monotonic()
+    if not METRICS_PATH or now - _last_export < EXPORT_INTERVAL:
+        return
+    _last_export = now
+    try:
+        write_metrics()
+    except OSError as e:
+        print(f"Error writing metrics: {e}")
+
+
+def reset():
+    """
+    Clears every recorded histogram and counter.
+    """
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
@@ -0,0 +1,271 @@
+import numbers
+from collections import namedtuple
+
+# --- Field Schema ---
+# Declarative input constraints. Each entry is (field, label, type, minimum, choices,
+# default); None means "no constraint". The schema is compiled into RULES below, which
+# both the single-profile and the columnar validator run.
+YES_NO = ("Y", "N")
+NON_NEGATIVE_MESSAGE = "Error: Please ensure all financial inputs are non-negative."
+
+FIELD_SCHEMA = (
+    ("age", "Age", "number", 0, None, None),
+    ("income", "Income", "number", 0, None, None),
+    ("expenses", "Expenses", "number", 0, None, None),
+    ("assets_cars", "Assets Cars", "number", 0, None, None),
+    ("assets_land", "Assets Land", "number", 0, None, None),
+    ("assets_others", "Assets Others", "number", 0, None, None),
+    ("loans_debts_amount", "Loans/Debts Amount", "number", 0, None, None),
+    ("monthly_expenses", "Monthly Expenses", "number", None, None, None),
+    ("family_members_count", "Family Members Count", "number", None, None, None),
+    ("dependents_children", "Dependents Children", "number", None, None, None),
+    ("expected_inflation_rate", "Expected Inflation Rate", "number", None, None, None),
+    ("retirement_age_target", "Target Retirement Age", "number", None, None, None),
+    ("owns_house", "Owns a House", "text", None, YES_NO, None),
+    ("on_rent", "On Rent", "text", None, YES_NO, None),
+    ("dependent_health_problems_yn", "Dependent Health Problems", "text", None, YES_NO, None),
+    ("health_issues_yn", "Health Issues", "text", None, YES_NO, None),
+    ("health_insurance_yn", "Health Insurance", "text", None, YES_NO, None),
+    ("life_insurance_yn", "Life Insurance", "text", None, YES_NO, None),
+    ("pension_contributions_yn", "Pension Contributions", "text", None, YES_NO, None),
+    ("only_source_of_income", "Only Source of Income", "text", None, YES_NO, "N"),
+    ("dependents_spouse", "Dependents Spouse", "text", None, YES_NO, None),
+)
+
+# Checks between two fields: (code, field, must be below this field, message, hint).
+CROSS_FIELD_SCHEMA = (
+    ("age.before_retirement", "age", "retirement_age_target",
+     "Error: Target retirement age should be greater than current age.",
+     "Please check your age and target retirement age."),
+)
+
+DEFAULTS = {field: default for field, _, _, _, _, default in FIELD_SCHEMA if default is not None}
+
+# kind is one of "number", "min", "below" and "choice"; arg is the bound, other field or
+# allowed values. RULES is ordered by precedence: the first failing rule is the verdict.
+Rule = namedtuple("Rule", "code field kind arg message hint")
+
+
+def compile_schema(field_schema=FIELD_SCHEMA, cross_field_schema=CROSS_FIELD_SCHEMA):
+    """
+    Compiles the declarative schema into an ordered tuple of Rules.
+
+    Type checks come first, then ranges, then cross-field checks, then allowed values,
+    which keeps the verdicts the calculator has always reported for a single bad input.
+    compile_checks groups the result by field for the single-profile validator.
+    """
+    type_rules, range_rules, choice_rules = [], [], []
+    for field, label, field_type, minimum, choices, _ in field_schema:
+        if field_type == "number":
+            type_rules.append(Rule(f"{field}.type", field, "number", None,
+                                   f"Error: {label} should be a number.", f"Please check the {label} value."))
+        if minimum is not None:
+            range_rules.append(Rule(f"{field}.min", field, "min", minimum,
+                                    NON_NEGATIVE_MESSAGE, "Please check your input values."))
+        if choices is not None:
+            choice_rules.append(Rule(f"{field}.choice", field, "choice", choices,
+                                     f"Error: {label} should be {' or '.join(choices)}",
+                                     f"Please check the {label} value."))
+    cross_rules = [Rule(code, field, "below", other, message, hint)
+                   for code, field, other, message, hint in cross_field_schema]
+    return tuple(type_rules + range_rules + cross_rules + choice_rules)
+
+
+# One field's checks for validate_profile, with its default resolved at compile time.
+# type_check, choice_check and each min_checks entry are (precedence, Rule) pairs;
+# type_check and choice_check are None when the field has no such rule.
+FieldCheck = namedtuple("FieldCheck", "field default type_check min_checks choice_check")
+
+
+def compile_checks(rules):
+    """
+    Groups rules by field so validate_profile reads and type-checks each value once.
+
+    Returns:
+        tuple: (field_checks, cross_checks). cross_checks holds one
+            (precedence, Rule, default, other field's default) per "below" rule.
+    """
+    fields, cross_checks = {}, []
+    for index, rule in enumerate(rules):
+        if rule.kind == "below":
+            cross_checks.append((index, rule, DEFAULTS.get(rule.field), DEFAULTS.get(rule.arg)))
+            continue
+        check = fields.setdefault(rule.field, {'type_check': None, 'min_checks': [], 'choice_check': None})
+        if rule.kind == "number":
+            check['type_check'] = (index, rule)
+        elif rule.kind == "min":
+            check['min_checks'].append((index, rule))
+        else:
+            check['choice_check'] = (index, rule)
+    field_checks = tuple(FieldCheck(field, DEFAULTS.get(field), check['type_check'],
+                                    tuple(check['min_checks']), check['choice_check'])
+                         for field, check in fields.items())
+    return field_checks, tuple(cross_checks)
+
+
+RULES = compile_schema()
+RULE_CODES = tuple(rule.code for rule in RULES)
+CHECKS = compile_checks(RULES)
+
+
+# --- Single Profile ---
+def _is_number(value):
+    # NaN is how a missing cell arrives from a DataFrame, so it counts as not a number.
+    # Plain ints and floats skip the (slower) numbers.Real ABC check.
+    cls = value.__class__
+    if cls is int:
+        return True
+    if cls is float:
+        return value == value
+    return isinstance(value, numbers.Real) and not isinstance(value, bool) and value == value
+
+
+def validate_profile(values, rules=RULES):
+    """
+    Checks one profile against every rule in a single pass.
+
+    Range and cross-field checks on a field that failed its type check are skipped, so
+    one bad value is reported once instead of raising a TypeError.
+
+    Args:
+        values (dict): Field values by name; fields with a schema default may be omitted.
+    Returns:
+        list: The failing Rules, in precedence order (empty when the profile is valid).
+    """
+    field_checks, cross_checks = CHECKS if rules is RULES else compile_checks(rules)
+    errors = []
+    mistyped = set()
+    for field, default, type_check, min_checks, choice_check in field_checks:
+        value = values.get(field, default)
+        if type_check is not None:
+            cls = value.__class__
+            if not (cls is int or cls is float and value == value or _is_number(value)):
+                errors.append(type_check)
+                mistyped.add(field)
+                continue
+            for check in min_checks:
+                if value < check[1].arg:
+                    errors.append(check)
+        if choice_check is not None and value not in choice_check[1].arg:
+            errors.append(choice_check)
+    for index, rule, default, other_default in cross_checks:
+        if rule.field in mistyped or rule.arg in mistyped:
+            continue
+        if not values.get(rule.field, default) < values.get(rule.arg, other_default):
+            errors.append((index, rule))
+    if not errors:
+        return errors
+    errors.sort(key=lambda check: check[0])  # Back into precedence order
+    return [rule for _, rule in errors]
+
+
+def error_result(errors):
+    """
+    Builds the calculate_retirement_needs result for an invalid profile.
+
+    The verdict is the highest-precedence error; suggestions hold one hint per distinct
+    problem and errors the codes of every failing rule.
+    """
+    return {
+        'corpus_needed': 0,
+        'corpus_available': 0,
+        'ready': False,
+        'verdict': errors[0].message,
+        'suggestions': list(dict.fromkeys(rule.hint for rule in errors)),
+        'errors': [rule.code for rule in errors],
+    }
+
+
+# --- Columns ---
+# NumPy is imported inside the functions below, so the calculator can use this module
+# without loading it.
+def profile_column(profiles, name, default=None):
+    """
+    Returns a column of profiles as a NumPy array, falling back to a scalar default.
+
+    Args:
+        profiles (pd.DataFrame, dict or np.ndarray): Columns by name, or a structured array.
+    """
+    import numpy as np
+
+    names = profiles.dtype.names if isinstance(profiles, np.ndarray) else profiles
+    if name in names:
+        return np.asarray(profiles[name])
+    if default is None:
+        raise KeyError(f"Missing profile field: {name}")
+    return np.asarray(default)
+
+
+def validate_columns(profiles, rules=RULES):
+    """
+    Checks many profiles at once, one boolean-mask sweep per rule.
+
+    Columns missing from profiles (and without a schema default) are not checked.
+
+    Args:
+        profiles (pd.DataFrame, dict or np.ndarray): One row per profile.
+    Returns:
+        dict: error_codes (int64 bitmask per row, bit i set when RULES[i] failed; see
+            decode_error_codes), first_error (index of the highest-precedence failing
+            rule, -1 when valid), valid (bool per row) and numeric (the number-typed
+            columns as numeric arrays, NaN where a value is missing or not a number, so
+            calculations can run over every row without raising).
+    """
+    import numpy as np
+
+    columns, numeric, mistyped = {}, {}, {}
+    size = None
+    for field in {rule.field for rule in rules} | {rule.arg for rule in rules if rule.kind == "below"}:
+        try:
+            columns[field] = profile_column(profiles, field, DEFAULTS.get(field))
+        except KeyError:
+            continue
+        if columns[field].ndim:
+            size = len(columns[field])
+    size = 0 if size is None else size
+
+    for rule in rules:
+        if rule.kind == "number" and rule.field in columns:
+            column = columns[rule.field]
+            if np.issubdtype(column.dtype, np.number):
+                numeric[rule.field] = column
+                mistyped[rule.field] = (np.isnan(column) if np.issubdtype(column.dtype, np.floating)
+                                        else np.zeros(column.shape, dtype=bool))
+            else:  # Object or text column: check each value the way validate_profile does
+                mistyped[rule.field] = ~np.frompyfunc(_is_number, 1, 1)(column).astype(bool)
+                numeric[rule.field] = np.where(mistyped[rule.field], np.nan, column).astype(float)
+
+    error_codes = np.zeros(size, dtype=np.int64)
+    first_error = np.full(size, -1, dtype=np.int64)
+    for index in range(len(rules) - 1, -1, -1):
+        rule = rules[index]
+        if rule.field not in columns or (rule.kind == "below" and rule.arg not in columns):
+            continue
+        if rule.kind == "number":
+            failed = mistyped[rule.field]
+        elif rule.kind == "min":
+            with np.errstate(invalid="ignore"):
+                failed = ~mistyped[rule.field] & (numeric[rule.field] < rule.arg)
+        elif rule.kind == "below":
+            with np.errstate(invalid="ignore"):
+                failed = (~mistyped[rule.field] & ~mistyped[rule.arg]
+                          & ~(numeric[rule.field] < numeric[rule.arg]))
+        else:
+            failed = ~np.isin(columns[rule.field], rule.arg)
+        failed = np.broadcast_to(failed, (size,))
+        error_codes |= failed.astype(np.int64) << index
+        first_error = np.where(failed, index, first_error)
+
+    return {
+        'error_codes': error_codes,
+        'first_error': first_error,
+        'valid': error_codes == 0,
+        'numeric': numeric,
+    }
+
+
+def decode_error_codes(mask, rules=RULES):
+    """
+    Returns the rule codes set in an error_codes bitmask from validate_columns.
+    """
+    return [rule.code for index, rule in enumerate(rules) if int(mask) >> index & 1]
@@ -0,0 +1,225 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+from storage import append_submissions, DEFAULT_DB_PATH
+from telemetry import span
+
+# --- Queue Settings ---
+MAX_QUEUE_SIZE = 10000
+MAX_BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.5  # Seconds to wait for more rows before flushing a partial batch
+SUBMIT_TIMEOUT = 5.0  # Seconds a caller may block on a full queue before giving up
+FLUSH_RETRIES = 3  # Further attempts at a batch that failed to save, e.g. on SQLITE_BUSY
+RETRY_BACKOFF = 0.5  # Seconds before the first retry, doubled for each one after it
+# Batches that still fail are appended here (one JSON row per line, next to the store)
+# and saved by the next writer that starts.
+SPILL_FILENAME = "unsaved_submissions.jsonl"
+
+_STOP = object()
+
+
+class SubmissionWriter:
+    """
+    Write-behind worker that saves submission rows on a background thread.
+
+    Callers hand rows to submit(), which only enqueues them. The worker thread collects
+    whatever is waiting (up to MAX_BATCH_SIZE rows) and writes it to the submission store
+    in one transaction. The queue is bounded: when it is full, submit() blocks, which
+    slows producers down to the speed of the disk instead of growing memory.
+
+    A batch that fails to save is retried with exponential backoff; if it still fails,
+    its rows are spilled to SPILL_FILENAME next to the store rather than dropped, and the
+    worker saves spilled rows when it starts.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_queue_size=MAX_QUEUE_SIZE,
+                 max_batch_size=MAX_BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = os.path.join(os.path.dirname(db_path), SPILL_FILENAME)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'failed': 0,
+            'retries': 0,
+            'spilled': 0,
+            'replayed': 0,
+            'batches': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_flush_seconds': 0.0,
+            'max_flush_seconds': 0.0,
+            'total_flush_seconds': 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row, timeout=SUBMIT_TIMEOUT):
+        """
+        Queues one submission row (values in storage.SUBMISSION_FIELDS order).
+
+        Blocks for up to timeout seconds while the queue is full and raises queue.Full if
+        it is still full afterwards.
+        """
+        if self._closed:
+            raise RuntimeError("Submission writer is closed.")
+        self._queue.put(row, timeout=timeout)
+        with self._lock:
+            self._stats['submitted'] += 1
+
+    def close(self, timeout=None):
+        """
+        Stops accepting rows, flushes everything still queued and stops the worker.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self):
+        """
+        Returns a snapshot of the queue depth, batch size and flush latency counters.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['mean_flush_seconds'] = stats['total_flush_seconds'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def _run(self):
+        self._replay_spilled()
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._queue.get()
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+
+            # Gather whatever else arrives shortly, up to a full batch.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = 0 if stopping else deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        start = time.perf_counter()
+        for attempt in range(FLUSH_RETRIES + 1):
+            try:
+                with span("storage_flush"):
+                    append_submissions(batch, self.db_path)
+                break
+            except Exception as e:
+                print(f"Error saving user data (attempt {attempt + 1} of {FLUSH_RETRIES + 1}): {e}")
+                if attempt == FLUSH_RETRIES:
+                    self._spill(batch)
+                    return
+                with self._lock:
+                    self._stats['retries'] += 1
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['last_batch_size'] = len(batch)
+            self._stats['max_batch_size'] = max(self._stats['max_batch_size'], len(batch))
+            self._stats['last_flush_seconds'] = elapsed
+            self._stats['max_flush_seconds'] = max(self._stats['max_flush_seconds'], elapsed)
+            self._stats['total_flush_seconds'] += elapsed
+
+    def _spill(self, batch):
+        """
+        Appends rows that could not be saved to the spill file.
+        """
+        try:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in batch:
+                    f.write(json.dumps([value.item() if hasattr(value, "item") else value for value in row],
+                                       ensure_ascii=False) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error spilling {len(batch)} unsaved submissions to {self.spill_path}: {e}")
+            with self._lock:
+                self._stats['failed'] += len(batch)
+            return
+        print(f"Spilled {len(batch)} unsaved submissions to {self.spill_path}")
+        with self._lock:
+            self._stats['spilled'] += len(batch)
+
+    def _replay_spilled(self):
+        """
+        Saves the rows of an earlier writer's spill file; rows that still fail are spilled again.
+        """
+        # Claimed under another name, so rows spilled meanwhile go to a fresh file
+        replay_path = f"{self.spill_path}.{os.getpid()}.replay"
+        try:
+            os.replace(self.spill_path, replay_path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error claiming spilled submissions in {self.spill_path}: {e}")
+            return
+        try:
+            with open(replay_path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            print(f"Error reading spilled submissions from {replay_path}: {e}")
+            return
+        saved = 0
+        try:
+            while saved < len(rows):
+                batch = rows[saved:saved + self.max_batch_size]
+                append_submissions(batch, self.db_path)
+                saved += len(batch)
+        except Exception as e:
+            print(f"Error saving spilled submissions: {e}")
+            self._spill(rows[saved:])
+        with self._lock:
+            self._stats['replayed'] += saved
+        os.remove(replay_path)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """
+    Returns the process-wide SubmissionWriter, starting it on first use.
+
+    The writer is shared by every Streamlit session in the process and is drained when
+    the interpreter exits.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = SubmissionWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def writer_stats():
+    """
+    Returns the process-wide writer's stats, or None if it has not been started.
+    """
+    return None if _writer is None else _writer.stats()